@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Booking, OTPRequest, EmailSession
+from .models import Booking, OTPRequest, EmailSession, EmailOutbox, IdempotencyKey, InventoryHold
 
 
 @admin.register(Booking)
@@ -22,3 +22,23 @@ class EmailSessionAdmin(admin.ModelAdmin):
     search_fields = ('email', 'token')
     list_filter = ('valid',)
 
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    search_fields = ('subject',)
+    list_filter = ('status',)
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'key', 'response_status', 'created_at', 'expires_at')
+    search_fields = ('key',)
+
+
+@admin.register(InventoryHold)
+class InventoryHoldAdmin(admin.ModelAdmin):
+    list_display = ('id', 'token', 'room', 'check_in', 'check_out', 'status', 'expires_at')
+    search_fields = ('token',)
+    list_filter = ('status',)
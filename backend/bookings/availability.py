@@ -0,0 +1,110 @@
+"""
+Availability checks for the booking views.
+
+In "local" mode the shared availability engine runs on Django's own
+connection, inside the caller's transaction. In "remote" mode the FastAPI
+service is called first and the local engine is used if it fails.
+"""
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.db import connection
+
+from availability_engine import AvailabilityResult
+from availability_engine import check_availability as engine_check_availability
+from availability_engine import check_rooms as engine_check_rooms
+from availability_engine import find_windows
+from .availability_client import AvailabilityServiceError, get_client
+
+logger = logging.getLogger(__name__)
+
+
+def check_local(room_id, check_in, check_out):
+    """Run the availability engine on the current Django connection."""
+    with connection.cursor() as cursor:
+        return engine_check_availability(cursor, room_id, check_in, check_out)
+
+
+def check_remote(room_id, check_in, check_out):
+    """
+    Ask the availability service through the pooled client. Returns None if
+    the service failed (or its circuit is open) so the caller can fall back
+    to the local engine.
+    """
+    try:
+        return get_client().check(room_id, check_in, check_out)
+    except AvailabilityServiceError as e:
+        logger.error("Availability service unavailable: %s", e)
+        return None
+
+
+def check_room_availability(room_id, check_in, check_out):
+    """Check availability according to settings.AVAILABILITY_MODE."""
+    if settings.AVAILABILITY_MODE == 'remote':
+        result = check_remote(room_id, check_in, check_out)
+        if result is not None:
+            return result
+        logger.warning("Falling back to local availability engine for room %s", room_id)
+    return check_local(room_id, check_in, check_out)
+
+
+def check_rooms_local(room_ids, check_in, check_out):
+    """Check `room_ids` for the same dates with one batch query on Django's connection."""
+    with connection.cursor() as cursor:
+        rooms = engine_check_rooms(cursor, check_in, check_out, room_ids=room_ids)
+    return {room.room_id: AvailabilityResult(room.available, room.reason) for room in rooms}
+
+
+def check_rooms_remote(room_ids, check_in, check_out):
+    """Batch counterpart of check_remote(): None if the service failed."""
+    try:
+        return get_client().check_batch(room_ids, check_in, check_out)
+    except AvailabilityServiceError as e:
+        logger.error("Availability service unavailable: %s", e)
+        return None
+
+
+def check_stays(stays):
+    """
+    Check several (room_id, check_in, check_out) stays and return one
+    AvailabilityResult per stay, in order. Stays sharing dates are checked
+    together, so a group on the same dates costs one batch query (or one
+    service call in remote mode) however many rooms it has.
+    """
+    stays = list(stays)
+    rooms_by_dates = {}
+    for room_id, check_in, check_out in stays:
+        rooms_by_dates.setdefault((check_in, check_out), set()).add(room_id)
+
+    verdicts = {}
+    for (check_in, check_out), room_ids in rooms_by_dates.items():
+        room_ids = sorted(room_ids)
+        results = None
+        if settings.AVAILABILITY_MODE == 'remote':
+            results = check_rooms_remote(room_ids, check_in, check_out)
+            if results is None:
+                logger.warning("Falling back to local availability engine for rooms %s", room_ids)
+        if results is None:
+            results = check_rooms_local(room_ids, check_in, check_out)
+        for room_id in room_ids:
+            verdicts[room_id, check_in, check_out] = results.get(room_id, AvailabilityResult(False, "Room not found"))
+    return [verdicts[stay] for stay in stays]
+
+
+def suggest_stays(room_id, check_in, check_out, limit=None):
+    """
+    Earliest stays of the same length as check_in..check_out that the room's
+    inventory can take, starting no earlier than check_in (or today). Always
+    computed with the local engine: one inventory scan on Django's connection.
+    """
+    limit = settings.AVAILABILITY_SUGGESTIONS if limit is None else limit
+    if limit <= 0:
+        return []
+    first = max(check_in, date.today())
+    with connection.cursor() as cursor:
+        windows = find_windows(
+            cursor, room_id, (check_out - check_in).days, first,
+            settings.AVAILABILITY_SUGGESTION_SPAN_DAYS, limit=limit,
+        )
+    return [{"check_in": w.check_in, "check_out": w.check_out, "min_free": w.min_free} for w in windows]
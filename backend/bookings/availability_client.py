@@ -0,0 +1,241 @@
+"""
+HTTP client for the remote availability service.
+
+One client (and one pooled requests.Session) exists per worker process.
+Calls use short timeouts, a bounded number of retries with jittered backoff
+and a circuit breaker, so a slow or failing service cannot stall bookings.
+The booking view calls it inside the booking transaction while holding the
+advisory locks on the stay's room-nights (hotels.inventory.lock_room_nights),
+so every second spent here delays other bookings that share a night of the
+same room; stays on other nights or rooms are not blocked.
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from availability_engine import AvailabilityResult
+
+
+class AvailabilityServiceError(Exception):
+    """The availability service could not give an answer."""
+
+
+class CircuitOpenError(AvailabilityServiceError):
+    """Raised without calling the service while the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    rejects calls for `reset_timeout` seconds. After that exactly one call
+    is let through as a probe; other calls are still rejected until the
+    probe's outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class AvailabilityClient:
+    """Pooled, retrying, circuit-broken client for POST /check-availability (and /batch)."""
+
+    def __init__(self, url, connect_timeout=0.5, read_timeout=2.0, retries=1,
+                 backoff=0.05, failure_threshold=5, reset_timeout=30.0, pool_size=10):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0,
+            'successes': 0,
+            'errors': 0,
+            'client_errors': 0,
+            'retries': 0,
+            'short_circuited': 0,
+            'latency_ms_total': 0.0,
+            'latency_ms_max': 0.0,
+        }
+
+    @property
+    def session(self):
+        # Sessions are not fork-safe: build a new one in each worker process.
+        if self._session is None or self._session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+            self._session_pid = os.getpid()
+        return self._session
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def _record_latency(self, started):
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._counters['latency_ms_total'] += elapsed_ms
+            self._counters['latency_ms_max'] = max(self._counters['latency_ms_max'], elapsed_ms)
+
+    def _post(self, url, payload):
+        response = self.session.post(url, json=payload, timeout=self.timeout)
+        if response.status_code >= 500:
+            raise AvailabilityServiceError(f"Availability service returned status {response.status_code}")
+        if response.status_code != 200:
+            raise ValueError(f"Availability service returned status {response.status_code}: {response.text}")
+        return response.json()
+
+    def _call(self, url, payload):
+        """
+        POST `payload` to `url` through the breaker and the retry budget and
+        return the decoded response.
+        """
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError("Availability service circuit is open")
+
+        self._count('requests')
+        started = time.monotonic()
+        data = None
+        last_error = None
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self._count('retries')
+                    # Full jitter: sleep a random fraction of the exponential step
+                    time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+                try:
+                    data = self._post(url, payload)
+                    break
+                except ValueError as e:
+                    # 4xx or invalid JSON will not get better on retry. The
+                    # service did answer, so this is no failure for the breaker.
+                    self._count('client_errors')
+                    self.breaker.record_success()
+                    raise AvailabilityServiceError(str(e)) from e
+                except (requests.RequestException, AvailabilityServiceError) as e:
+                    last_error = e
+        except AvailabilityServiceError:
+            raise
+        except Exception:
+            # Unexpected errors must not leave a half-open probe in flight
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._record_latency(started)
+
+        if data is None:
+            self._count('errors')
+            self.breaker.record_failure()
+            raise AvailabilityServiceError(str(last_error)) from last_error
+
+        self._count('successes')
+        self.breaker.record_success()
+        return data
+
+    def check(self, room_id, check_in, check_out):
+        """
+        Return an AvailabilityResult from the service.
+
+        Raises AvailabilityServiceError (or CircuitOpenError) when no answer
+        could be obtained within the retry budget.
+        """
+        data = self._call(self.url, {
+            "room_id": room_id,
+            "check_in": str(check_in),
+            "check_out": str(check_out)
+        })
+        return AvailabilityResult(bool(data.get("available")), data.get("reason", "Room is not available"))
+
+    def check_batch(self, room_ids, check_in, check_out):
+        """
+        Check several rooms for the same dates with one call to the
+        service's /batch endpoint; returns {room_id: AvailabilityResult}.
+        Raises like check().
+        """
+        data = self._call(self.url.rstrip('/') + '/batch', {
+            "room_ids": list(room_ids),
+            "check_in": str(check_in),
+            "check_out": str(check_out)
+        })
+        return {
+            room["room_id"]: AvailabilityResult(bool(room.get("available")), room.get("reason", "Room is not available"))
+            for room in data.get("rooms", [])
+        }
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['latency_ms_avg'] = (
+            counters['latency_ms_total'] / counters['requests'] if counters['requests'] else 0.0
+        )
+        counters['breaker_state'] = self.breaker.state
+        counters['consecutive_failures'] = self.breaker.consecutive_failures
+        counters['pid'] = os.getpid()
+        return counters
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide AvailabilityClient built from settings."""
+    global _client
+    url = settings.AVAILABILITY_SERVICE_URL
+    if _client is None or _client.url != url:
+        with _client_lock:
+            if _client is None or _client.url != url:
+                _client = AvailabilityClient(url, **settings.AVAILABILITY_CLIENT)
+    return _client
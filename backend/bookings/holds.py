@@ -0,0 +1,81 @@
+"""
+Short-lived inventory holds for checkout.
+
+A hold reserves inventory for one room and stay for settings.INVENTORY_HOLD_TTL.
+Bookings presenting the hold token convert it with a single conditional
+UPDATE; expired holds are released in batches by `release_expired`.
+"""
+import secrets
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from hotels.inventory import release_stay, release_stays, reserve_stay
+from .models import InventoryHold
+
+
+def create_hold(room, check_in, check_out):
+    """Reserve inventory and return a new active hold. Raises InventoryUnavailable."""
+    with transaction.atomic():
+        reserve_stay(room, check_in, check_out)
+        return InventoryHold.objects.create(
+            token=secrets.token_urlsafe(32),
+            room=room,
+            check_in=check_in,
+            check_out=check_out,
+            expires_at=timezone.now() + settings.INVENTORY_HOLD_TTL,
+        )
+
+
+def convert_hold(token, room_id, check_in, check_out):
+    """
+    Mark an active, unexpired hold matching the stay as converted.
+
+    Returns True if the hold was converted (its inventory now belongs to
+    the booking), False if it is unknown, expired or for another stay.
+    """
+    return InventoryHold.objects.filter(
+        token=token,
+        status='active',
+        expires_at__gt=timezone.now(),
+        room_id=room_id,
+        check_in=check_in,
+        check_out=check_out,
+    ).update(status='converted') == 1
+
+
+def release_hold(token):
+    """Release an active hold early. Returns True if a hold was released."""
+    with transaction.atomic():
+        hold = InventoryHold.objects.select_for_update().filter(token=token, status='active').first()
+        if hold is None:
+            return False
+        release_stay(hold.room_id, hold.check_in, hold.check_out)
+        hold.status = 'released'
+        hold.save(update_fields=['status'])
+        return True
+
+
+def release_expired(batch_size=500):
+    """
+    Release expired active holds, `batch_size` per transaction.
+
+    Each batch is read through the partial (status='active', expires_at)
+    index with SKIP LOCKED, so concurrent sweepers split the work and
+    never scan converted or released rows. Returns holds released.
+    """
+    released = 0
+    while True:
+        with transaction.atomic():
+            holds = list(
+                InventoryHold.objects.select_for_update(skip_locked=True)
+                .filter(status='active', expires_at__lte=timezone.now())
+                .order_by('expires_at')
+                .values_list('id', 'room_id', 'check_in', 'check_out')[:batch_size]
+            )
+            if not holds:
+                return released
+            release_stays((room_id, check_in, check_out) for _, room_id, check_in, check_out in holds)
+            InventoryHold.objects.filter(id__in=[hold[0] for hold in holds]).update(status='released')
+            released += len(holds)
@@ -0,0 +1,100 @@
+"""
+Idempotency-Key handling for booking creation.
+
+Usage inside an atomic view:
+
+    record, replay = begin(request)
+    if replay is not None:
+        return replay
+    response = ...create booking...
+    complete(record, response)
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    raw = f"{request.method}:{request.path}:{body}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def begin(request):
+    """
+    Claim the request's Idempotency-Key. Must run inside a transaction.
+
+    Returns (record, replay): `replay` is a Response to return immediately
+    (stored result or an error), otherwise `record` is the locked key row
+    to pass to complete(). Both are None when no header was sent.
+    """
+    key = request.META.get(HEADER)
+    if not key:
+        return None, None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return None, Response({"error": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"}, status=400)
+
+    fingerprint = request_fingerprint(request)
+    now = timezone.now()
+    expires_at = now + settings.IDEMPOTENCY_KEY_TTL
+
+    # INSERT ... ON CONFLICT DO NOTHING waits for a concurrent insert of the
+    # same key to commit or roll back before returning.
+    IdempotencyKey.objects.bulk_create(
+        [IdempotencyKey(key=key, fingerprint=fingerprint, expires_at=expires_at)],
+        ignore_conflicts=True,
+    )
+    record = IdempotencyKey.objects.select_for_update().get(key=key)
+
+    if record.expires_at <= now:
+        # Stale key: start over as if it was new
+        record.fingerprint = fingerprint
+        record.response_status = None
+        record.response_body = None
+        record.expires_at = expires_at
+        record.save(update_fields=['fingerprint', 'response_status', 'response_body', 'expires_at'])
+        return record, None
+
+    if record.fingerprint != fingerprint:
+        return None, Response({"error": "Idempotency-Key was already used with a different request"}, status=422)
+
+    if record.response_status is not None:
+        return None, Response(
+            record.response_body,
+            status=record.response_status,
+            headers={'Idempotent-Replayed': 'true'},
+        )
+
+    return record, None
+
+
+def complete(record, response):
+    """Store a successful response so retries replay it."""
+    if record is None or response.status_code != 201:
+        return
+    record.response_status = response.status_code
+    record.response_body = response.data
+    record.save(update_fields=['response_status', 'response_body'])
+
+
+def purge_expired(batch_size=1000):
+    """Delete expired keys in batches of `batch_size`. Returns rows deleted."""
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lt=timezone.now())
+            .order_by('expires_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
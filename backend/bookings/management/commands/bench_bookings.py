@@ -0,0 +1,300 @@
+"""
+Booking throughput and oversell stress benchmark.
+
+Creates a throwaway test database on the configured Postgres server, sets
+up one nearly sold-out room and lets N concurrent workers hammer
+POST /api/v1/bookings/ (optionally through a stand-in availability service).
+Reports latency percentiles, throughput and lock waits, checks that no night
+was oversold, and writes the results as JSON so runs can be compared.
+
+Usage:
+    python manage.py bench_bookings --workers 32 --requests 500
+    python manage.py bench_bookings --mode remote --service-latency-ms 20
+"""
+import datetime as _dt
+import json
+import logging
+import random
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def make_stub_handler(latency_s):
+    class StubAvailabilityHandler(BaseHTTPRequestHandler):
+        """Always answers "available" so the inventory guard is what stops oversell."""
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency_s)
+            body = json.dumps({"available": True, "reason": "stub"}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubAvailabilityHandler
+
+
+class LockWaitSampler(threading.Thread):
+    """Samples ungranted locks in the benchmark database every `interval` seconds."""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_locks l JOIN pg_database d ON d.oid = l.database "
+                        "WHERE NOT l.granted AND d.datname = current_database()"
+                    )
+                    self.samples.append(cursor.fetchone()[0])
+                    self.stopped.wait(self.interval)
+        finally:
+            connection.close()
+
+    def summary(self):
+        samples = self.samples or [0]
+        return {
+            'samples': len(self.samples),
+            'max_waiting': max(samples),
+            'mean_waiting': round(sum(samples) / len(samples), 3),
+            'pct_samples_with_waiters': round(100 * sum(1 for s in samples if s) / len(samples), 2),
+        }
+
+
+class Command(BaseCommand):
+    help = "Stress POST /api/v1/bookings/ on one nearly sold-out room and check for oversell."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent booking clients')
+        parser.add_argument('--requests', type=int, default=400, help='Total booking attempts')
+        parser.add_argument('--total-rooms', type=int, default=20, help='Capacity of the target room')
+        parser.add_argument('--preload', type=float, default=0.8, help='Fraction of capacity already booked')
+        parser.add_argument('--horizon', type=int, default=14, help='Nights of inventory to book within')
+        parser.add_argument('--max-nights', type=int, default=4, help='Longest stay requested')
+        parser.add_argument('--mode', choices=['local', 'remote'], default='local', help='Availability mode')
+        parser.add_argument('--service-latency-ms', type=float, default=5.0, help='Stand-in service latency (remote mode)')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'results'),
+                            help='Directory for JSON results')
+
+    def handle(self, *args, **options):
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('bookings').setLevel(logging.CRITICAL)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            result = self._run(options)
+        finally:
+            connection.close()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        path = self._save(result, Path(options['output']))
+        self._report(result, path)
+        if not result['invariant']['ok']:
+            raise CommandError(f"Oversell detected: {result['invariant']['violations']}")
+
+    # ------------------------------------------------------------------
+
+    def _setup_room(self, options):
+        from hotels.models import Hotel, Room, RoomInventory
+
+        hotel = Hotel.objects.create(name='Bench Hotel', city='Bench', address='-', rating=4, price_min=100)
+        room = Room.objects.create(
+            hotel=hotel, room_name='Bench Room', price_per_night=100,
+            total_rooms=options['total_rooms'], available_rooms=options['total_rooms'],
+        )
+        start = _dt.date.today() + _dt.timedelta(days=30)
+        preload = int(options['total_rooms'] * options['preload'])
+        RoomInventory.objects.bulk_create([
+            RoomInventory(room=room, date=start + _dt.timedelta(days=i),
+                          total_rooms=options['total_rooms'], booked_rooms=preload)
+            for i in range(options['horizon'])
+        ])
+        return room, start, preload
+
+    def _run(self, options):
+        room, start, preload = self._setup_room(options)
+        rng = random.Random(options['seed'])
+        stays = []
+        for _ in range(options['requests']):
+            nights = rng.randint(1, options['max_nights'])
+            offset = rng.randint(0, options['horizon'] - nights)
+            check_in = start + _dt.timedelta(days=offset)
+            stays.append((check_in, check_in + _dt.timedelta(days=nights)))
+
+        overrides = {'AVAILABILITY_MODE': options['mode']}
+        server = None
+        if options['mode'] == 'remote':
+            server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(options['service_latency_ms'] / 1000))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            overrides['AVAILABILITY_SERVICE_URL'] = f"http://127.0.0.1:{server.server_port}/check-availability"
+
+        latencies = []
+        statuses = {}
+        lock = threading.Lock()
+        queue = list(enumerate(stays))
+
+        def worker():
+            client = APIClient()
+            try:
+                while True:
+                    with lock:
+                        if not queue:
+                            return
+                        i, (check_in, check_out) = queue.pop()
+                    payload = {
+                        'user_name': f'Bench {i}',
+                        'user_email': f'bench{i}@example.com',
+                        'room': room.id,
+                        'check_in': str(check_in),
+                        'check_out': str(check_out),
+                    }
+                    began = time.perf_counter()
+                    code = client.post('/api/v1/bookings/', payload, format='json').status_code
+                    elapsed = (time.perf_counter() - began) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses[code] = statuses.get(code, 0) + 1
+            finally:
+                connection.close()
+
+        sampler = LockWaitSampler()
+        with override_settings(**overrides):
+            sampler.start()
+            began = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(options['workers'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - began
+            sampler.stopped.set()
+            sampler.join()
+
+        if server is not None:
+            server.shutdown()
+
+        latencies.sort()
+        return {
+            'timestamp': _dt.datetime.now(_dt.timezone.utc).isoformat(),
+            'commit': self._git_commit(),
+            'config': {k: options[k] for k in (
+                'workers', 'requests', 'total_rooms', 'preload', 'horizon',
+                'max_nights', 'mode', 'service_latency_ms', 'seed',
+            )},
+            'wall_seconds': round(wall, 3),
+            'throughput_rps': round(len(latencies) / wall, 2) if wall else 0.0,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2) if latencies else 0.0,
+                'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            },
+            'status_counts': {str(k): v for k, v in sorted(statuses.items())},
+            'lock_waits': sampler.summary(),
+            'invariant': self._check_invariant(room, preload),
+        }
+
+    def _check_invariant(self, room, preload):
+        """sum(confirmed bookings per night) + preload <= total_rooms, and matches booked_rooms."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT inv.date, inv.total_rooms, inv.booked_rooms,
+                       (SELECT count(*) FROM bookings_booking b
+                        WHERE b.room_id = inv.room_id AND b.status = 'confirmed'
+                          AND b.check_in <= inv.date AND b.check_out > inv.date) AS confirmed
+                FROM hotels_roominventory inv
+                WHERE inv.room_id = %s
+                ORDER BY inv.date
+                """,
+                [room.id],
+            )
+            rows = cursor.fetchall()
+
+        violations = [
+            {'date': str(day), 'total_rooms': total, 'booked_rooms': booked, 'confirmed': confirmed + preload}
+            for day, total, booked, confirmed in rows
+            if confirmed + preload > total or booked != confirmed + preload
+        ]
+        return {'ok': not violations, 'nights_checked': len(rows), 'violations': violations}
+
+    def _git_commit(self):
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+            ).decode().strip()
+        except Exception:
+            return None
+
+    def _save(self, result, directory):
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = _dt.datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = directory / f"bench-bookings-{result['config']['mode']}-{stamp}.json"
+        path.write_text(json.dumps(result, indent=2))
+        return path
+
+    def _previous(self, path):
+        """Most recent earlier result with the same configuration, if any."""
+        current = json.loads(path.read_text())
+        for candidate in sorted(path.parent.glob('bench-bookings-*.json'), reverse=True):
+            if candidate == path:
+                continue
+            try:
+                data = json.loads(candidate.read_text())
+            except ValueError:
+                continue
+            if data.get('config') == current['config']:
+                return candidate, data
+        return None, None
+
+    def _report(self, result, path):
+        lat = result['latency_ms']
+        self.stdout.write(
+            f"{result['config']['requests']} requests, {result['config']['workers']} workers "
+            f"({result['config']['mode']} mode) in {result['wall_seconds']}s"
+        )
+        self.stdout.write(f"  throughput: {result['throughput_rps']} req/s")
+        self.stdout.write(f"  latency ms: p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}")
+        self.stdout.write(f"  statuses:   {result['status_counts']}")
+        self.stdout.write(f"  lock waits: {result['lock_waits']}")
+        self.stdout.write(f"  invariant:  {'OK' if result['invariant']['ok'] else 'VIOLATED'}")
+
+        previous_path, previous = self._previous(path)
+        if previous:
+            def delta(now, before):
+                return f"{now} ({'+' if now >= before else ''}{round(now - before, 2)})"
+            self.stdout.write(f"  vs {previous_path.name}:")
+            self.stdout.write(f"    throughput: {delta(result['throughput_rps'], previous['throughput_rps'])}")
+            self.stdout.write(f"    p95 ms:     {delta(lat['p95'], previous['latency_ms']['p95'])}")
+            self.stdout.write(f"    p99 ms:     {delta(lat['p99'], previous['latency_ms']['p99'])}")
+        self.stdout.write(f"Results written to {path}")
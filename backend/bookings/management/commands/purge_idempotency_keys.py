@@ -0,0 +1,20 @@
+"""
+Delete expired Idempotency-Key rows in small batches.
+
+Usage:
+    python manage.py purge_idempotency_keys --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+
+from bookings.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Purge expired booking Idempotency-Key records in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per statement')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options['batch_size'])
+        self.stdout.write(f"Deleted {deleted} expired idempotency keys")
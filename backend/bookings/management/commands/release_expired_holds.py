@@ -0,0 +1,29 @@
+"""
+Release expired checkout holds and give their inventory back.
+
+Usage:
+    python manage.py release_expired_holds                # one sweep
+    python manage.py release_expired_holds --loop 30      # sweep every 30s
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.holds import release_expired
+
+
+class Command(BaseCommand):
+    help = "Release expired InventoryHold rows in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Holds released per transaction')
+        parser.add_argument('--loop', type=float, default=None, help='Keep sweeping every N seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            released = release_expired(options['batch_size'])
+            if released:
+                self.stdout.write(f"Released {released} expired holds")
+            if options['loop'] is None:
+                break
+            time.sleep(options['loop'])
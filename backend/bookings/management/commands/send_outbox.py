@@ -0,0 +1,31 @@
+"""
+Deliver queued emails from the EmailOutbox table.
+
+Usage:
+    python manage.py send_outbox            # run forever
+    python manage.py send_outbox --once     # drain due messages and exit
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Send pending EmailOutbox messages in batches (safe to run several workers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages per SMTP connection')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once no due messages are left')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_batch(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
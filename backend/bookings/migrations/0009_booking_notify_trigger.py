@@ -0,0 +1,56 @@
+"""
+Publish changes to confirmed bookings on the `availability_changes` channel
+(see hotels 0013) so the availability service evicts overlapping stays.
+"""
+from django.db import migrations
+
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION bookings_booking_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'confirmed' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'booking', 'room', OLD.room_id, 'from', OLD.check_in, 'to', OLD.check_out,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'confirmed' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'booking', 'room', NEW.room_id, 'from', NEW.check_in, 'to', NEW.check_out,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_booking_notify
+    AFTER INSERT OR DELETE ON bookings_booking
+    FOR EACH ROW EXECUTE FUNCTION bookings_booking_notify();
+
+CREATE TRIGGER bookings_booking_notify_upd
+    AFTER UPDATE ON bookings_booking
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.room_id IS DISTINCT FROM NEW.room_id
+          OR OLD.check_in IS DISTINCT FROM NEW.check_in
+          OR OLD.check_out IS DISTINCT FROM NEW.check_out)
+    EXECUTE FUNCTION bookings_booking_notify();
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS bookings_booking_notify_upd ON bookings_booking;
+DROP TRIGGER IF EXISTS bookings_booking_notify ON bookings_booking;
+DROP FUNCTION IF EXISTS bookings_booking_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_inventoryhold'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
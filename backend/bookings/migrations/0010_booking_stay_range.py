@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:03
+#
+# Adding a stored generated column makes Postgres compute `stay` for every
+# existing booking while rewriting the table, so no separate backfill step
+# is needed.
+#
+# The overlap index is GiST on (room_id, stay), which needs btree_gist for
+# the integer column. Servers built without the contrib modules get a GiST
+# index on stay alone (plus the room_id foreign-key index) instead.
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+INDEX_NAME = 'booking_confirmed_stay_gist'
+
+
+def create_overlap_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'")
+        if cursor.fetchone():
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+            columns = 'room_id, stay'
+        else:
+            columns = 'stay'
+        cursor.execute(
+            f"CREATE INDEX {INDEX_NAME} ON bookings_booking USING gist ({columns}) "
+            f"WHERE status = 'confirmed'"
+        )
+
+
+def drop_overlap_index(apps, schema_editor):
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_booking_notify_trigger'),
+        ('hotels', '0014_availability_notify_values'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='stay',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('check_in'), models.F('check_out'), models.Value('[)'), function='daterange'), output_field=django.contrib.postgres.fields.ranges.DateRangeField()),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='booking',
+                    index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('status', 'confirmed')), fields=['room', 'stay'], name=INDEX_NAME),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_overlap_index, drop_overlap_index),
+            ],
+        ),
+    ]
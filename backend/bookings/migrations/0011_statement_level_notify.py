@@ -0,0 +1,110 @@
+"""
+Publish booking changes once per statement (see hotels 0019): one payload
+listing every confirmed stay the statement added or removed, skipped when
+the connection has `availability.notify` switched off.
+"""
+from django.db import migrations
+
+
+FORWARD = """
+DROP TRIGGER IF EXISTS bookings_booking_notify ON bookings_booking;
+DROP TRIGGER IF EXISTS bookings_booking_notify_upd ON bookings_booking;
+
+CREATE OR REPLACE FUNCTION bookings_booking_notify() RETURNS trigger AS $$
+BEGIN
+    IF NOT availability_notify_enabled() THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'booking', 'room', room_id, 'from', check_in, 'to', check_out))
+            FROM new_rows WHERE status = 'confirmed'
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'booking', 'room', room_id, 'from', check_in, 'to', check_out))
+            FROM old_rows WHERE status = 'confirmed'
+        ));
+    ELSE
+        PERFORM availability_notify((
+            SELECT json_agg(event) FROM (
+                SELECT json_build_object('t', 'booking', 'room', s.room_id, 'from', s.check_in, 'to', s.check_out) AS event
+                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                CROSS JOIN LATERAL (VALUES
+                    (o.status, o.room_id, o.check_in, o.check_out),
+                    (n.status, n.room_id, n.check_in, n.check_out)
+                ) AS s (status, room_id, check_in, check_out)
+                WHERE s.status = 'confirmed'
+                  AND (o.status, o.room_id, o.check_in, o.check_out)
+                      IS DISTINCT FROM (n.status, n.room_id, n.check_in, n.check_out)
+            ) events
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_booking_notify_ins
+    AFTER INSERT ON bookings_booking
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bookings_booking_notify();
+
+CREATE TRIGGER bookings_booking_notify_upd
+    AFTER UPDATE ON bookings_booking
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bookings_booking_notify();
+
+CREATE TRIGGER bookings_booking_notify_del
+    AFTER DELETE ON bookings_booking
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bookings_booking_notify();
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS bookings_booking_notify_del ON bookings_booking;
+DROP TRIGGER IF EXISTS bookings_booking_notify_upd ON bookings_booking;
+DROP TRIGGER IF EXISTS bookings_booking_notify_ins ON bookings_booking;
+
+CREATE OR REPLACE FUNCTION bookings_booking_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'confirmed' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'booking', 'room', OLD.room_id, 'from', OLD.check_in, 'to', OLD.check_out,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'confirmed' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'booking', 'room', NEW.room_id, 'from', NEW.check_in, 'to', NEW.check_out,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_booking_notify
+    AFTER INSERT OR DELETE ON bookings_booking
+    FOR EACH ROW EXECUTE FUNCTION bookings_booking_notify();
+
+CREATE TRIGGER bookings_booking_notify_upd
+    AFTER UPDATE ON bookings_booking
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.room_id IS DISTINCT FROM NEW.room_id
+          OR OLD.check_in IS DISTINCT FROM NEW.check_in
+          OR OLD.check_out IS DISTINCT FROM NEW.check_out)
+    EXECUTE FUNCTION bookings_booking_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_booking_stay_range'),
+        ('hotels', '0019_statement_level_notify'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models import F, Func, Q, Value
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.contrib.auth.hashers import make_password, check_password
 from django.utils.translation import gettext_lazy as _
@@ -29,6 +33,12 @@ class Booking(models.Model):
 
     check_in = models.DateField()
     check_out = models.DateField()
+    # [check_in, check_out) maintained by Postgres, for indexed overlap queries
+    stay = models.GeneratedField(
+        expression=Func(F('check_in'), F('check_out'), Value('[)'), function='daterange'),
+        output_field=DateRangeField(),
+        db_persist=True,
+    )
     num_adults = models.PositiveIntegerField(default=1)   # NEW
     num_children = models.PositiveIntegerField(default=0) # NEW
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -37,6 +47,16 @@ class Booking(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Overlap checks only count confirmed stays: stay && daterange(...)
+            GistIndex(
+                fields=['room', 'stay'],
+                name='booking_confirmed_stay_gist',
+                condition=Q(status='confirmed'),
+            ),
+        ]
+
     def __str__(self):
         return f"Booking {self.id} - {self.user_email}"
 
@@ -80,3 +100,93 @@ class EmailSession(models.Model):
 
     def is_valid(self):
         return self.valid and timezone.now() < self.expires_at
+
+
+class EmailOutbox(models.Model):
+    """Outgoing email written in the same transaction as the booking/OTP.
+
+    The `send_outbox` management command claims pending rows with
+    SELECT ... FOR UPDATE SKIP LOCKED and delivers them in batches, so
+    request handlers never wait on SMTP.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True, null=True)
+    recipients = models.JSONField(default=list)
+    # Body is cleared once sent (e.g. OTP codes should not stay at rest)
+    sensitive = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='emailoutbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"Email {self.id} ({self.status}) - {self.subject}"
+
+
+class IdempotencyKey(models.Model):
+    """Client-supplied Idempotency-Key for public booking creation.
+
+    The row is inserted in the booking transaction, so a concurrent request
+    with the same key blocks on the unique index until the first one
+    commits, then replays its stored response instead of booking again.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    fingerprint = models.CharField(max_length=64, help_text=_('SHA-256 of method, path and body.'))
+    response_status = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"IdempotencyKey {self.key} ({self.response_status or 'in progress'})"
+
+
+class InventoryHold(models.Model):
+    """Short-lived reservation of one room for a stay during checkout.
+
+    Creating a hold reserves inventory immediately; a booking that presents
+    the token converts it with one UPDATE instead of locking the Room and
+    re-checking availability. Expired active holds are released by the
+    `release_expired_holds` command.
+    """
+
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('converted', 'Converted'),
+        ('released', 'Released'),
+    ]
+
+    token = models.CharField(max_length=64, unique=True)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='holds')
+    check_in = models.DateField()
+    check_out = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Sweeper only ever looks at active holds ordered by expiry
+            models.Index(fields=['expires_at'], condition=models.Q(status='active'), name='inventoryhold_active_exp_idx'),
+        ]
+
+    def __str__(self):
+        return f"Hold {self.token} - room {self.room_id} ({self.status})"
@@ -0,0 +1,106 @@
+"""
+Transactional email outbox.
+
+`queue_email` stores a message in the caller's transaction; `deliver_batch`
+claims due rows with FOR UPDATE SKIP LOCKED (so several workers can run at
+once), sends them over one SMTP connection and reschedules failures with
+exponential backoff.
+"""
+import datetime as _dt
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, body, recipients, from_email=None, sensitive=False):
+    """Add a message to the outbox. Call inside the transaction that produced it."""
+    return EmailOutbox.objects.create(
+        subject=subject,
+        body=body,
+        recipients=list(recipients),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        sensitive=sensitive,
+    )
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts - 1), capped."""
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return _dt.timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _record_failure(message, exc):
+    message.last_error = str(exc)
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = 'failed'
+        logger.error("Giving up on outbox email %s after %s attempts: %s", message.id, message.attempts, exc)
+    else:
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+        logger.warning("Outbox email %s failed (attempt %s): %s", message.id, message.attempts, exc)
+
+
+def deliver_batch(batch_size=None):
+    """
+    Deliver up to `batch_size` due messages. Returns (sent, failed) counts.
+
+    Rows stay locked until the batch commits, so concurrent workers skip
+    them instead of sending duplicates.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = failed = 0
+
+    with transaction.atomic():
+        messages = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not messages:
+            return sent, failed
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            # No SMTP connection: count an attempt for the whole batch
+            for message in messages:
+                message.attempts += 1
+                _record_failure(message, exc)
+            failed = len(messages)
+        else:
+            try:
+                for message in messages:
+                    message.attempts += 1
+                    try:
+                        EmailMessage(
+                            message.subject,
+                            message.body,
+                            message.from_email,
+                            message.recipients,
+                            connection=connection,
+                        ).send()
+                    except Exception as exc:
+                        failed += 1
+                        _record_failure(message, exc)
+                    else:
+                        sent += 1
+                        message.status = 'sent'
+                        message.sent_at = timezone.now()
+                        message.last_error = ''
+                        if message.sensitive:
+                            message.body = ''
+            finally:
+                connection.close()
+
+        EmailOutbox.objects.bulk_update(
+            messages, ['body', 'status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at']
+        )
+
+    return sent, failed
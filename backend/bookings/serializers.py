@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Booking, OTPRequest, EmailSession
-from hotels.models import Room
+from hotels.models import Hotel, Room
+from hotels.pricing import quote_stay
 from datetime import timedelta
 
 
@@ -39,18 +40,18 @@ class BookingSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
+        # True when a converted InventoryHold already reserved the stay
+        inventory_reserved = validated_data.pop('inventory_reserved', False)
         room = validated_data['room']
         hotel = room.hotel
         check_in = validated_data['check_in']
         check_out = validated_data['check_out']
 
-        # Price calculation
-        nights = (check_out - check_in).days
-        total_price = (room.price_per_night or 0) * nights
+        # Price calculation (per-night rates, falling back to price_per_night)
+        total_price = quote_stay(room, check_in, check_out)['total']
 
         from django.db import transaction
-        from hotels.models import RoomInventory
-        from datetime import timedelta
+        from hotels.inventory import reserve_stay
 
         with transaction.atomic():
             # Create the booking
@@ -68,22 +69,72 @@ class BookingSerializer(serializers.ModelSerializer):
                 status=validated_data.get('status', 'confirmed')
             )
 
-            # If confirmed, increment inventory
-            if booking.status == 'confirmed':
-                curr = check_in
-                while curr < check_out:
-                    inv, _ = RoomInventory.objects.select_for_update().get_or_create(
-                        room=room, 
-                        date=curr,
-                        defaults={'total_rooms': room.total_rooms}
-                    )
-                    inv.booked_rooms += 1
-                    inv.save()
-                    curr += timedelta(days=1)
-            
+            # If confirmed, reserve every night in one conditional update.
+            # Raises InventoryUnavailable (rolling back the booking) when any
+            # night is already full.
+            if booking.status == 'confirmed' and not inventory_reserved:
+                reserve_stay(room, check_in, check_out)
+
             return booking
 
 
+class GroupBookingLineSerializer(serializers.Serializer):
+    room = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all())
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    num_adults = serializers.IntegerField(min_value=1, default=1)
+    num_children = serializers.IntegerField(min_value=0, default=0)
+
+    def validate(self, data):
+        if data['check_in'] >= data['check_out']:
+            raise serializers.ValidationError("Check-out must be after check-in")
+        return data
+
+
+class GroupBookingSerializer(serializers.Serializer):
+    """One guest booking several rooms (or date ranges) atomically."""
+    MAX_LINES = 20
+
+    user_name = serializers.CharField(max_length=150)
+    user_email = serializers.EmailField()
+    user_phone = serializers.CharField(max_length=30, required=False, allow_blank=True, allow_null=True)
+    lines = GroupBookingLineSerializer(many=True)
+
+    def validate_lines(self, lines):
+        if not lines:
+            raise serializers.ValidationError("At least one booking line is required")
+        if len(lines) > self.MAX_LINES:
+            raise serializers.ValidationError(f"A group booking can have at most {self.MAX_LINES} lines")
+        return lines
+
+
+class InventoryHoldSerializer(serializers.Serializer):
+    room = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all())
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, data):
+        if data['check_in'] >= data['check_out']:
+            raise serializers.ValidationError("Check-out must be after check-in")
+        return data
+
+
+class BulkCancelSerializer(serializers.Serializer):
+    hotel = serializers.PrimaryKeyRelatedField(queryset=Hotel.objects.all(), required=False)
+    room = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all(), required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    chunk_size = serializers.IntegerField(min_value=1, max_value=5000, default=500)
+    notify = serializers.BooleanField(default=True)
+
+    def validate(self, data):
+        if not data.get('hotel') and not data.get('room'):
+            raise serializers.ValidationError("hotel or room is required")
+        if data.get('date_from') and data.get('date_to') and data['date_from'] >= data['date_to']:
+            raise serializers.ValidationError("date_to must be after date_from")
+        return data
+
+
 class OTPRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
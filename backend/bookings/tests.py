@@ -1,7 +1,9 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
-from hotels.models import Hotel, Room
+from django.test import override_settings
+from hotels.models import Hotel, Room, RoomInventory
+from .models import Booking
 from .views import get_dates_in_range
 from django.utils import timezone
 import datetime as _dt
@@ -23,6 +25,8 @@ class BookingViewsTests(TestCase):
 		# Create hotel, room
 		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
 		room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=2, available_rooms=2)
+		for day in ('2025-12-28', '2025-12-29'):
+			RoomInventory.objects.create(room=room, date=day, total_rooms=2)
 		client = APIClient()
 		payload = {
 			'user_name': 'John Doe',
@@ -35,6 +39,50 @@ class BookingViewsTests(TestCase):
 		self.assertEqual(resp.status_code, 201)
 		self.assertEqual(resp.data['user_email'], 'john@example.com')
 
+	@override_settings(AVAILABILITY_MODE='remote', AVAILABILITY_SERVICE_URL='http://127.0.0.1:1/check-availability')
+	def test_public_booking_falls_back_to_local_engine(self):
+		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=1, available_rooms=1)
+		RoomInventory.objects.create(room=room, date='2026-02-01', total_rooms=1)
+		payload = {
+			'user_name': 'John Doe',
+			'user_email': 'john@example.com',
+			'room': room.id,
+			'check_in': '2026-02-01',
+			'check_out': '2026-02-02'
+		}
+		resp = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(resp.status_code, 201)
+
+		# Second booking is rejected by the local engine with the service's reason
+		resp = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(resp.status_code, 400)
+		self.assertIn('fully booked', resp.data['error'])
+
+	def test_unavailable_booking_suggests_other_dates(self):
+		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=1, available_rooms=1)
+		start = _dt.date.today() + _dt.timedelta(days=10)
+		for i in range(6):
+			RoomInventory.objects.create(room=room, date=start + _dt.timedelta(days=i), total_rooms=1, booked_rooms=1 if i == 1 else 0)
+		payload = {
+			'user_name': 'John Doe',
+			'user_email': 'john@example.com',
+			'room': room.id,
+			'check_in': str(start),
+			'check_out': str(start + _dt.timedelta(days=2)),
+		}
+		resp = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(resp.status_code, 400)
+		self.assertEqual(
+			[(s['check_in'], s['check_out']) for s in resp.data['suggestions']],
+			[(start + _dt.timedelta(days=d), start + _dt.timedelta(days=d + 2)) for d in (2, 3, 4)],
+		)
+
+		with override_settings(AVAILABILITY_SUGGESTIONS=0):
+			resp = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(resp.data['suggestions'], [])
+
 	def test_otp_request_and_verify_flow(self):
 		client = APIClient()
 		email = 'otpuser@example.com'
@@ -50,3 +98,535 @@ class BookingViewsTests(TestCase):
 		self.assertEqual(resp.status_code, 200)
 		self.assertIn('token', resp.data)
 
+
+
+class BookingInventoryReservationTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=self.hotel, room_name='Room 1', price_per_night=100, total_rooms=2, available_rooms=2)
+
+	def _create(self, check_in, check_out):
+		from .serializers import BookingSerializer
+		serializer = BookingSerializer(data={
+			'user_name': 'Jane Doe',
+			'user_email': 'jane@example.com',
+			'room': self.room.id,
+			'check_in': check_in,
+			'check_out': check_out,
+		})
+		self.assertTrue(serializer.is_valid(), serializer.errors)
+		return serializer.save()
+
+	def test_reserves_every_night_and_creates_missing_rows(self):
+		from hotels.models import RoomInventory
+		RoomInventory.objects.create(room=self.room, date='2026-01-10', total_rooms=2, booked_rooms=1)
+		self._create('2026-01-10', '2026-01-13')
+		rows = list(RoomInventory.objects.filter(room=self.room).values_list('date', 'booked_rooms'))
+		self.assertEqual([str(d) for d, _ in rows], ['2026-01-10', '2026-01-11', '2026-01-12'])
+		self.assertEqual([b for _, b in rows], [2, 1, 1])
+
+	def test_full_night_rolls_back_whole_stay(self):
+		from hotels.models import RoomInventory
+		from hotels.inventory import InventoryUnavailable
+		RoomInventory.objects.create(room=self.room, date='2026-01-11', total_rooms=2, booked_rooms=2)
+		with self.assertRaises(InventoryUnavailable):
+			self._create('2026-01-10', '2026-01-13')
+		self.assertFalse(Booking.objects.exists())
+		self.assertEqual(RoomInventory.objects.get(date='2026-01-11').booked_rooms, 2)
+		self.assertFalse(RoomInventory.objects.filter(booked_rooms=1).exists())
+
+
+class LocalAvailabilityEngineTests(TestCase):
+	def setUp(self):
+		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=2, available_rooms=2)
+
+	def _check(self, check_in, check_out):
+		from .availability import check_local
+		return check_local(self.room.id, _dt.date.fromisoformat(check_in), _dt.date.fromisoformat(check_out))
+
+	def test_reports_earliest_failing_night(self):
+		RoomInventory.objects.create(room=self.room, date='2026-03-01', total_rooms=2)
+		RoomInventory.objects.create(room=self.room, date='2026-03-02', total_rooms=2, booked_rooms=2)
+		self.assertEqual(
+			self._check('2026-03-01', '2026-03-05').reason,
+			'No rooms available for 2026-03-02. Please check for another date',
+		)
+		self.assertEqual(
+			self._check('2026-02-28', '2026-03-05').reason,
+			'Inventory not defined for 2026-02-28. Please check for another date',
+		)
+
+	def test_available_and_unknown_room(self):
+		for day in range(1, 31):
+			RoomInventory.objects.create(room=self.room, date=_dt.date(2026, 4, day), total_rooms=2, booked_rooms=1)
+		self.assertTrue(self._check('2026-04-01', '2026-05-01').available)
+		self.room.delete()
+		self.assertEqual(self._check('2026-04-01', '2026-04-02').reason, 'Room not found')
+
+
+class AvailabilityClientTests(TestCase):
+	def _client(self, **kwargs):
+		from .availability_client import AvailabilityClient
+		options = {'retries': 1, 'backoff': 0, 'failure_threshold': 2, 'reset_timeout': 60}
+		options.update(kwargs)
+		return AvailabilityClient('http://availability.invalid/check-availability', **options)
+
+	def test_retries_then_opens_circuit(self):
+		import requests
+		from unittest import mock
+		from .availability_client import AvailabilityServiceError, CircuitOpenError
+		client = self._client()
+		with mock.patch.object(client.session, 'post', side_effect=requests.ConnectionError('down')) as post:
+			for _ in range(2):
+				with self.assertRaises(AvailabilityServiceError):
+					client.check(1, '2026-01-01', '2026-01-02')
+			self.assertEqual(post.call_count, 4)
+
+			# Breaker is open: fail fast without touching the network
+			with self.assertRaises(CircuitOpenError):
+				client.check(1, '2026-01-01', '2026-01-02')
+			self.assertEqual(post.call_count, 4)
+
+		stats = client.stats()
+		self.assertEqual(stats['breaker_state'], 'open')
+		self.assertEqual(stats['errors'], 2)
+		self.assertEqual(stats['retries'], 2)
+		self.assertEqual(stats['short_circuited'], 1)
+
+	def test_success_returns_result_and_closes_circuit(self):
+		from unittest import mock
+		client = self._client(reset_timeout=0)
+		client.breaker.record_failure()
+		client.breaker.record_failure()
+		response = mock.Mock(status_code=200)
+		response.json.return_value = {'available': False, 'reason': 'No rooms available'}
+		with mock.patch.object(client.session, 'post', return_value=response):
+			result = client.check(1, '2026-01-01', '2026-01-02')
+		self.assertFalse(result.available)
+		self.assertEqual(result.reason, 'No rooms available')
+		self.assertEqual(client.stats()['breaker_state'], 'closed')
+
+	def test_half_open_lets_one_probe_through(self):
+		from .availability_client import CircuitBreaker
+		breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+		breaker.record_failure()
+		self.assertTrue(breaker.allow())
+		# Everyone else waits for the probe's outcome
+		self.assertFalse(breaker.allow())
+		self.assertFalse(breaker.allow())
+		breaker.record_failure()
+		self.assertEqual(breaker.state, 'open')
+		self.assertTrue(breaker.allow())
+		self.assertFalse(breaker.allow())
+		breaker.record_success()
+		self.assertTrue(breaker.allow())
+		self.assertTrue(breaker.allow())
+
+	def test_client_errors_do_not_open_circuit(self):
+		from unittest import mock
+		from .availability_client import AvailabilityServiceError
+		client = self._client()
+		response = mock.Mock(status_code=422, text='Check-out must be after check-in')
+		with mock.patch.object(client.session, 'post', return_value=response) as post:
+			for _ in range(3):
+				with self.assertRaises(AvailabilityServiceError):
+					client.check(1, '2026-01-02', '2026-01-01')
+		# Not retried, and the breaker stays closed
+		self.assertEqual(post.call_count, 3)
+		stats = client.stats()
+		self.assertEqual(stats['breaker_state'], 'closed')
+		self.assertEqual((stats['client_errors'], stats['errors']), (3, 0))
+
+
+class EmailOutboxTests(TestCase):
+	def test_otp_request_queues_email_instead_of_sending(self):
+		from django.core import mail
+		from .models import EmailOutbox
+		resp = APIClient().post('/api/v1/bookings/otp/request/', {'email': 'otp@example.com'}, format='json')
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual(len(mail.outbox), 0)
+		queued = EmailOutbox.objects.get()
+		self.assertEqual(queued.recipients, ['otp@example.com'])
+		self.assertTrue(queued.sensitive)
+
+	def test_deliver_batch_sends_and_marks_rows(self):
+		from django.core import mail
+		from .models import EmailOutbox
+		from .outbox import queue_email, deliver_batch
+		queue_email('Hello', 'Body', ['a@example.com'])
+		queue_email('Code', 'Your OTP is 123456', ['b@example.com'], sensitive=True)
+		self.assertEqual(deliver_batch(), (2, 0))
+		self.assertEqual(len(mail.outbox), 2)
+		self.assertFalse(EmailOutbox.objects.exclude(status='sent').exists())
+		self.assertEqual(EmailOutbox.objects.get(subject='Code').body, '')
+		self.assertEqual(deliver_batch(), (0, 0))
+
+	def test_failed_send_is_rescheduled_with_backoff(self):
+		from unittest import mock
+		from .models import EmailOutbox
+		from .outbox import queue_email, deliver_batch
+		queue_email('Hello', 'Body', ['a@example.com'])
+		with mock.patch('bookings.outbox.EmailMessage.send', side_effect=OSError('smtp down')):
+			self.assertEqual(deliver_batch(), (0, 1))
+		message = EmailOutbox.objects.get()
+		self.assertEqual(message.status, 'pending')
+		self.assertEqual(message.attempts, 1)
+		self.assertGreater(message.next_attempt_at, timezone.now())
+		# Not due yet, so nothing is retried immediately
+		self.assertEqual(deliver_batch(), (0, 0))
+
+
+class GroupBookingTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room_a = Room.objects.create(hotel=self.hotel, room_name='Room A', price_per_night=100, total_rooms=1, available_rooms=1)
+		self.room_b = Room.objects.create(hotel=self.hotel, room_name='Room B', price_per_night=150, total_rooms=1, available_rooms=1)
+		for room in (self.room_a, self.room_b):
+			for day in ('2026-03-01', '2026-03-02'):
+				RoomInventory.objects.create(room=room, date=day, total_rooms=1)
+
+	def _post(self, lines):
+		payload = {'user_name': 'Jane Doe', 'user_email': 'jane@example.com', 'lines': lines}
+		return APIClient().post('/api/v1/bookings/group/', payload, format='json')
+
+	def test_books_all_lines(self):
+		resp = self._post([
+			{'room': self.room_b.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+			{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+		])
+		self.assertEqual(resp.status_code, 201, resp.data)
+		self.assertEqual(len(resp.data['bookings']), 2)
+		self.assertEqual(resp.data['total_price'], 500)
+		self.assertFalse(RoomInventory.objects.filter(booked_rooms=0).exists())
+
+	def test_unavailable_line_books_nothing(self):
+		RoomInventory.objects.filter(room=self.room_b, date='2026-03-02').update(booked_rooms=1)
+		resp = self._post([
+			{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+			{'room': self.room_b.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+		])
+		self.assertEqual(resp.status_code, 400)
+		self.assertEqual(resp.data['lines'][0]['line'], 1)
+		self.assertFalse(Booking.objects.exists())
+		self.assertFalse(RoomInventory.objects.filter(room=self.room_a, booked_rooms__gt=0).exists())
+
+	def test_lines_exceeding_capacity_together_roll_back(self):
+		resp = self._post([
+			{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-02'},
+			{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+		])
+		self.assertEqual(resp.status_code, 400)
+		self.assertFalse(Booking.objects.exists())
+		self.assertFalse(RoomInventory.objects.filter(booked_rooms__gt=0).exists())
+
+	def test_lines_on_the_same_dates_share_one_availability_query(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		with CaptureQueriesContext(connection) as queries:
+			resp = self._post([
+				{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+				{'room': self.room_b.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+			])
+		self.assertEqual(resp.status_code, 201, resp.data)
+		checks = [q for q in queries.captured_queries if 'bookings_booking b' in q['sql']]
+		self.assertEqual(len(checks), 1)
+
+	@override_settings(AVAILABILITY_MODE='remote', AVAILABILITY_SERVICE_URL='http://group.invalid/check-availability')
+	def test_remote_mode_checks_all_lines_in_one_call(self):
+		from unittest import mock
+		from .availability_client import get_client
+		response = mock.Mock(status_code=200)
+		response.json.return_value = {'rooms': [
+			{'room_id': self.room_a.id, 'available': True, 'reason': 'Room is available for the selected dates'},
+			{'room_id': self.room_b.id, 'available': False, 'reason': 'No rooms available for 2026-03-02'},
+		]}
+		with mock.patch.object(get_client().session, 'post', return_value=response) as post:
+			resp = self._post([
+				{'room': self.room_a.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+				{'room': self.room_b.id, 'check_in': '2026-03-01', 'check_out': '2026-03-03'},
+			])
+		self.assertEqual(post.call_count, 1)
+		self.assertEqual(post.call_args.args[0], 'http://group.invalid/check-availability/batch')
+		self.assertEqual(post.call_args.kwargs['json']['room_ids'], sorted([self.room_a.id, self.room_b.id]))
+		self.assertEqual(resp.status_code, 400)
+		self.assertEqual(resp.data['lines'], [{'line': 1, 'room': self.room_b.id, 'error': 'No rooms available for 2026-03-02'}])
+
+
+class IdempotencyKeyTests(TestCase):
+	def setUp(self):
+		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=3, available_rooms=3)
+		RoomInventory.objects.create(room=self.room, date='2026-04-01', total_rooms=3)
+		self.payload = {
+			'user_name': 'John Doe',
+			'user_email': 'john@example.com',
+			'room': self.room.id,
+			'check_in': '2026-04-01',
+			'check_out': '2026-04-02'
+		}
+
+	def _post(self, payload, key='retry-key-1'):
+		return APIClient().post('/api/v1/bookings/', payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+	def test_retry_replays_first_response(self):
+		first = self._post(self.payload)
+		self.assertEqual(first.status_code, 201)
+		second = self._post(self.payload)
+		self.assertEqual(second.status_code, 201)
+		self.assertEqual(second['Idempotent-Replayed'], 'true')
+		self.assertEqual(second.data['id'], first.data['id'])
+		self.assertEqual(Booking.objects.count(), 1)
+		self.assertEqual(RoomInventory.objects.get(room=self.room).booked_rooms, 1)
+
+	def test_key_reused_with_different_body_is_rejected(self):
+		self.assertEqual(self._post(self.payload).status_code, 201)
+		resp = self._post(dict(self.payload, user_name='Someone Else'))
+		self.assertEqual(resp.status_code, 422)
+		self.assertEqual(Booking.objects.count(), 1)
+
+	def test_purge_expired_deletes_only_expired_keys(self):
+		from .models import IdempotencyKey
+		from .idempotency import purge_expired
+		now = timezone.now()
+		IdempotencyKey.objects.create(key='old-1', fingerprint='x', expires_at=now - _dt.timedelta(hours=1))
+		IdempotencyKey.objects.create(key='old-2', fingerprint='x', expires_at=now - _dt.timedelta(hours=2))
+		IdempotencyKey.objects.create(key='fresh', fingerprint='x', expires_at=now + _dt.timedelta(hours=1))
+		self.assertEqual(purge_expired(batch_size=1), 2)
+		self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['fresh'])
+
+
+class InventoryHoldTests(TestCase):
+	def setUp(self):
+		hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=hotel, room_name='Room 1', price_per_night=100, total_rooms=1, available_rooms=1)
+		for day in ('2026-05-01', '2026-05-02'):
+			RoomInventory.objects.create(room=self.room, date=day, total_rooms=1)
+		self.stay = {'room': self.room.id, 'check_in': '2026-05-01', 'check_out': '2026-05-03'}
+
+	def _hold(self):
+		return APIClient().post('/api/v1/bookings/holds/', self.stay, format='json')
+
+	def _booked(self):
+		return list(RoomInventory.objects.filter(room=self.room).values_list('booked_rooms', flat=True))
+
+	def test_hold_reserves_and_booking_converts_it(self):
+		resp = self._hold()
+		self.assertEqual(resp.status_code, 201, resp.data)
+		self.assertEqual(self._booked(), [1, 1])
+
+		# Room is now held, so a second hold is refused
+		self.assertEqual(self._hold().status_code, 400)
+
+		payload = dict(self.stay, user_name='John Doe', user_email='john@example.com', hold_token=resp.data['hold_token'])
+		booking = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(booking.status_code, 201, booking.data)
+		self.assertEqual(self._booked(), [1, 1])
+
+		# A converted hold cannot be used again
+		again = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(again.status_code, 400)
+
+	def test_failed_booking_keeps_the_hold(self):
+		from .models import Booking, InventoryHold
+		token = self._hold().data['hold_token']
+		payload = dict(self.stay, user_name='John Doe', user_email='not-an-email', hold_token=token)
+		resp = APIClient().post('/api/v1/bookings/', payload, format='json')
+		self.assertEqual(resp.status_code, 400)
+		self.assertEqual(InventoryHold.objects.get(token=token).status, 'active')
+		self.assertFalse(Booking.objects.exists())
+
+		# The hold can still be converted, or is swept once it expires
+		payload['user_email'] = 'john@example.com'
+		self.assertEqual(APIClient().post('/api/v1/bookings/', payload, format='json').status_code, 201)
+		self.assertEqual(self._booked(), [1, 1])
+
+	def test_expired_holds_are_released_in_batches(self):
+		from .models import InventoryHold
+		from .holds import release_expired
+		token = self._hold().data['hold_token']
+		InventoryHold.objects.filter(token=token).update(expires_at=timezone.now() - _dt.timedelta(seconds=1))
+		self.assertEqual(release_expired(batch_size=1), 1)
+		self.assertEqual(InventoryHold.objects.get(token=token).status, 'released')
+		self.assertEqual(self._booked(), [0, 0])
+
+	def test_release_hold_early(self):
+		token = self._hold().data['hold_token']
+		resp = APIClient().delete(f'/api/v1/bookings/holds/{token}/')
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual(self._booked(), [0, 0])
+		self.assertEqual(APIClient().delete(f'/api/v1/bookings/holds/{token}/').status_code, 404)
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+	"""Bookings run in real transactions from several threads at once."""
+
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=self.hotel, room_name='Room 1', price_per_night=100, total_rooms=3, available_rooms=3)
+		self.nights = [_dt.date(2026, 6, 1) + _dt.timedelta(days=i) for i in range(6)]
+		for night in self.nights:
+			RoomInventory.objects.create(room=self.room, date=night, total_rooms=3)
+
+	def _book(self, check_in, check_out, results):
+		from django.db import connection
+		try:
+			payload = {
+				'user_name': 'Guest',
+				'user_email': 'guest@example.com',
+				'room': self.room.id,
+				'check_in': str(check_in),
+				'check_out': str(check_out),
+			}
+			results.append(APIClient().post('/api/v1/bookings/', payload, format='json').status_code)
+		finally:
+			connection.close()
+
+	def test_no_oversell_under_concurrent_overlapping_bookings(self):
+		import threading
+		results = []
+		threads = []
+		for i in range(12):
+			start = self.nights[i % 3]
+			threads.append(threading.Thread(target=self._book, args=(start, start + _dt.timedelta(days=3), results)))
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual(len(results), 12)
+		self.assertEqual(set(results) - {201, 400}, set())
+		for night in self.nights:
+			confirmed = Booking.objects.filter(room=self.room, status='confirmed', check_in__lte=night, check_out__gt=night).count()
+			inventory = RoomInventory.objects.get(room=self.room, date=night)
+			self.assertLessEqual(confirmed, 3)
+			self.assertEqual(inventory.booked_rooms, confirmed)
+
+	def test_non_overlapping_stays_do_not_wait_for_each_other(self):
+		import threading
+		from django.db import connection, transaction
+		from django.db.utils import OperationalError
+		from hotels.inventory import lock_room_nights
+		holding = threading.Event()
+		done = threading.Event()
+
+		def hold_first_nights():
+			try:
+				with transaction.atomic():
+					lock_room_nights([(self.room.id, self.nights[0], self.nights[2])])
+					holding.set()
+					done.wait(10)
+			finally:
+				connection.close()
+
+		thread = threading.Thread(target=hold_first_nights)
+		thread.start()
+		try:
+			self.assertTrue(holding.wait(10))
+			with transaction.atomic():
+				with connection.cursor() as cursor:
+					cursor.execute("SET LOCAL lock_timeout = '200ms'")
+				# Later nights of the same room are free
+				lock_room_nights([(self.room.id, self.nights[2], self.nights[5])])
+			with self.assertRaises(OperationalError):
+				with transaction.atomic():
+					with connection.cursor() as cursor:
+						cursor.execute("SET LOCAL lock_timeout = '200ms'")
+					# Overlapping night 2 waits for the other transaction
+					lock_room_nights([(self.room.id, self.nights[1], self.nights[3])])
+		finally:
+			done.set()
+			thread.join()
+
+	def test_bulk_cancel_reports_bookings_it_cannot_lock(self):
+		import threading
+		from django.db import connection, transaction
+		from hotels.inventory import reserve_stay
+		from .cancellation import bulk_cancel
+		bookings = []
+		for night in self.nights[:3]:
+			reserve_stay(self.room, night, night + _dt.timedelta(days=1))
+			bookings.append(Booking.objects.create(
+				hotel=self.hotel, room=self.room, user_email='guest@example.com',
+				check_in=night, check_out=night + _dt.timedelta(days=1), total_price=100,
+			))
+		holding = threading.Event()
+		done = threading.Event()
+
+		def hold_booking():
+			try:
+				with transaction.atomic():
+					Booking.objects.select_for_update().get(pk=bookings[1].pk)
+					holding.set()
+					done.wait(10)
+			finally:
+				connection.close()
+
+		thread = threading.Thread(target=hold_booking)
+		thread.start()
+		try:
+			self.assertTrue(holding.wait(10))
+			summary = bulk_cancel(room=self.room, chunk_size=1, notify=False, lock_timeout=0.2)
+		finally:
+			done.set()
+			thread.join()
+		self.assertEqual((summary['cancelled'], summary['skipped']), (2, [bookings[1].pk]))
+		self.assertEqual(Booking.objects.get(pk=bookings[1].pk).status, 'confirmed')
+
+		# Once the lock is gone the next run cancels it
+		summary = bulk_cancel(room=self.room, notify=False)
+		self.assertEqual((summary['cancelled'], summary['skipped']), (1, []))
+		self.assertFalse(RoomInventory.objects.filter(room=self.room, booked_rooms__gt=0).exists())
+
+
+class CancellationTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='City', address='Addr', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=self.hotel, room_name='Room 1', price_per_night=100, total_rooms=5, available_rooms=5)
+		self.admin = User.objects.create_user(username='admin', password='admin123', is_staff=True)
+
+	def _book(self, check_in, check_out):
+		from hotels.inventory import reserve_stay
+		reserve_stay(self.room, check_in, check_out)
+		return Booking.objects.create(
+			hotel=self.hotel, room=self.room, user_email='guest@example.com',
+			check_in=check_in, check_out=check_out, total_price=100,
+		)
+
+	def _booked(self):
+		return dict(RoomInventory.objects.filter(room=self.room).values_list('date', 'booked_rooms'))
+
+	def test_admin_cancel_releases_every_night(self):
+		booking = self._book(_dt.date(2026, 7, 1), _dt.date(2026, 7, 4))
+		client = APIClient()
+		client.force_authenticate(self.admin)
+		resp = client.delete(f'/api/v1/bookings/{booking.id}/cancel/')
+		self.assertEqual(resp.status_code, 200)
+		booking.refresh_from_db()
+		self.assertEqual(booking.status, 'cancelled')
+		self.assertEqual(set(self._booked().values()), {0})
+
+	def test_bulk_cancel_by_room_and_window(self):
+		from .models import EmailOutbox
+		inside = [self._book(_dt.date(2026, 7, d), _dt.date(2026, 7, d + 2)) for d in (1, 2, 3)]
+		outside = self._book(_dt.date(2026, 7, 20), _dt.date(2026, 7, 21))
+		client = APIClient()
+		client.force_authenticate(self.admin)
+		resp = client.post('/api/v1/bookings/admin/bulk-cancel/', {
+			'room': self.room.id, 'date_from': '2026-07-01', 'date_to': '2026-07-10', 'chunk_size': 2,
+		}, format='json')
+		self.assertEqual(resp.status_code, 200, resp.data)
+		self.assertEqual(resp.data, {'cancelled': 3, 'inventory_rows_updated': 5, 'chunks': 2, 'skipped': []})
+		self.assertFalse(Booking.objects.filter(id__in=[b.id for b in inside], status='confirmed').exists())
+		outside.refresh_from_db()
+		self.assertEqual(outside.status, 'confirmed')
+		booked = self._booked()
+		self.assertEqual(booked[_dt.date(2026, 7, 20)], 1)
+		self.assertEqual(sum(booked.values()), 1)
+		self.assertEqual(EmailOutbox.objects.count(), 3)
+
+	def test_bulk_cancel_requires_staff_and_target(self):
+		client = APIClient()
+		self.assertEqual(client.post('/api/v1/bookings/admin/bulk-cancel/', {'room': self.room.id}, format='json').status_code, 401)
+		client.force_authenticate(self.admin)
+		self.assertEqual(client.post('/api/v1/bookings/admin/bulk-cancel/', {}, format='json').status_code, 400)
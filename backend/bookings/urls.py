@@ -1,16 +1,26 @@
 from django.urls import path
 from .views import (
     PublicCreateBookingView,
+    GroupBookingView,
+    InventoryHoldView,
+    InventoryHoldDetailView,
     AdminBookingListView,
+    AdminAvailabilityClientStatsView,
     RequestOTPView,
     VerifyOTPView,
     MyBookingsView,
     BookingCancelView,
+    AdminBulkCancelView,
 )
 
 urlpatterns = [
     path('', PublicCreateBookingView.as_view(), name='bookings-create'),
+    path('group/', GroupBookingView.as_view(), name='bookings-group-create'),
+    path('holds/', InventoryHoldView.as_view(), name='bookings-hold-create'),
+    path('holds/<str:token>/', InventoryHoldDetailView.as_view(), name='bookings-hold-release'),
     path('admin/', AdminBookingListView.as_view(), name='bookings-admin-list'),
+    path('admin/bulk-cancel/', AdminBulkCancelView.as_view(), name='bookings-admin-bulk-cancel'),
+    path('admin/availability-client/', AdminAvailabilityClientStatsView.as_view(), name='bookings-availability-client-stats'),
 
     # OTP endpoints for passwordless access
     path('otp/request/', RequestOTPView.as_view(), name='otp-request'),
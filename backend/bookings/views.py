@@ -2,21 +2,37 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 from django.db import transaction
 import datetime as _dt
 from django.utils.dateparse import parse_date, parse_datetime
 from django.utils import timezone
 import logging
 import secrets
-from django.core.mail import send_mail
 from django.conf import settings
-import requests
 
 logger = logging.getLogger(__name__)
 
 from .models import Booking, OTPRequest, EmailSession
-from .serializers import BookingSerializer, OTPRequestSerializer, OTPVerifySerializer, EmailSessionSerializer
-from hotels.models import Room, RoomInventory
+from .serializers import (
+    BookingSerializer,
+    GroupBookingSerializer,
+    InventoryHoldSerializer,
+    BulkCancelSerializer,
+    OTPRequestSerializer,
+    OTPVerifySerializer,
+    EmailSessionSerializer,
+)
+from .availability import check_room_availability, check_stays, suggest_stays
+from .availability_client import get_client
+from .outbox import queue_email
+from . import idempotency
+from .holds import convert_hold, create_hold, release_hold
+from .cancellation import bulk_cancel, cancel_booking
+from hotels.models import Room
+from hotels.inventory import InventoryUnavailable, lock_room_nights, reserve_stays
+from hotels.pricing import quote_stay
+from core.pagination import paginator_for, wants_cursor
 
 
 # Helper: dates range generator
@@ -82,11 +98,28 @@ class PublicCreateBookingView(APIView):
 
     Booking requires guest name and email (email is mandatory per requirements).
     After booking we send a booking confirmation email using configured SMTP.
+    Clients may send an Idempotency-Key header to make retries safe.
     """
     permission_classes = [AllowAny]
 
     @transaction.atomic
     def post(self, request):
+        # Retries carrying the same Idempotency-Key replay the stored response
+        # without taking locks or checking availability again.
+        record, replay = idempotency.begin(request)
+        if replay is not None:
+            return replay
+
+        response = self._create_booking(request)
+        if response.status_code != 201:
+            # Error paths return instead of raising: undo anything they wrote,
+            # e.g. a converted hold whose booking then failed validation.
+            transaction.set_rollback(True)
+            return response
+        idempotency.complete(record, response)
+        return response
+
+    def _create_booking(self, request):
         try:
             data = request.data.copy()
 
@@ -94,9 +127,13 @@ class PublicCreateBookingView(APIView):
             if not data.get('user_email') or not data.get('user_name'):
                 return Response({"error": "user_email and user_name are required"}, status=400)
 
+            # A hold token means inventory is already reserved for this stay,
+            # so neither the room-night locks nor the availability check are needed.
+            hold_token = data.get('hold_token')
+
             # Validate room
             try:
-                room = Room.objects.select_for_update().get(id=data.get('room'))
+                room = Room.objects.get(id=data.get('room'))
             except Room.DoesNotExist:
                 return Response({"error": "Room not found"}, status=404)
             except Exception as e:
@@ -127,58 +164,44 @@ class PublicCreateBookingView(APIView):
             if check_in >= check_out:
                 return Response({"error": "Check-out must be after check-in"}, status=400)
 
-            # Call Availability Microservice
-            # We hold the Room lock (from select_for_update above) to ensure serialization of requests for this room
-            try:
-                availability_url = settings.AVAILABILITY_SERVICE_URL
-                payload = {
-                    "room_id": room.id,
-                    "check_in": str(check_in),
-                    "check_out": str(check_out)
-                }
-                # Timeout set to 3 seconds to avoid hanging Django
-                response = requests.post(availability_url, json=payload, timeout=3)
-                
-                if response.status_code == 200:
-                    avail_data = response.json()
-                    if not avail_data.get("available"):
-                        return Response({"error": avail_data.get("reason", "Room is not available")}, status=400)
-                else:
-                    # If microservice is down or errors, fail safe
-                    logger.error("Availability service returned status %s: %s", response.status_code, response.text)
-                    return Response({"error": "Unable to verify availability at this time."}, status=503)
-                    
-            except requests.RequestException as e:
-                logger.error("Failed to connect to availability service: %s", e)
-                return Response({"error": "Availability check service unavailable."}, status=503)
-            except ValueError: # Catch JSON decode errors
-                logger.error("Availability service returned invalid JSON")
-                return Response({"error": "Availability check service invalid response."}, status=503)
-
-            # Validate booking data
+            # Validate booking data before touching the hold or inventory
             serializer = BookingSerializer(data=data, context={'request': request})
             if not serializer.is_valid():
                 return Response(serializer.errors, status=400)
 
+            if hold_token:
+                if not convert_hold(hold_token, room.id, check_in, check_out):
+                    return Response({"error": "Hold is invalid, expired or for a different stay"}, status=400)
+            else:
+                # Serialize only bookings that share a night of this room; other
+                # stays of the same room proceed in parallel.
+                lock_room_nights([(room.id, check_in, check_out)])
+
+                # Check availability (in-process engine or remote service, see bookings.availability)
+                availability = check_room_availability(room.id, check_in, check_out)
+                if not availability.available:
+                    return Response({
+                        "error": availability.reason,
+                        "suggestions": suggest_stays(room.id, check_in, check_out),
+                    }, status=400)
+
             # Create booking
             try:
-                booking = serializer.save()
+                booking = serializer.save(inventory_reserved=bool(hold_token))
             except Exception as e:
                 logger.error("Booking creation failed: %s", str(e))
                 return Response({"error": f"Booking creation failed: {str(e)}"}, status=400)
 
-            # Send confirmation email (best-effort, do not fail booking)
-            try:
-                subject = f"Booking confirmation - {booking.hotel.name}"
-                message = (
-                    f"Hi {booking.user_name},\n\n" 
-                    f"Your booking (id: {booking.id}) at {booking.hotel.name} is confirmed.\n"
-                    f"Check-in: {booking.check_in} - Check-out: {booking.check_out}\n\n"
-                    "Thanks for booking with us."
-                )
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [booking.user_email], fail_silently=False)
-            except Exception as exc:
-                logger.exception("Failed to send booking confirmation email: %s", exc)
+            # Queue confirmation email in this transaction; the send_outbox
+            # worker delivers it after commit.
+            subject = f"Booking confirmation - {booking.hotel.name}"
+            message = (
+                f"Hi {booking.user_name},\n\n" 
+                f"Your booking (id: {booking.id}) at {booking.hotel.name} is confirmed.\n"
+                f"Check-in: {booking.check_in} - Check-out: {booking.check_out}\n\n"
+                "Thanks for booking with us."
+            )
+            queue_email(subject, message, [booking.user_email])
 
             return Response(BookingSerializer(booking).data, status=201)
 
@@ -189,6 +212,141 @@ class PublicCreateBookingView(APIView):
             return Response({"error": f"Internal Server Error: {str(e)}"}, status=500)
 
 
+class GroupBookingView(APIView):
+    """Book several rooms (or date ranges) for one guest in a single transaction.
+
+    Room-nights are locked in sorted order so concurrent group bookings
+    cannot deadlock, every line is checked before anything is written (one
+    batch check per distinct pair of dates), and inventory for all lines is
+    reserved with one set-based update. Either all lines are booked or none
+    are.
+
+    Expected payload:
+    {
+        "user_name": "Jane Doe",
+        "user_email": "jane@example.com",
+        "lines": [
+            {"room": 1, "check_in": "2026-03-01", "check_out": "2026-03-04", "num_adults": 2},
+            {"room": 2, "check_in": "2026-03-01", "check_out": "2026-03-04"}
+        ]
+    }
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = GroupBookingSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        guest = serializer.validated_data
+        lines = guest['lines']
+
+        try:
+            with transaction.atomic():
+                # Room-night locks are taken in sorted order, so concurrent
+                # groups cannot deadlock
+                lock_room_nights(
+                    (line['room'].id, line['check_in'], line['check_out']) for line in lines
+                )
+                room_ids = {line['room'].id for line in lines}
+                rooms = {room.id: room for room in Room.objects.select_related('hotel').filter(id__in=room_ids)}
+
+                # Check every line, batched by dates, before writing anything
+                verdicts = check_stays(
+                    (line['room'].id, line['check_in'], line['check_out']) for line in lines
+                )
+                errors = [
+                    {"line": index, "room": line['room'].id, "error": availability.reason}
+                    for index, (line, availability) in enumerate(zip(lines, verdicts))
+                    if not availability.available
+                ]
+                if errors:
+                    return Response({"error": "Some rooms are not available", "lines": errors}, status=400)
+
+                reserve_stays(
+                    (rooms[line['room'].id], line['check_in'], line['check_out']) for line in lines
+                )
+
+                bookings = Booking.objects.bulk_create([
+                    Booking(
+                        hotel=rooms[line['room'].id].hotel,
+                        room=rooms[line['room'].id],
+                        user_name=guest['user_name'],
+                        user_email=guest['user_email'],
+                        user_phone=guest.get('user_phone') or None,
+                        check_in=line['check_in'],
+                        check_out=line['check_out'],
+                        num_adults=line['num_adults'],
+                        num_children=line['num_children'],
+                        total_price=quote_stay(rooms[line['room'].id], line['check_in'], line['check_out'])['total'],
+                        status='confirmed',
+                    )
+                    for line in lines
+                ])
+
+                summary = "\n".join(
+                    f"- {b.room.room_name} at {b.hotel.name}: {b.check_in} to {b.check_out} (id: {b.id})"
+                    for b in bookings
+                )
+                queue_email(
+                    f"Booking confirmation - {len(bookings)} rooms",
+                    f"Hi {guest['user_name']},\n\nYour group booking is confirmed:\n{summary}\n\nThanks for booking with us.",
+                    [guest['user_email']],
+                )
+        except InventoryUnavailable as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response({
+            "bookings": BookingSerializer(bookings, many=True).data,
+            "total_price": sum(b.total_price for b in bookings),
+        }, status=201)
+
+
+class InventoryHoldView(APIView):
+    """Hold one room for a stay while the guest completes checkout.
+
+    Expected payload: {"room": 1, "check_in": "2026-03-01", "check_out": "2026-03-04"}
+    Returns a hold token to send as `hold_token` when creating the booking.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = InventoryHoldSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        room = serializer.validated_data['room']
+        check_in = serializer.validated_data['check_in']
+        check_out = serializer.validated_data['check_out']
+
+        availability = check_room_availability(room.id, check_in, check_out)
+        if not availability.available:
+            return Response({"error": availability.reason}, status=400)
+
+        try:
+            hold = create_hold(room, check_in, check_out)
+        except InventoryUnavailable as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response({
+            "hold_token": hold.token,
+            "room": room.id,
+            "check_in": check_in,
+            "check_out": check_out,
+            "expires_at": hold.expires_at,
+        }, status=201)
+
+
+class InventoryHoldDetailView(APIView):
+    """Release a hold early (e.g. the guest left checkout)."""
+    permission_classes = [AllowAny]
+
+    def delete(self, request, token):
+        if not release_hold(token):
+            return Response({"error": "Hold not found"}, status=404)
+        return Response({"message": "Hold released"})
+
+
 class AdminBookingListView(APIView):
     """Admin-only view to list all bookings."""
     permission_classes = [IsAuthenticated]
@@ -197,10 +355,28 @@ class AdminBookingListView(APIView):
         if not request.user.is_staff:
             return Response({"error": "Forbidden"}, status=403)
         bookings = Booking.objects.all().order_by('-created_at')
+        if wants_cursor(request):
+            # Opt-in keyset pages; without it the full list is returned as before
+            paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
+            page = paginator.paginate_queryset(bookings, request)
+            return paginator.get_paginated_response(BookingSerializer(page, many=True).data)
         serializer = BookingSerializer(bookings, many=True)
         return Response(serializer.data)
 
 
+class AdminAvailabilityClientStatsView(APIView):
+    """Admin-only view of this worker's availability client counters and breaker state."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return Response({"error": "Forbidden"}, status=403)
+        return Response({
+            "mode": settings.AVAILABILITY_MODE,
+            "client": get_client().stats(),
+        })
+
+
 class RequestOTPView(APIView):
     """Request an OTP for an email. Rate-limited and stores hashed OTP."""
     permission_classes = [AllowAny]
@@ -223,17 +399,15 @@ class RequestOTPView(APIView):
 
         expires_at = timezone.now() + _dt.timedelta(minutes=10)
 
-        otp_req = OTPRequest(email=email, expires_at=expires_at)
-        otp_req.set_otp(raw_otp)
-        otp_req.save()
+        # Store OTP and queue the email atomically (delivered by send_outbox)
+        with transaction.atomic():
+            otp_req = OTPRequest(email=email, expires_at=expires_at)
+            otp_req.set_otp(raw_otp)
+            otp_req.save()
 
-        # Send OTP by email (best-effort)
-        try:
             subject = "Your OTP code"
             message = f"Your OTP is: {raw_otp}. It expires in 10 minutes."
-            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [email], fail_silently=False)
-        except Exception:
-            logger.exception("Failed to send OTP email to %s", email)
+            queue_email(subject, message, [email], sensitive=True)
 
         return Response({"message": "OTP sent if the email is valid"})
 
@@ -308,20 +482,39 @@ class BookingCancelView(APIView):
             except Booking.DoesNotExist:
                 return Response({"error": "Booking not found"}, status=404)
 
-        # If booking confirmed, decrement inventory
-        if booking.status == 'confirmed':
-            dates_in_range = get_dates_in_range(booking.check_in, booking.check_out)
-            for date in dates_in_range:
-                try:
-                    inventory = RoomInventory.objects.select_for_update().get(room=booking.room, date=date)
-                    if inventory.booked_rooms > 0:
-                        inventory.booked_rooms -= 1
-                        inventory.save()
-                except RoomInventory.DoesNotExist:
-                    pass
-
-        booking.status = 'cancelled'
-        booking.save()
+        # Releases every night of a confirmed stay in one conditional update
+        cancel_booking(booking)
 
         return Response({"message": "Booking cancelled successfully"})
 
+
+
+class AdminBulkCancelView(APIView):
+    """Admin-only: cancel all confirmed bookings for a hotel/room and date window.
+
+    Expected payload:
+    {
+        "hotel": 1,                 # and/or "room": 3
+        "date_from": "2026-03-01",  # optional: stays overlapping the window
+        "date_to": "2026-03-15",
+        "chunk_size": 500,          # optional
+        "notify": true              # optional: queue cancellation emails
+    }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if not request.user.is_staff:
+            return Response({"error": "Forbidden"}, status=403)
+
+        serializer = BulkCancelSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        summary = bulk_cancel(**serializer.validated_data)
+        if summary['skipped']:
+            summary['warning'] = (
+                f"{len(summary['skipped'])} bookings were locked by other requests and are still "
+                "confirmed; send the request again to cancel them."
+            )
+        return Response(summary)
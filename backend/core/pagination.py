@@ -0,0 +1,220 @@
+"""
+Opt-in keyset (cursor) pagination for the list endpoints.
+
+Page-number pagination runs COUNT(*) and an OFFSET scan on every page, so
+deep pages get slower the further in they are. Keyset pagination instead
+remembers the ordering values of the last row served and seeks past them:
+
+    WHERE k1 >= :v1 AND (k1 > :v1 OR (k1 = :v1 AND id > :id))
+    ORDER BY k1, id LIMIT n + 1
+
+The leading `k1 >= :v1` bound lets an index on (k1, id) start at the right
+row, so a page costs the same at any depth. The count is skipped unless
+`?count=true` is passed.
+
+Clients opt in with `?pagination=cursor` (or by sending a `cursor`) and
+follow the opaque `next` / `previous` links. Views keep their filters and
+ordering and only swap the paginator:
+
+    paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
+
+Ordering keys must be fields of the model itself. NULLs in a nullable key
+sort above every value (ASC NULLS LAST, DESC NULLS FIRST, as core.ordering
+orders them), and a cursor may carry a NULL.
+"""
+import base64
+import datetime
+import decimal
+import json
+from collections import OrderedDict
+
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def wants_cursor(request):
+    return request.GET.get('pagination') == 'cursor' or 'cursor' in request.GET
+
+
+def paginator_for(request, default_class):
+    """The keyset paginator when the client asked for it, else `default_class()`."""
+    default = default_class()
+    if not wants_cursor(request):
+        return default
+    page_size = getattr(default, 'page_size', None) or api_settings.PAGE_SIZE
+    max_page_size = getattr(default, 'max_page_size', None) or max(page_size, 100)
+    return KeysetPagination(page_size=page_size, max_page_size=max_page_size)
+
+
+def _past(name, value, downwards, nullable, inclusive=False):
+    """
+    Q for rows past `value` on one key, walking down (descending) or up,
+    where NULL sorts above every value; `inclusive` also matches `value`.
+    """
+    if value is None:
+        if downwards:
+            return Q() if inclusive else Q(**{f'{name}__isnull': False})
+        return Q(**{f'{name}__isnull': True}) if inclusive else Q(pk__in=[])
+    op = ('lt' if downwards else 'gt') + ('e' if inclusive else '')
+    q = Q(**{f'{name}__{op}': value})
+    if nullable and not downwards:
+        q |= Q(**{f'{name}__isnull': True})
+    return q
+
+
+def _order_term(name, descending, nullable):
+    if nullable:
+        return F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True)
+    return ('-' if descending else '') + name
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime, decimal.Decimal)):
+        return str(value) if isinstance(value, decimal.Decimal) else value.isoformat()
+    return value
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, page_size, max_page_size):
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    # -- ordering ------------------------------------------------------------
+
+    def get_ordering(self, queryset):
+        """
+        The queryset's ordering as [(name, descending, nullable)], ending
+        with the primary key.
+        """
+        query = queryset.query
+        ordering = list(query.order_by) or (list(queryset.model._meta.ordering) if query.default_ordering else [])
+        keys = []
+        for item in ordering:
+            if isinstance(item, OrderBy) and isinstance(item.expression, F):
+                name, descending = item.expression.name, item.descending
+                nulls_low = item.nulls_last if descending else item.nulls_first
+            elif isinstance(item, str) and item != '?':
+                name, descending, nulls_low = item.lstrip('-'), item.startswith('-'), False
+            else:
+                raise ValidationError({'ordering': 'Cursor pagination needs ordering by field names.'})
+            if '__' in name:
+                raise ValidationError({'ordering': f'Cursor pagination cannot order by related field "{name}".'})
+            if name in query.annotations:
+                keys.append((name, descending, False))
+                continue
+            try:
+                field = queryset.model._meta.get_field(name)
+            except Exception:
+                raise ValidationError({'ordering': f'Unknown ordering field "{name}".'})
+            if field.null and nulls_low:
+                raise ValidationError({'ordering': f'Cursor pagination needs NULLs of "{name}" sorted above its values.'})
+            name = 'pk' if field.primary_key else field.attname
+            keys.append((name, descending, field.null))
+        if 'pk' not in [key[0] for key in keys]:
+            keys.append(('pk', keys[-1][1] if keys else False, False))
+        return keys
+
+    @staticmethod
+    def seek(keys, values, backwards):
+        """Q for rows strictly after (or, backwards, before) `values` in `keys` order."""
+        after = Q()
+        for i in reversed(range(len(keys))):
+            name, descending, nullable = keys[i]
+            step = _past(name, values[i], descending != backwards, nullable)
+            if i < len(keys) - 1:
+                same = Q(**{f'{name}__isnull': True}) if values[i] is None else Q(**{name: values[i]})
+                step |= same & after
+            after = step
+        # Redundant bound on the leading key so the index scan starts at the cursor
+        name, descending, nullable = keys[0]
+        return _past(name, values[0], descending != backwards, nullable, inclusive=True) & after
+
+    # -- cursors -------------------------------------------------------------
+
+    def encode_cursor(self, keys, row, backwards):
+        payload = {
+            'k': [key[0] for key in keys],
+            'v': [_encode_value(getattr(row, key[0])) for key in keys],
+            'b': backwards,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, keys):
+        token = request.GET.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            values, backwards = payload['v'], bool(payload['b'])
+            if payload['k'] != [key[0] for key in keys] or len(values) != len(keys):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, backwards
+
+    # -- BasePagination ------------------------------------------------------
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.GET.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        keys = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request, keys)
+
+        self.count = None
+        if request.GET.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+
+        backwards = bool(cursor and cursor[1])
+        order = [_order_term(name, descending != backwards, nullable) for name, descending, nullable in keys]
+        page = queryset.order_by(*order)
+        if cursor:
+            page = page.filter(self.seek(keys, cursor[0], backwards))
+        rows = list(page[:page_size + 1])
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        self.next = self.previous = None
+        if rows:
+            # Going forwards there is a previous page whenever we came from a cursor,
+            # and a next one when the extra row was found; mirrored going backwards.
+            if backwards:
+                has_next, has_previous = True, more
+            else:
+                has_next, has_previous = more, cursor is not None
+            if has_next:
+                self.next = self.encode_cursor(keys, rows[-1], False)
+            if has_previous:
+                self.previous = self.encode_cursor(keys, rows[0], True)
+        elif cursor:
+            # Stepped past either end: offer the way back
+            self.previous = remove_query_param(self.base_url, self.cursor_query_param)
+        return rows
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body['count'] = self.count
+        body['next'] = self.next
+        body['previous'] = self.previous
+        body['results'] = data
+        return Response(body)
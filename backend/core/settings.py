@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
 from dotenv import load_dotenv
 from pillow_heif import register_heif_opener
 
@@ -68,6 +69,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     # third party
     'rest_framework',
@@ -227,14 +229,80 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
+CORS_EXPOSE_HEADERS = ['idempotent-replayed']
+
+# How long a booking Idempotency-Key is remembered
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24)))
+
+# How long a checkout hold keeps inventory reserved
+INVENTORY_HOLD_TTL = timedelta(minutes=int(os.getenv('INVENTORY_HOLD_TTL_MINUTES', 10)))
+
+# Cache. The default LocMemCache is per process and only suits development
+# and single-worker runs: with several gunicorn workers, CACHE_BACKEND and
+# CACHE_LOCATION must point at a shared cache (e.g.
+# django.core.cache.backends.redis.RedisCache, redis://host:6379/1), or a
+# rate change in one worker leaves the others serving stale quotes for up to
+# QUOTE_CACHE_SECONDS.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Lifetime of cached stay quotes (GET /api/v1/hotels/rooms/<id>/quote/)
+QUOTE_CACHE_SECONDS = int(os.getenv('QUOTE_CACHE_SECONDS', 300))
+
+# In-process cache of autocomplete answers per (prefix, limit), per worker
+AUTOCOMPLETE_CACHE_SECONDS = float(os.getenv('AUTOCOMPLETE_CACHE_SECONDS', 60))
+AUTOCOMPLETE_CACHE_SIZE = int(os.getenv('AUTOCOMPLETE_CACHE_SIZE', 2048))
+
 # Microservices Configuration
 AVAILABILITY_SERVICE_URL = os.getenv(
     'AVAILABILITY_SERVICE_URL',
     'http://127.0.0.1:8001/check-availability'  # Default to local FastAPI service
 )
 
+# "local": run the availability engine in-process on Django's connection.
+# "remote": call AVAILABILITY_SERVICE_URL, falling back to the local engine on failure.
+AVAILABILITY_MODE = os.getenv('AVAILABILITY_MODE', 'local')
+
+# Publish row changes on the availability_changes channel from Django's
+# connections (hotels migration 0019). The availability service's cache and
+# calendar rely on them to drop stale data. Only switch this off together with
+# the service's AVAILABILITY_NOTIFY, which then disables its cache and calendar.
+AVAILABILITY_NOTIFY = os.getenv('AVAILABILITY_NOTIFY', 'True') == "True"
+if not AVAILABILITY_NOTIFY:
+    DATABASES['default'].setdefault('OPTIONS', {})['options'] = '-c availability.notify=off'
+
+# Remote-mode HTTP client (see bookings/availability_client.py)
+AVAILABILITY_CLIENT = {
+    'connect_timeout': float(os.getenv('AVAILABILITY_CONNECT_TIMEOUT', 0.5)),
+    'read_timeout': float(os.getenv('AVAILABILITY_READ_TIMEOUT', 2.0)),
+    'retries': int(os.getenv('AVAILABILITY_RETRIES', 1)),
+    'backoff': float(os.getenv('AVAILABILITY_BACKOFF', 0.05)),
+    'failure_threshold': int(os.getenv('AVAILABILITY_BREAKER_THRESHOLD', 5)),
+    'reset_timeout': float(os.getenv('AVAILABILITY_BREAKER_RESET', 30)),
+    'pool_size': int(os.getenv('AVAILABILITY_POOL_SIZE', 10)),
+}
+
+# Alternative stays attached to a booking's "not available" 400 response:
+# up to AVAILABILITY_SUGGESTIONS windows (0 disables) with check-ins in the
+# AVAILABILITY_SUGGESTION_SPAN_DAYS days from the requested check-in.
+AVAILABILITY_SUGGESTIONS = int(os.getenv('AVAILABILITY_SUGGESTIONS', 3))
+AVAILABILITY_SUGGESTION_SPAN_DAYS = int(os.getenv('AVAILABILITY_SUGGESTION_SPAN_DAYS', 30))
+
+# Directory containing the shared `availability_engine` package
+AVAILABILITY_ENGINE_DIR = os.getenv(
+    'AVAILABILITY_ENGINE_DIR',
+    str(BASE_DIR.parent / 'microservices' / 'availability_service')
+)
+if AVAILABILITY_ENGINE_DIR not in sys.path:
+    sys.path.append(AVAILABILITY_ENGINE_DIR)
+
 EMAIL_BACKEND = os.getenv("EMAIL_BACKEND")
 
 EMAIL_HOST = os.getenv("EMAIL_HOST")
@@ -248,6 +316,12 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL")
 
+# Email outbox worker (python manage.py send_outbox)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 8))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_MAX_SECONDS", 3600))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
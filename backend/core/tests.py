@@ -1,4 +1,11 @@
-from django.test import SimpleTestCase
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from core.pagination import KeysetPagination
+from hotels.models import Hotel, RoomInventory, Room
 
 
 class UrlNormalizationTests(SimpleTestCase):
@@ -16,3 +23,91 @@ class UrlNormalizationTests(SimpleTestCase):
         resp = self.client.get('/api/api/v1/hotels/')
         self.assertIn(resp.status_code, (301, 302))
         self.assertTrue(resp['Location'].startswith('/api/v1/'))
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', 'a@example.com', 'pw', is_staff=True))
+        self.hotel = hotel = Hotel.objects.create(name='H', city='C', address='-', rating=4, price_min=100)
+        rooms = [Room.objects.create(hotel=hotel, room_name=f'R{i}', price_per_night=100) for i in range(3)]
+        # Several rows per date so the id tie-breaker matters
+        for day in range(1, 4):
+            for room in rooms[:3 if day < 3 else 1]:
+                RoomInventory.objects.create(room=room, date=f'2026-01-{day:02d}', total_rooms=1)
+
+    def _walk(self, url, params, direction='next'):
+        pages = []
+        resp = self.client.get(url, params)
+        while True:
+            self.assertEqual(resp.status_code, 200)
+            pages.append(resp.data)
+            link = resp.data[direction]
+            if not link:
+                return pages
+            resp = self.client.get(link)
+
+    def test_pages_cover_every_row_once_in_order(self):
+        params = {'pagination': 'cursor', 'page_size': 3, 'ordering': '-date'}
+        pages = self._walk('/admin-api/inventory/', params)
+        rows = [(str(r['date']), r['id']) for page in pages for r in page['results']]
+        expected = [(str(d), i) for d, i in RoomInventory.objects.order_by('-date', '-id').values_list('date', 'id')]
+        self.assertEqual(rows, expected)
+        self.assertEqual([len(p['results']) for p in pages], [3, 3, 1])
+        self.assertNotIn('count', pages[0])
+
+        # And back again from the last page
+        resp = self.client.get(pages[-1]['previous'])
+        self.assertEqual([(str(r['date']), r['id']) for r in resp.data['results']], expected[3:6])
+
+    def test_count_is_opt_in_and_bad_input_is_rejected(self):
+        resp = self.client.get('/admin-api/inventory/', {'pagination': 'cursor', 'count': 'true'})
+        self.assertEqual(resp.data['count'], 7)
+        self.assertEqual(self.client.get('/admin-api/inventory/', {'cursor': 'garbage'}).status_code, 404)
+        resp = self.client.get('/admin-api/rooms/', {'pagination': 'cursor', 'ordering': 'room_name'})
+        self.assertEqual(resp.status_code, 200)
+        # Nullable sort keys page by cursor, with NULLs above every value
+        resp = self.client.get(f'/api/v1/hotels/{self.hotel.id}/rooms/', {'pagination': 'cursor', 'ordering': 'price_per_night'})
+        self.assertEqual(resp.status_code, 200)
+        paginator = KeysetPagination(page_size=5, max_page_size=10)
+        self.assertEqual(
+            paginator.get_ordering(Hotel.objects.order_by(F('price_min').desc(nulls_first=True))),
+            [('price_min', True, True), ('pk', True, False)],
+        )
+        with self.assertRaises(ValidationError):
+            paginator.get_ordering(Hotel.objects.order_by(F('price_min').asc(nulls_first=True)))
+
+    def test_price_ordering_keeps_hotels_without_a_price(self):
+        for i, price in enumerate((300, 200, 200)):
+            hotel = Hotel.objects.create(name=f'P{i}', city='C', address='-', rating=4)
+            Room.objects.create(hotel=hotel, room_name='R', price_per_night=price)
+        for i in range(2):
+            Hotel.objects.create(name=f'No rooms {i}', city='C', address='-', rating=4)
+        for url in ('/api/v1/hotels/', '/admin-api/hotels/'):
+            for ordering in ('price', '-price'):
+                expected = list(Hotel.objects.order_by(
+                    F('price_min').desc(nulls_first=True) if ordering == '-price' else F('price_min').asc(nulls_last=True),
+                    '-id' if ordering == '-price' else 'id',
+                ).values_list('id', flat=True))
+                pages = self._walk(url, {'pagination': 'cursor', 'page_size': 2, 'ordering': ordering})
+                self.assertEqual([r['id'] for page in pages for r in page['results']], expected)
+                # Walking back from the last page returns the same rows
+                back = self._walk(pages[-1]['previous'], {}, direction='previous')
+                self.assertEqual([r['id'] for page in reversed(back) for r in page['results']], expected[:-len(pages[-1]['results'])])
+
+                resp = self.client.get(url, {'ordering': ordering})
+                self.assertEqual(resp.data['count'], len(expected))
+                self.assertEqual([r['id'] for r in resp.data['results']], expected[:len(resp.data['results'])])
+        self.assertIsNone(Hotel.objects.get(id=expected[0]).price_min)
+
+    def test_ordering_keys_are_whitelisted(self):
+        self.assertEqual(self.client.get('/admin-api/hotels/', {'ordering': 'description'}).status_code, 400)
+        self.assertEqual(self.client.get('/admin-api/hotels/', {'ordering': 'nonsense'}).status_code, 400)
+        resp = self.client.get('/admin-api/inventory/', {'ordering': 'room'})
+        rows = [(r['room'], str(r['date'])) for r in resp.data['results']]
+        self.assertEqual(rows, sorted(rows))
+
+    def test_page_number_pagination_is_unchanged_by_default(self):
+        resp = self.client.get('/admin-api/inventory/')
+        self.assertEqual(resp.data['count'], 7)
+        self.assertIsInstance(self.client.get('/api/v1/bookings/admin/').data, list)
@@ -7,6 +7,25 @@ PROJECT_ROOT=/home/ubuntu/hotel-booking-system
 BACKEND_DIR=$PROJECT_ROOT/backend
 VENV_DIR=$BACKEND_DIR/venv
 
+# Install or refresh backend/systemd/<name>.service and enable it
+install_service() {
+    local SERVICE_FILE="/etc/systemd/system/$1.service"
+    local SOURCE_SERVICE_FILE="$BACKEND_DIR/systemd/$1.service"
+
+    if [ ! -f "$SERVICE_FILE" ]; then
+        echo "⚠️ $1 service file not found. Installing..."
+        sudo cp $SOURCE_SERVICE_FILE $SERVICE_FILE
+        sudo systemctl daemon-reload
+        sudo systemctl enable $1
+        echo "✅ $1 service installed and enabled."
+    else
+        # Always update the service file to ensure latest config is applied
+        echo "✅ $1 service file exists. Updating..."
+        sudo cp $SOURCE_SERVICE_FILE $SERVICE_FILE
+        sudo systemctl daemon-reload
+    fi
+}
+
 cd $BACKEND_DIR
 
 echo "🔁 Pulling latest backend code"
@@ -35,23 +54,21 @@ echo "📦 Installing microservice dependencies"
 pip install --no-cache-dir -r requirements.txt
 
 echo "⚙️ Configuring Systemd Service"
-SERVICE_FILE="/etc/systemd/system/fastapi.service"
-SOURCE_SERVICE_FILE="$BACKEND_DIR/systemd/fastapi.service"
-
-if [ ! -f "$SERVICE_FILE" ]; then
-    echo "⚠️ Service file not found. Installing..."
-    sudo cp $SOURCE_SERVICE_FILE $SERVICE_FILE
-    sudo systemctl daemon-reload
-    sudo systemctl enable fastapi
-    echo "✅ Service installed and enabled."
-else
-    # Always update the service file to ensure latest config is applied
-    echo "✅ Service file exists. Updating..."
-    sudo cp $SOURCE_SERVICE_FILE $SERVICE_FILE
-    sudo systemctl daemon-reload
-fi
+install_service fastapi
 
 echo "🔄 Restarting FastAPI Service"
 sudo systemctl restart fastapi
 
+echo "📧 Deploying Email Outbox Worker"
+install_service email-outbox
+
+echo "🔄 Restarting Email Outbox Worker"
+sudo systemctl restart email-outbox
+
+echo "⏳ Deploying Expired Hold Sweeper"
+install_service release-holds
+
+echo "🔄 Restarting Expired Hold Sweeper"
+sudo systemctl restart release-holds
+
 echo "✅ Deployment completed successfully"
@@ -1,13 +1,15 @@
 from django.contrib import admin
-from .models import Hotel, Room, RoomInventory, Package
+from .models import Hotel, Room, RoomInventory, RoomRate, Package
 
 # Register your models here.
 
 @admin.register(Hotel)
 class HotelAdmin(admin.ModelAdmin):
-    list_display = ['name', 'city', 'rating', 'price_min', 'created_at']
+    list_display = ['name', 'city', 'rating', 'price_min', 'room_count', 'created_at']
     list_filter = ['city', 'rating', 'created_at']
     search_fields = ['name', 'city', 'address']
+    # Maintained from the hotel's rooms by triggers (migration 0018)
+    readonly_fields = ['price_min', 'room_count', 'room_types']
 
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
@@ -23,6 +25,13 @@ class RoomInventoryAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
     readonly_fields = ('available_rooms',)
 
+@admin.register(RoomRate)
+class RoomRateAdmin(admin.ModelAdmin):
+    list_display = ['room', 'date', 'price']
+    list_filter = ['date', 'room__hotel']
+    search_fields = ['room__room_name', 'room__hotel__name']
+    date_hierarchy = 'date'
+
 @admin.register(Package)
 class PackageAdmin(admin.ModelAdmin):
     list_display = ['name', 'hotel', 'price', 'discount_percentage', 'final_price', 'duration_nights', 'is_active', 'created_at']
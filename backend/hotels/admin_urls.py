@@ -9,6 +9,9 @@ from .admin_views import (
     AdminRoomInventoryListCreateView,
     AdminRoomInventoryDetailView,
     AdminBulkInventoryCreateView,
+    AdminRoomRateListCreateView,
+    AdminRoomRateDetailView,
+    AdminBulkRateView,
 )
 from .image_views import (
     HotelImageListView,
@@ -43,6 +46,11 @@ urlpatterns = [
     # Bulk Inventory Operations
     path('inventory/bulk/', AdminBulkInventoryCreateView.as_view(), name='admin-bulk-inventory'),
 
+    # Nightly room rates
+    path('rates/', AdminRoomRateListCreateView.as_view(), name='admin-rates'),
+    path('rates/<int:pk>/', AdminRoomRateDetailView.as_view(), name='admin-rate-detail'),
+    path('rates/bulk/', AdminBulkRateView.as_view(), name='admin-bulk-rates'),
+
     # Hotel Images (admin access via admin-api)
     path('hotels/<int:hotel_id>/images/', HotelImageListView.as_view(), name='admin-hotel-images'),
     path('hotels/<int:hotel_id>/images/upload/', HotelImageUploadView.as_view(), name='admin-hotel-image-upload'),
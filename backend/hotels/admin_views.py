@@ -4,7 +4,6 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework import status
 from rest_framework.settings import api_settings
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
 
 # Custom Pagination
 class LargeResultsSetPagination(PageNumberPagination):
@@ -12,20 +11,29 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 1000
 
-from .models import Hotel, Room, RoomInventory, Package
+from .models import Hotel, Room, RoomInventory, RoomRate, Package
+from .search import search as search_text
+from core.ordering import apply_ordering
+from core.pagination import paginator_for
 from .serializers import (
     HotelSerializer, 
     RoomSerializer, 
     RoomInventorySerializer, 
+    RoomRateSerializer,
     PackageSerializer
 )
 from .bulk_inventory_serializer import BulkInventorySerializer
+from .bulk_rate_serializer import BulkRateSerializer
 
 
 # ==================== HOTELS ADMIN CRUD ====================
 
 class AdminHotelListCreateView(APIView):
     permission_classes = [IsAdminUser]
+    ordering_fields = {
+        "created_at": ("created_at",), "rating": ("rating",), "name": ("name",), "price": ("price_min",),
+    }
+    default_ordering = "-created_at"
 
     def get(self, request):
         """List all hotels"""
@@ -34,18 +42,13 @@ class AdminHotelListCreateView(APIView):
         # Search
         search = request.GET.get("search")
         if search:
-            hotels = hotels.filter(
-                Q(name__icontains=search) |
-                Q(city__icontains=search) |
-                Q(address__icontains=search)
-            )
+            hotels = search_text(hotels, search)
         
-        # Ordering
-        ordering = request.GET.get("ordering", "-created_at")
-        hotels = hotels.order_by(ordering)
+        # Ordering (searches default to best match first)
+        hotels = apply_ordering(self, request, hotels, default=["-search_rank", "-created_at", "-id"] if search else None)
         
         # Pagination
-        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
         paginated_hotels = paginator.paginate_queryset(hotels, request)
         serializer = HotelSerializer(paginated_hotels, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -113,6 +116,8 @@ class AdminHotelDetailView(APIView):
 
 class AdminRoomListCreateView(APIView):
     permission_classes = [IsAdminUser]
+    ordering_fields = {"created_at": ("created_at",), "room_name": ("room_name",)}
+    default_ordering = "-created_at"
 
     def get(self, request):
         """List all rooms"""
@@ -133,18 +138,13 @@ class AdminRoomListCreateView(APIView):
         # Search
         search = request.GET.get("search")
         if search:
-            rooms = rooms.filter(
-                Q(room_name__icontains=search) |
-                Q(hotel__name__icontains=search) |
-                Q(description__icontains=search)
-            )
+            rooms = search_text(rooms, search, include_hotel=True)
         
-        # Ordering
-        ordering = request.GET.get("ordering", "-created_at")
-        rooms = rooms.order_by(ordering)
+        # Ordering (searches default to best match first)
+        rooms = apply_ordering(self, request, rooms, default=["-search_rank", "-created_at", "-id"] if search else None)
         
         # Pagination
-        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
         paginated_rooms = paginator.paginate_queryset(rooms, request)
         serializer = RoomSerializer(paginated_rooms, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -212,6 +212,8 @@ class AdminRoomDetailView(APIView):
 
 class AdminPackageListCreateView(APIView):
     permission_classes = [IsAdminUser]
+    ordering_fields = {"created_at": ("created_at",), "name": ("name",), "price": ("price",)}
+    default_ordering = "-created_at"
 
     def get(self, request):
         """List all packages"""
@@ -229,18 +231,13 @@ class AdminPackageListCreateView(APIView):
         # Search
         search = request.GET.get("search")
         if search:
-            packages = packages.filter(
-                Q(name__icontains=search) |
-                Q(hotel__name__icontains=search) |
-                Q(description__icontains=search)
-            )
+            packages = search_text(packages, search, include_hotel=True)
         
-        # Ordering
-        ordering = request.GET.get("ordering", "-created_at")
-        packages = packages.order_by(ordering)
+        # Ordering (searches default to best match first)
+        packages = apply_ordering(self, request, packages, default=["-search_rank", "-created_at", "-id"] if search else None)
         
         # Pagination
-        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
         paginated_packages = paginator.paginate_queryset(packages, request)
         serializer = PackageSerializer(paginated_packages, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -309,6 +306,8 @@ class AdminPackageDetailView(APIView):
 class AdminRoomInventoryListCreateView(APIView):
     permission_classes = [IsAdminUser]
     pagination_class = LargeResultsSetPagination
+    ordering_fields = {"date": ("date",), "room": ("room", "date")}
+    default_ordering = "date"
 
     def get(self, request):
         """List all room inventories"""
@@ -330,11 +329,10 @@ class AdminRoomInventoryListCreateView(APIView):
             inventories = inventories.filter(date__lte=date_to)
         
         # Ordering
-        ordering = request.GET.get("ordering", "date")
-        inventories = inventories.order_by(ordering)
+        inventories = apply_ordering(self, request, inventories)
         
         # Pagination
-        paginator = self.pagination_class()
+        paginator = paginator_for(request, self.pagination_class)
         paginated_inventories = paginator.paginate_queryset(inventories, request)
         serializer = RoomInventorySerializer(paginated_inventories, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -434,3 +432,95 @@ class AdminBulkInventoryCreateView(APIView):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+# ==================== ROOM RATES ADMIN ====================
+
+class AdminRoomRateListCreateView(APIView):
+    permission_classes = [IsAdminUser]
+    pagination_class = LargeResultsSetPagination
+
+    def get(self, request):
+        """List nightly rates"""
+        rates = RoomRate.objects.select_related('room').all()
+
+        # Filters
+        room_id = request.GET.get("room_id")
+        date_from = request.GET.get("date_from")
+        date_to = request.GET.get("date_to")
+
+        if room_id:
+            rates = rates.filter(room_id=room_id)
+        if date_from:
+            rates = rates.filter(date__gte=date_from)
+        if date_to:
+            rates = rates.filter(date__lte=date_to)
+
+        rates = rates.order_by('date', 'id')
+
+        # Pagination
+        paginator = paginator_for(request, self.pagination_class)
+        paginated_rates = paginator.paginate_queryset(rates, request)
+        serializer = RoomRateSerializer(paginated_rates, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def post(self, request):
+        """Create a nightly rate"""
+        serializer = RoomRateSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AdminRoomRateDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def patch(self, request, pk):
+        """Update a nightly rate"""
+        try:
+            rate = RoomRate.objects.get(pk=pk)
+        except RoomRate.DoesNotExist:
+            return Response({"error": "Room rate not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = RoomRateSerializer(rate, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request, pk):
+        """Delete a nightly rate (the night falls back to price_per_night)"""
+        try:
+            rate = RoomRate.objects.get(pk=pk)
+        except RoomRate.DoesNotExist:
+            return Response({"error": "Room rate not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        rate.delete()
+        return Response({"message": "Room rate deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
+
+
+class AdminBulkRateView(APIView):
+    """
+    Set the nightly price of a room for a date range.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        """
+        Expected payload:
+        {
+            "room": 1,
+            "start_date": "2026-12-20",
+            "end_date": "2026-12-31",
+            "price": "180.00"
+        }
+        """
+        serializer = BulkRateSerializer(data=request.data)
+        if serializer.is_valid():
+            result = serializer.set_bulk_rates()
+            return Response({
+                "message": "Room rates set successfully",
+                **result
+            }, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
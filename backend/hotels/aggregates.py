@@ -0,0 +1,23 @@
+"""
+Denormalised room aggregates on Hotel.
+
+price_min (cheapest available room), room_count (available rooms) and
+room_types (distinct types of available rooms) are kept current by
+statement-level triggers on hotels_room (migration 0018), so list queries
+can filter and sort on them through an index instead of aggregating rooms
+per request. `refresh` runs the same set-based recomputation on demand.
+"""
+from django.db import connection
+
+
+def refresh(hotel_ids=None):
+    """
+    Recompute the aggregates for `hotel_ids` (all hotels when None) and
+    return how many hotels changed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT hotels_refresh_room_aggregates(%s::bigint[])',
+            [list(hotel_ids) if hotel_ids is not None else None],
+        )
+        return cursor.fetchone()[0]
@@ -0,0 +1,114 @@
+"""
+City and hotel name autocomplete.
+
+Suggestions match the typed text at the start of any word of a city
+(hotels_city, kept by a trigger, with hotel counts) or of a hotel name.
+Both lookups run on indexed lower-case text (trigram GIN where pg_trgm is
+installed, see hotels migration 0016). Whole-name prefix matches rank
+first, then cities by hotel count.
+
+Answers are cached in process per (normalised text, limit) for
+AUTOCOMPLETE_CACHE_SECONDS, so hot prefixes typed by many users cost a
+dict lookup. Counts may lag writes by up to that long.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Lower
+
+from .models import City, Hotel
+
+
+def normalize(text):
+    """Lower case with runs of whitespace collapsed, as hotels_normalize_city() in SQL."""
+    return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+
+class PrefixCache:
+    """Small thread-safe LRU with a TTL."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = PrefixCache(settings.AUTOCOMPLETE_CACHE_SIZE, settings.AUTOCOMPLETE_CACHE_SECONDS)
+    return _cache
+
+
+def _word_prefix(field, term):
+    """`field` starts with `term`, or has a word that does."""
+    return Q(**{f'{field}__startswith': term}) | Q(**{f'{field}__contains': f' {term}'})
+
+
+def _starts_first(field, term):
+    return Case(When(**{f'{field}__startswith': term}, then=Value(0)), default=Value(1), output_field=IntegerField())
+
+
+def suggest(text, limit=8):
+    """Return {"cities": [...], "hotels": [...]} for the typed `text`, at most `limit` each."""
+    term = normalize(text)
+    if not term:
+        return {'cities': [], 'hotels': []}
+
+    cache = get_cache()
+    key = (term, limit)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    cities = (
+        City.objects.filter(_word_prefix('normalized', term), hotel_count__gt=0)
+        .annotate(starts=_starts_first('normalized', term))
+        .order_by('starts', '-hotel_count', 'name')
+        .values('name', 'hotel_count')[:limit]
+    )
+    hotels = (
+        Hotel.objects.annotate(lower_name=Lower('name'))
+        .filter(_word_prefix('lower_name', term))
+        .annotate(starts=_starts_first('lower_name', term))
+        .order_by('starts', '-rating', 'name')
+        .values('id', 'name', 'city')[:limit]
+    )
+    result = {
+        'cities': [{'name': c['name'], 'hotels': c['hotel_count']} for c in cities],
+        'hotels': list(hotels),
+    }
+    cache.put(key, result)
+    return result
@@ -0,0 +1,59 @@
+"""
+Serializer for bulk room rate operations.
+"""
+from rest_framework import serializers
+from .models import Room, RoomRate
+from .inventory import stay_dates
+from .pricing import invalidate_quotes
+
+
+class BulkRateSerializer(serializers.Serializer):
+    """
+    Serializer for setting the nightly price of a room over a date range.
+    """
+    room = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all())
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+
+    def validate(self, data):
+        """Validate that end_date is not before start_date."""
+        if data['end_date'] < data['start_date']:
+            raise serializers.ValidationError({
+                'end_date': 'End date must be on or after start date.'
+            })
+
+        # Limit to a reasonable range (one year)
+        if (data['end_date'] - data['start_date']).days > 366:
+            raise serializers.ValidationError({
+                'end_date': 'Date range cannot exceed 366 days.'
+            })
+
+        return data
+
+    def set_bulk_rates(self):
+        """
+        Upsert one rate per date in the range (inclusive) with a single
+        INSERT ... ON CONFLICT DO UPDATE, then invalidate cached quotes.
+        """
+        room = self.validated_data['room']
+        start_date = self.validated_data['start_date']
+        end_date = self.validated_data['end_date']
+        price = self.validated_data['price']
+
+        dates = stay_dates(start_date, end_date) + [end_date]
+        RoomRate.objects.bulk_create(
+            [RoomRate(room=room, date=d, price=price) for d in dates],
+            update_conflicts=True,
+            unique_fields=['room', 'date'],
+            update_fields=['price'],
+        )
+        invalidate_quotes(room.id)
+
+        return {
+            'total': len(dates),
+            'room': room.room_name,
+            'price': str(price),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat()
+        }
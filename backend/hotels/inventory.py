@@ -0,0 +1,181 @@
+"""
+Set-based helpers for reserving and releasing room inventory.
+
+Every helper works on a whole stay at once so the number of statements
+does not grow with the number of nights.
+"""
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import F
+
+from .models import RoomInventory
+
+
+EPOCH = date(1970, 1, 1)
+
+
+class InventoryUnavailable(Exception):
+    """Raised when a stay cannot be reserved on every night."""
+
+
+def stay_dates(check_in, check_out):
+    """Return the nights of a stay (check_out excluded)."""
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def lock_room_nights(stays):
+    """
+    Take transaction-scoped advisory locks on every (room, night) of `stays`.
+
+    `stays` is an iterable of (room_id, check_in, check_out). Locks are
+    keyed by (room_id, days since epoch) and acquired in sorted order in a
+    single statement, so bookings for the same room on non-overlapping
+    dates run in parallel and overlapping ones cannot deadlock. Locks are
+    released automatically at commit or rollback.
+    """
+    keys = sorted({
+        (room_id, (night - EPOCH).days)
+        for room_id, check_in, check_out in stays
+        for night in stay_dates(check_in, check_out)
+    })
+    if not keys:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(pg_advisory_xact_lock(r, n)) FROM unnest(%s::int[], %s::int[]) AS k(r, n)",
+            [[room_id for room_id, _ in keys], [n for _, n in keys]],
+        )
+    return len(keys)
+
+
+def _ensure_rows(room, nights):
+    """Create missing inventory rows for `nights` from room.total_rooms (one INSERT)."""
+    RoomInventory.objects.bulk_create(
+        [RoomInventory(room=room, date=night, total_rooms=room.total_rooms) for night in nights],
+        ignore_conflicts=True,
+    )
+
+
+def reserve_stay(room, check_in, check_out, count=1):
+    """
+    Reserve `count` rooms on every night between check_in and check_out.
+
+    Missing inventory rows are created from room.total_rooms in a single
+    INSERT ... ON CONFLICT DO NOTHING, then one conditional UPDATE
+    increments booked_rooms only where enough rooms are still free.
+    If fewer rows than nights were updated, InventoryUnavailable is raised
+    so the caller's transaction rolls back.
+    """
+    nights = stay_dates(check_in, check_out)
+    _ensure_rows(room, nights)
+
+    reserved = RoomInventory.objects.filter(
+        room=room,
+        date__gte=check_in,
+        date__lt=check_out,
+        booked_rooms__lte=F('total_rooms') - count,
+    ).update(booked_rooms=F('booked_rooms') + count)
+
+    if reserved != len(nights):
+        raise InventoryUnavailable("No rooms available for the selected dates")
+    return reserved
+
+
+def reserve_stays(stays):
+    """
+    Reserve several stays at once, e.g. for a group booking.
+
+    `stays` is an iterable of (room, check_in, check_out). Nights requested
+    more than once for the same room are summed, and the whole set is
+    reserved with one UPDATE ... FROM (VALUES ...). Raises
+    InventoryUnavailable if any room-night lacks capacity; the caller must
+    run this inside a transaction.
+    """
+    wanted = {}
+    rooms = {}
+    for room, check_in, check_out in stays:
+        rooms[room.id] = room
+        for night in stay_dates(check_in, check_out):
+            wanted[(room.id, night)] = wanted.get((room.id, night), 0) + 1
+    if not wanted:
+        return 0
+
+    RoomInventory.objects.bulk_create(
+        [
+            RoomInventory(room=rooms[room_id], date=night, total_rooms=rooms[room_id].total_rooms)
+            for room_id, night in sorted(wanted)
+        ],
+        ignore_conflicts=True,
+    )
+
+    reserved = _apply_night_counts(wanted, reserve=True)
+
+    if reserved != len(wanted):
+        raise InventoryUnavailable("Not enough rooms available for every night of the group booking")
+    return reserved
+
+
+def release_stay(room, check_in, check_out, count=1):
+    """
+    Give back `count` rooms on every night of a stay in one UPDATE.
+
+    Nights that are missing or already at zero are skipped. Returns the
+    number of nights released.
+    """
+    return RoomInventory.objects.filter(
+        room=room,
+        date__gte=check_in,
+        date__lt=check_out,
+        booked_rooms__gte=count,
+    ).update(booked_rooms=F('booked_rooms') - count)
+
+
+def release_stays(stays):
+    """
+    Release several stays with one UPDATE ... FROM (VALUES ...).
+
+    `stays` is an iterable of (room_id, check_in, check_out). Returns the
+    number of room-nights updated.
+    """
+    wanted = {}
+    for room_id, check_in, check_out in stays:
+        for night in stay_dates(check_in, check_out):
+            wanted[(room_id, night)] = wanted.get((room_id, night), 0) + 1
+    if not wanted:
+        return 0
+    return _apply_night_counts(wanted, reserve=False)
+
+
+def _apply_night_counts(wanted, reserve):
+    """
+    Add (reserve=True) or subtract `wanted[(room_id, date)]` rooms in a
+    single statement. Reservations only apply where capacity remains;
+    releases never go below zero. Returns the number of rows updated.
+    """
+    values = ', '.join(['(%s, %s::date, %s)'] * len(wanted))
+    params = []
+    for (room_id, night), count in sorted(wanted.items()):
+        params.extend([room_id, night, count])
+
+    if reserve:
+        change = "inv.booked_rooms + v.qty"
+        guard = "inv.booked_rooms + v.qty <= inv.total_rooms"
+    else:
+        change = "GREATEST(inv.booked_rooms - v.qty, 0)"
+        guard = "inv.booked_rooms > 0"
+
+    table = RoomInventory._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} AS inv
+            SET booked_rooms = {change}
+            FROM (VALUES {values}) AS v(room_id, date, qty)
+            WHERE inv.room_id = v.room_id
+              AND inv.date = v.date
+              AND {guard}
+            """,
+            params,
+        )
+        return cursor.rowcount
@@ -0,0 +1,40 @@
+"""
+Rebuild Hotel.price_min, room_count and room_types from the rooms table.
+
+The triggers keep them current; run this after restoring data, editing rows
+with triggers disabled, or to check for drift (the count of hotels changed
+should be 0).
+
+Usage:
+    python manage.py reconcile_hotel_aggregates --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hotels.aggregates import refresh
+from hotels.models import Hotel
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalised hotel room aggregates in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Hotels refreshed per statement')
+        parser.add_argument('--hotel', type=int, action='append', help='Only this hotel id (repeatable)')
+
+    def handle(self, *args, **options):
+        ids = Hotel.objects.order_by('id').values_list('id', flat=True)
+        if options['hotel']:
+            ids = ids.filter(id__in=options['hotel'])
+
+        changed = checked = 0
+        last_id = 0
+        while True:
+            batch = list(ids.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            with transaction.atomic():
+                changed += refresh(batch)
+            checked += len(batch)
+            last_id = batch[-1]
+        self.stdout.write(f"Checked {checked} hotels, {changed} updated")
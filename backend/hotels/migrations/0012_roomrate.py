@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:11
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0011_alter_hotelimage_image_alter_roomimage_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='hotels.room')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('room', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+"""
+Publish committed changes to rooms and room inventory on the
+`availability_changes` channel so the availability service can evict its
+in-process cache precisely. Triggers also catch the set-based UPDATEs in
+hotels.inventory, which bypass model signals.
+"""
+from django.db import migrations
+
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION hotels_room_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('availability_changes', json_build_object(
+        't', 'room',
+        'room', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END,
+        'ts', extract(epoch FROM now())
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_room_notify_insdel
+    AFTER INSERT OR DELETE ON hotels_room
+    FOR EACH ROW EXECUTE FUNCTION hotels_room_notify();
+
+CREATE TRIGGER hotels_room_notify_upd
+    AFTER UPDATE ON hotels_room
+    FOR EACH ROW
+    WHEN (OLD.is_available IS DISTINCT FROM NEW.is_available
+          OR OLD.total_rooms IS DISTINCT FROM NEW.total_rooms)
+    EXECUTE FUNCTION hotels_room_notify();
+
+CREATE OR REPLACE FUNCTION hotels_roominventory_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', OLD.room_id, 'date', OLD.date,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', NEW.room_id, 'date', NEW.date,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_roominventory_notify
+    AFTER INSERT OR UPDATE OR DELETE ON hotels_roominventory
+    FOR EACH ROW EXECUTE FUNCTION hotels_roominventory_notify();
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS hotels_roominventory_notify ON hotels_roominventory;
+DROP FUNCTION IF EXISTS hotels_roominventory_notify();
+DROP TRIGGER IF EXISTS hotels_room_notify_upd ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_notify_insdel ON hotels_room;
+DROP FUNCTION IF EXISTS hotels_room_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0012_roomrate'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
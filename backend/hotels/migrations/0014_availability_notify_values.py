@@ -0,0 +1,87 @@
+"""
+Include the new free-room count in inventory notifications and the room
+flag in room notifications, so subscribers such as the availability
+service's calendar can apply changes without reading them back.
+"""
+from django.db import migrations
+
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION hotels_room_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'room', 'room', OLD.id, 'deleted', true,
+            'ts', extract(epoch FROM now())
+        )::text);
+    ELSE
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'room', 'room', NEW.id, 'hotel', NEW.hotel_id, 'available', NEW.is_available,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION hotels_roominventory_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND (OLD.room_id, OLD.date) IS DISTINCT FROM (NEW.room_id, NEW.date)) THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', OLD.room_id, 'date', OLD.date, 'free', NULL,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', NEW.room_id, 'date', NEW.date,
+            'free', NEW.total_rooms - NEW.booked_rooms,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+REVERSE = """
+CREATE OR REPLACE FUNCTION hotels_room_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('availability_changes', json_build_object(
+        't', 'room',
+        'room', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END,
+        'ts', extract(epoch FROM now())
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION hotels_roominventory_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', OLD.room_id, 'date', OLD.date,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', NEW.room_id, 'date', NEW.date,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0013_availability_notify_triggers'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
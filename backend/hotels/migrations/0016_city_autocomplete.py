@@ -0,0 +1,98 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:10
+"""
+Normalised city table for autocomplete, kept in step with hotels_hotel by a
+trigger (bulk updates bypass model signals), and the indexes behind the
+autocomplete lookups.
+
+Autocomplete matches word prefixes with LIKE on lower-case text. With
+pg_trgm both `x%` and `% x%` patterns are served by trigram GIN indexes;
+servers built without the contrib modules get text_pattern_ops btree
+indexes, which serve the plain prefix pattern.
+"""
+from django.db import migrations, models
+
+
+FORWARD = r"""
+CREATE OR REPLACE FUNCTION hotels_normalize_city(city text) RETURNS text AS $$
+    SELECT lower(btrim(regexp_replace(coalesce(city, ''), '\s+', ' ', 'g')))
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION hotels_city_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE hotels_city SET hotel_count = hotel_count - 1
+        WHERE normalized = hotels_normalize_city(OLD.city) AND hotel_count > 0;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND hotels_normalize_city(NEW.city) <> '' THEN
+        INSERT INTO hotels_city (name, normalized, hotel_count)
+        VALUES (regexp_replace(btrim(NEW.city), '\s+', ' ', 'g'), hotels_normalize_city(NEW.city), 1)
+        ON CONFLICT (normalized) DO UPDATE SET hotel_count = hotels_city.hotel_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_city_count_insdel
+    AFTER INSERT OR DELETE ON hotels_hotel
+    FOR EACH ROW EXECUTE FUNCTION hotels_city_count();
+
+CREATE TRIGGER hotels_city_count_upd
+    AFTER UPDATE OF city ON hotels_hotel
+    FOR EACH ROW
+    WHEN (hotels_normalize_city(OLD.city) IS DISTINCT FROM hotels_normalize_city(NEW.city))
+    EXECUTE FUNCTION hotels_city_count();
+
+INSERT INTO hotels_city (name, normalized, hotel_count)
+SELECT min(regexp_replace(btrim(city), '\s+', ' ', 'g')), hotels_normalize_city(city), count(*)
+FROM hotels_hotel
+WHERE hotels_normalize_city(city) <> ''
+GROUP BY hotels_normalize_city(city);
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS hotels_city_count_upd ON hotels_hotel;
+DROP TRIGGER IF EXISTS hotels_city_count_insdel ON hotels_hotel;
+DROP FUNCTION IF EXISTS hotels_city_count();
+DROP FUNCTION IF EXISTS hotels_normalize_city(text);
+"""
+
+
+def create_autocomplete_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone():
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            method, opclass = 'gin', 'gin_trgm_ops'
+        else:
+            method, opclass = 'btree', 'text_pattern_ops'
+        cursor.execute(f'CREATE INDEX city_autocomplete_idx ON hotels_city USING {method} (normalized {opclass})')
+        cursor.execute(f'CREATE INDEX hotel_name_autocomplete_idx ON hotels_hotel USING {method} (lower(name) {opclass})')
+
+
+def drop_autocomplete_indexes(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS hotel_name_autocomplete_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS city_autocomplete_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0015_search_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120)),
+                ('normalized', models.CharField(max_length=120, unique=True)),
+                ('hotel_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Cities',
+            },
+        ),
+        migrations.RunSQL(FORWARD, REVERSE),
+        migrations.RunPython(create_autocomplete_indexes, drop_autocomplete_indexes),
+    ]
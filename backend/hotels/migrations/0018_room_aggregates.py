@@ -0,0 +1,108 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:14
+"""
+Keep Hotel.price_min, room_count and room_types in step with the hotel's
+rooms. Statement-level triggers read the transition tables, so an INSERT,
+UPDATE or DELETE touching many rooms refreshes each affected hotel once
+with one set-based UPDATE, including bulk writes that bypass signals.
+Existing hotels are backfilled here; `manage.py reconcile_hotel_aggregates`
+rebuilds them later if needed.
+"""
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION hotels_refresh_room_aggregates(hotel_ids bigint[]) RETURNS integer AS $$
+    WITH aggregates AS (
+        SELECT h.id,
+               min(r.price_per_night) FILTER (WHERE r.is_available) AS price_min,
+               count(r.id) FILTER (WHERE r.is_available) AS room_count,
+               coalesce(
+                   array_agg(DISTINCT r.room_type ORDER BY r.room_type)
+                       FILTER (WHERE r.is_available AND r.room_type IS NOT NULL),
+                   '{}'
+               ) AS room_types
+        FROM hotels_hotel h
+        LEFT JOIN hotels_room r ON r.hotel_id = h.id
+        WHERE hotel_ids IS NULL OR h.id = ANY(hotel_ids)
+        GROUP BY h.id
+    ), updated AS (
+        UPDATE hotels_hotel h
+        SET price_min = a.price_min, room_count = a.room_count, room_types = a.room_types
+        FROM aggregates a
+        WHERE h.id = a.id
+          AND (h.price_min, h.room_count, h.room_types)
+              IS DISTINCT FROM (a.price_min, a.room_count, a.room_types::varchar(20)[])
+        RETURNING 1
+    )
+    SELECT count(*)::integer FROM updated
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION hotels_room_aggregates() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM hotels_refresh_room_aggregates(ARRAY(SELECT DISTINCT hotel_id FROM new_rows));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM hotels_refresh_room_aggregates(ARRAY(
+            SELECT hotel_id FROM new_rows UNION SELECT hotel_id FROM old_rows
+        ));
+    ELSE
+        PERFORM hotels_refresh_room_aggregates(ARRAY(SELECT DISTINCT hotel_id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_room_aggregates_ins
+    AFTER INSERT ON hotels_room REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_aggregates();
+
+CREATE TRIGGER hotels_room_aggregates_upd
+    AFTER UPDATE ON hotels_room REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_aggregates();
+
+CREATE TRIGGER hotels_room_aggregates_del
+    AFTER DELETE ON hotels_room REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_aggregates();
+
+SELECT hotels_refresh_room_aggregates(NULL);
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS hotels_room_aggregates_del ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_aggregates_upd ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_aggregates_ins ON hotels_room;
+DROP FUNCTION IF EXISTS hotels_room_aggregates();
+DROP FUNCTION IF EXISTS hotels_refresh_room_aggregates(bigint[]);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0017_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotel',
+            name='room_count',
+            field=models.PositiveIntegerField(db_default=0, default=0),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='room_types',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=20), blank=True, db_default=[], default=list, size=None),
+        ),
+        migrations.AlterField(
+            model_name='hotel',
+            name='price_min',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['price_min', 'id'], name='hotel_price_idx'),
+        ),
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
@@ -0,0 +1,217 @@
+"""
+Send availability notifications once per statement instead of once per row.
+
+Every transaction that calls pg_notify takes a server-wide lock on the
+notification queue at commit, so per-row triggers serialized booking
+commits even when nothing was listening. The triggers are now statement
+level, read the changed rows from transition tables and publish a single
+payload per statement:
+
+    {"ts": 1760000000.1, "events": [{"t": "inventory", "room": 7, ...}, ...]}
+
+Payloads too large for NOTIFY (8000 bytes) are replaced by
+{"events": [{"t": "resync"}]}, which makes subscribers reload.
+
+Connections can switch notifications off with
+`SET availability.notify = off` (Django does so through its connection
+options unless AVAILABILITY_NOTIFY is set, see settings), which skips the
+queue and its commit lock entirely.
+"""
+from django.db import migrations
+
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION availability_notify_enabled() RETURNS boolean AS $$
+    SELECT coalesce(nullif(current_setting('availability.notify', true), ''), 'on') <> 'off'
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION availability_notify(events json) RETURNS void AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF events IS NULL THEN
+        RETURN;
+    END IF;
+    payload := json_build_object('ts', extract(epoch FROM now()), 'events', events)::text;
+    IF octet_length(payload) > 7900 THEN
+        payload := json_build_object(
+            'ts', extract(epoch FROM now()), 'events', json_build_array(json_build_object('t', 'resync'))
+        )::text;
+    END IF;
+    PERFORM pg_notify('availability_changes', payload);
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS hotels_room_notify_insdel ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_notify_upd ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_roominventory_notify ON hotels_roominventory;
+
+CREATE OR REPLACE FUNCTION hotels_room_notify() RETURNS trigger AS $$
+BEGIN
+    IF NOT availability_notify_enabled() THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'room', 'room', id, 'deleted', true))
+            FROM old_rows
+        ));
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'room', 'room', id, 'hotel', hotel_id, 'available', is_available))
+            FROM new_rows
+        ));
+    ELSE
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'room', 'room', n.id, 'hotel', n.hotel_id, 'available', n.is_available))
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE o.is_available IS DISTINCT FROM n.is_available
+               OR o.total_rooms IS DISTINCT FROM n.total_rooms
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_room_notify_ins
+    AFTER INSERT ON hotels_room
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_notify();
+
+CREATE TRIGGER hotels_room_notify_upd
+    AFTER UPDATE ON hotels_room
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_notify();
+
+CREATE TRIGGER hotels_room_notify_del
+    AFTER DELETE ON hotels_room
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_room_notify();
+
+CREATE OR REPLACE FUNCTION hotels_roominventory_notify() RETURNS trigger AS $$
+BEGIN
+    IF NOT availability_notify_enabled() THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object('t', 'inventory', 'room', room_id, 'date', date, 'free', NULL))
+            FROM old_rows
+        ));
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM availability_notify((
+            SELECT json_agg(json_build_object(
+                't', 'inventory', 'room', room_id, 'date', date, 'free', total_rooms - booked_rooms
+            ))
+            FROM new_rows
+        ));
+    ELSE
+        -- A row moved to another room or night clears its old cell
+        PERFORM availability_notify((
+            SELECT json_agg(event) FROM (
+                SELECT json_build_object('t', 'inventory', 'room', o.room_id, 'date', o.date, 'free', NULL) AS event
+                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                WHERE (o.room_id, o.date) IS DISTINCT FROM (n.room_id, n.date)
+                UNION ALL
+                SELECT json_build_object(
+                    't', 'inventory', 'room', n.room_id, 'date', n.date, 'free', n.total_rooms - n.booked_rooms
+                )
+                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                WHERE (o.room_id, o.date, o.total_rooms - o.booked_rooms)
+                      IS DISTINCT FROM (n.room_id, n.date, n.total_rooms - n.booked_rooms)
+            ) events
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_roominventory_notify_ins
+    AFTER INSERT ON hotels_roominventory
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_roominventory_notify();
+
+CREATE TRIGGER hotels_roominventory_notify_upd
+    AFTER UPDATE ON hotels_roominventory
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_roominventory_notify();
+
+CREATE TRIGGER hotels_roominventory_notify_del
+    AFTER DELETE ON hotels_roominventory
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION hotels_roominventory_notify();
+"""
+
+REVERSE = """
+DROP TRIGGER IF EXISTS hotels_roominventory_notify_del ON hotels_roominventory;
+DROP TRIGGER IF EXISTS hotels_roominventory_notify_upd ON hotels_roominventory;
+DROP TRIGGER IF EXISTS hotels_roominventory_notify_ins ON hotels_roominventory;
+DROP TRIGGER IF EXISTS hotels_room_notify_del ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_notify_upd ON hotels_room;
+DROP TRIGGER IF EXISTS hotels_room_notify_ins ON hotels_room;
+
+CREATE OR REPLACE FUNCTION hotels_room_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'room', 'room', OLD.id, 'deleted', true,
+            'ts', extract(epoch FROM now())
+        )::text);
+    ELSE
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'room', 'room', NEW.id, 'hotel', NEW.hotel_id, 'available', NEW.is_available,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION hotels_roominventory_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND (OLD.room_id, OLD.date) IS DISTINCT FROM (NEW.room_id, NEW.date)) THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', OLD.room_id, 'date', OLD.date, 'free', NULL,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('availability_changes', json_build_object(
+            't', 'inventory', 'room', NEW.room_id, 'date', NEW.date,
+            'free', NEW.total_rooms - NEW.booked_rooms,
+            'ts', extract(epoch FROM now())
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hotels_room_notify_insdel
+    AFTER INSERT OR DELETE ON hotels_room
+    FOR EACH ROW EXECUTE FUNCTION hotels_room_notify();
+
+CREATE TRIGGER hotels_room_notify_upd
+    AFTER UPDATE ON hotels_room
+    FOR EACH ROW
+    WHEN (OLD.is_available IS DISTINCT FROM NEW.is_available
+          OR OLD.total_rooms IS DISTINCT FROM NEW.total_rooms)
+    EXECUTE FUNCTION hotels_room_notify();
+
+CREATE TRIGGER hotels_roominventory_notify
+    AFTER INSERT OR UPDATE OR DELETE ON hotels_roominventory
+    FOR EACH ROW EXECUTE FUNCTION hotels_roominventory_notify();
+
+DROP FUNCTION IF EXISTS availability_notify(json);
+DROP FUNCTION IF EXISTS availability_notify_enabled();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0018_room_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
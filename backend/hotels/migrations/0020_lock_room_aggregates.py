@@ -0,0 +1,77 @@
+"""
+Lock the hotels before recomputing their room aggregates.
+
+hotels_refresh_room_aggregates (0018) computed the aggregates from its
+statement snapshot and only then updated, and so locked, the hotel rows.
+Two transactions adding rooms to one hotel each computed from a snapshot
+without the other's room; the second UPDATE waited for the first to
+commit and then wrote its stale aggregates over the correct ones.
+
+The function now locks the hotel rows first, in id order so concurrent
+refreshes cannot deadlock, and computes in a later statement, whose
+snapshot includes whatever the previous lock holder committed. FOR NO KEY
+UPDATE is the lock the UPDATE takes anyway; it does not conflict with the
+KEY SHARE locks that room inserts take on their hotel through the foreign
+key.
+"""
+from django.db import migrations
+
+
+AGGREGATES = """
+    WITH aggregates AS (
+        SELECT h.id,
+               min(r.price_per_night) FILTER (WHERE r.is_available) AS price_min,
+               count(r.id) FILTER (WHERE r.is_available) AS room_count,
+               coalesce(
+                   array_agg(DISTINCT r.room_type ORDER BY r.room_type)
+                       FILTER (WHERE r.is_available AND r.room_type IS NOT NULL),
+                   '{}'
+               ) AS room_types
+        FROM hotels_hotel h
+        LEFT JOIN hotels_room r ON r.hotel_id = h.id
+        WHERE hotel_ids IS NULL OR h.id = ANY(hotel_ids)
+        GROUP BY h.id
+    ), updated AS (
+        UPDATE hotels_hotel h
+        SET price_min = a.price_min, room_count = a.room_count, room_types = a.room_types
+        FROM aggregates a
+        WHERE h.id = a.id
+          AND (h.price_min, h.room_count, h.room_types)
+              IS DISTINCT FROM (a.price_min, a.room_count, a.room_types::varchar(20)[])
+        RETURNING 1
+    )
+"""
+
+FORWARD = """
+CREATE OR REPLACE FUNCTION hotels_refresh_room_aggregates(hotel_ids bigint[]) RETURNS integer AS $$
+DECLARE
+    changed integer;
+BEGIN
+    PERFORM 1 FROM hotels_hotel
+    WHERE hotel_ids IS NULL OR id = ANY(hotel_ids)
+    ORDER BY id
+    FOR NO KEY UPDATE;
+""" + AGGREGATES + """
+    SELECT count(*)::integer INTO changed FROM updated;
+    RETURN changed;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+REVERSE = """
+CREATE OR REPLACE FUNCTION hotels_refresh_room_aggregates(hotel_ids bigint[]) RETURNS integer AS $$
+""" + AGGREGATES + """
+    SELECT count(*)::integer FROM updated
+$$ LANGUAGE sql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0019_statement_level_notify'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, REVERSE),
+    ]
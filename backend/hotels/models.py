@@ -1,18 +1,64 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+
+# Text search configuration of the search_vector columns and of search queries
+SEARCH_CONFIG = 'english'
+
+
+def search_vector(*weighted):
+    """Weighted tsvector over (field, weight) pairs, for a generated column."""
+    vector = None
+    for field, weight in weighted:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return models.GeneratedField(expression=vector, output_field=SearchVectorField(), db_persist=True)
+
 
 class Hotel(models.Model):
     name = models.CharField(max_length=255)
     city = models.CharField(max_length=120)
     address = models.TextField()
     rating = models.DecimalField(max_digits=2, decimal_places=1)  # example: 4.5
-    price_min = models.DecimalField(max_digits=10, decimal_places=2)  # lowest price among rooms
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Aggregates of the hotel's available rooms, maintained by triggers on
+    # hotels_room (migration 0018); see hotels.aggregates
+    price_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    room_count = models.PositiveIntegerField(default=0, db_default=0)
+    room_types = ArrayField(models.CharField(max_length=20), default=list, db_default=[], blank=True)
+    # Maintained by Postgres; see hotels.search
+    search_vector = search_vector(('name', 'A'), ('city', 'B'), ('address', 'C'), ('description', 'D'))
 
     class Meta:
         ordering = ['-created_at']  # newest first
+        indexes = [
+            GinIndex(fields=['search_vector'], name='hotel_search_gin'),
+            # One per sort key allowed by the hotel list views (core.ordering)
+            models.Index(fields=['created_at', 'id'], name='hotel_created_idx'),
+            models.Index(fields=['rating', 'id'], name='hotel_rating_idx'),
+            models.Index(fields=['name', 'id'], name='hotel_name_idx'),
+            models.Index(fields=['price_min', 'id'], name='hotel_price_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+class City(models.Model):
+    """
+    Distinct hotel cities for autocomplete, keyed by the normalised name
+    (lower case, single spaces). Rows and hotel counts are maintained by a
+    trigger on hotels_hotel (migration 0016), not by the application.
+    """
+    name = models.CharField(max_length=120)
+    normalized = models.CharField(max_length=120, unique=True)
+    hotel_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'Cities'
 
     def __str__(self):
         return self.name
@@ -59,6 +105,15 @@ class Room(models.Model):
     is_available = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = search_vector(('room_name', 'A'), ('description', 'C'))
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='room_search_gin'),
+            models.Index(fields=['created_at', 'id'], name='room_created_idx'),
+            models.Index(fields=['room_name', 'id'], name='room_name_idx'),
+            models.Index(fields=['hotel', 'price_per_night', 'id'], name='room_hotel_price_idx'),
+        ]
 
     def __str__(self):
         return f"{self.room_name} ({self.hotel.name})"
@@ -78,6 +133,7 @@ class RoomInventory(models.Model):
         unique_together = ['room', 'date']
         ordering = ['date']
         verbose_name_plural = 'Room Inventories'
+        indexes = [models.Index(fields=['date', 'id'], name='inventory_date_idx')]
 
     def clean(self):
         """Ensure that booked_rooms does not exceed total_rooms."""
@@ -93,6 +149,23 @@ class RoomInventory(models.Model):
         return f"{self.room.room_name} - {self.date} ({self.available_rooms}/{self.total_rooms} available)"
 
 
+class RoomRate(models.Model):
+    """
+    Nightly price override for a room on a specific date.
+    Nights without a rate fall back to Room.price_per_night.
+    """
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='rates')
+    date = models.DateField()
+    price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+
+    class Meta:
+        unique_together = ['room', 'date']
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.room.room_name} - {self.date}: {self.price}"
+
+
 class Package(models.Model):
     """
     Hotel packages/offers that can include rooms, meals, activities, etc.
@@ -118,10 +191,17 @@ class Package(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = search_vector(('name', 'A'), ('description', 'C'))
 
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Packages'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='package_search_gin'),
+            models.Index(fields=['created_at', 'id'], name='package_created_idx'),
+            models.Index(fields=['name', 'id'], name='package_name_idx'),
+            models.Index(fields=['price', 'id'], name='package_price_idx'),
+        ]
 
     @property
     def final_price(self):
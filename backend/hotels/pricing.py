@@ -0,0 +1,82 @@
+"""
+Stay quote engine.
+
+A stay is priced from the RoomRate table, falling back to
+Room.price_per_night for nights without a rate. All rates for the stay are
+loaded with one query and summed in one pass. Public quotes are cached per
+(room, check_in, check_out); each room has a cache version that is
+replaced whenever its rates or base price change (after the write
+commits), which invalidates every cached quote for that room at once.
+Versions are random tokens rather than counters, so a version evicted from
+the cache is never reissued and cannot bring back quotes stored under it.
+
+The cache must be shared by all workers (CACHE_BACKEND, see settings) for
+an invalidation in one process to reach the others.
+"""
+import secrets
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .inventory import stay_dates
+from .models import RoomRate
+
+
+def _version_key(room_id):
+    return f"quote-version:{room_id}"
+
+
+def quote_stay(room, check_in, check_out):
+    """Price a stay. Returns {'nights', 'nightly': [{'date', 'price'}], 'total'}."""
+    rates = dict(
+        RoomRate.objects.filter(room=room, date__gte=check_in, date__lt=check_out)
+        .values_list('date', 'price')
+    )
+    base = room.price_per_night or Decimal('0')
+
+    nightly = []
+    total = Decimal('0')
+    for night in stay_dates(check_in, check_out):
+        price = rates.get(night, base)
+        nightly.append({'date': night, 'price': price})
+        total += price
+
+    return {'nights': len(nightly), 'nightly': nightly, 'total': total}
+
+
+def _room_version(room_id):
+    """The room's current quote version, starting a fresh one if none is stored."""
+    key = _version_key(room_id)
+    version = cache.get(key)
+    if version is None:
+        version = secrets.token_hex(8)
+        if not cache.add(key, version, None):
+            # Another request started one first
+            version = cache.get(key, version)
+    return version
+
+
+def cached_quote(room, check_in, check_out):
+    """quote_stay() memoized per (room, check_in, check_out) and room version."""
+    version = _room_version(room.id)
+    key = f"quote:{room.id}:{version}:{check_in.isoformat()}:{check_out.isoformat()}"
+    quote = cache.get(key)
+    if quote is None:
+        quote = quote_stay(room, check_in, check_out)
+        cache.set(key, quote, settings.QUOTE_CACHE_SECONDS)
+    return quote
+
+
+def invalidate_quotes(*room_ids):
+    """
+    Drop every cached quote of the rooms once the current transaction
+    commits (immediately outside one). Deferring keeps a concurrent reader
+    from caching pre-commit prices under the new version, and a rolled
+    back write from invalidating anything.
+    """
+    keys = [_version_key(room_id) for room_id in set(room_ids) if room_id is not None]
+    if keys:
+        # The next read starts a new random version
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,89 @@
+"""
+Hotel search filters.
+
+`search` matches a free-text term against the `search_vector` columns of
+Hotel, Room and Package. The columns are tsvectors generated by Postgres
+from the model's text fields and GIN indexed, so a lookup costs an index
+probe rather than an `icontains` scan over every row. Every word of the
+term is matched as a prefix ("lux goa" finds "Luxury Suites, Goa") and
+results carry a `search_rank` for relevance ordering.
+
+`filter_available` narrows a hotel queryset to hotels with a room that can
+take the guests on every night of a stay. The check is a correlated EXISTS
+over Room with an aggregated RoomInventory subquery, so it runs inside the
+list query itself and pagination counts only matching hotels.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, Exists, F, FloatField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import SEARCH_CONFIG, Room, RoomInventory
+
+
+def search_query(text):
+    """Prefix-matching SearchQuery for every word of `text`, or None if it has no words."""
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search(queryset, text, include_hotel=False):
+    """
+    Filter `queryset` to rows whose search_vector matches `text` and
+    annotate `search_rank`. With include_hotel (rooms, packages) a match on
+    the parent hotel's name, city or address also counts; each side is
+    looked up through its own index and the two id sets are combined.
+    """
+    query = search_query(text)
+    if query is None:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    rank = SearchRank(F('search_vector'), query)
+    if include_hotel:
+        model = queryset.model
+        ids = (
+            model.objects.filter(search_vector=query).values('id')
+            .union(model.objects.filter(hotel__search_vector=query).values('id'))
+        )
+        queryset = queryset.filter(id__in=ids)
+        rank = rank + SearchRank(F('hotel__search_vector'), query)
+    else:
+        queryset = queryset.filter(search_vector=query)
+    return queryset.annotate(search_rank=rank)
+
+
+def room_capacity():
+    """Guests a room takes: max_guests, or adults + children when unset."""
+    return Coalesce('max_guests', F('max_adults') + F('max_children'))
+
+
+def filter_available(hotels, check_in=None, check_out=None, guests=None):
+    """
+    Keep hotels having at least one available room with capacity for
+    `guests` and, when dates are given, free inventory on every night of
+    [check_in, check_out). Nights without an inventory row count as full,
+    as in the availability engine.
+    """
+    rooms = Room.objects.filter(hotel=OuterRef('pk'), is_available=True)
+
+    if guests is not None:
+        rooms = rooms.annotate(capacity=room_capacity()).filter(capacity__gte=guests)
+
+    if check_in is not None and check_out is not None:
+        free_nights = (
+            RoomInventory.objects
+            .filter(room=OuterRef('pk'), date__gte=check_in, date__lt=check_out,
+                    booked_rooms__lt=F('total_rooms'))
+            .order_by()
+            .values('room')
+            .annotate(nights=Count('*'))
+            .values('nights')
+        )
+        rooms = rooms.annotate(
+            free_nights=Coalesce(Subquery(free_nights, output_field=IntegerField()), 0)
+        ).filter(free_nights=(check_out - check_in).days)
+
+    return hotels.filter(Exists(rooms))
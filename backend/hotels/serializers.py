@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Hotel, Room, RoomInventory, Package
+from .models import Hotel, Room, RoomInventory, RoomRate, Package
 from .image_serializers import HotelImageSerializer, RoomImageSerializer
 
 class HotelSerializer(serializers.ModelSerializer):
@@ -9,8 +9,10 @@ class HotelSerializer(serializers.ModelSerializer):
         model = Hotel
         fields = [
             'id', 'name', 'city', 'address', 'rating', 
-            'price_min', 'description', 'created_at', 'images'
+            'price_min', 'room_count', 'room_types', 'description', 'created_at', 'images'
         ]
+        # Maintained from the hotel's rooms (hotels.aggregates)
+        read_only_fields = ['price_min', 'room_count', 'room_types']
 
 class RoomSerializer(serializers.ModelSerializer):
     hotel_name = serializers.CharField(source='hotel.name', read_only=True)
@@ -61,6 +63,20 @@ class RoomInventorySerializer(serializers.ModelSerializer):
         ]
 
 
+class RoomRateSerializer(serializers.ModelSerializer):
+    room_name = serializers.CharField(source='room.room_name', read_only=True)
+
+    class Meta:
+        model = RoomRate
+        fields = [
+            'id',
+            'room',
+            'room_name',
+            'date',
+            'price',
+        ]
+
+
 class PackageSerializer(serializers.ModelSerializer):
     hotel_name = serializers.CharField(source='hotel.name', read_only=True)
     final_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
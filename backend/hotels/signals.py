@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Room, RoomRate
+from .pricing import invalidate_quotes
+
+
+@receiver(pre_save, sender=RoomRate)
+def remember_rate_room(sender, instance, **kwargs):
+    # A rate moved to another room changes the old room's quotes too
+    instance._previous_room_id = None
+    if instance.pk is not None:
+        instance._previous_room_id = (
+            RoomRate.objects.filter(pk=instance.pk).values_list('room_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=RoomRate)
+@receiver(post_delete, sender=RoomRate)
+def invalidate_quotes_on_rate_change(sender, instance, **kwargs):
+    invalidate_quotes(instance.room_id, getattr(instance, '_previous_room_id', None))
+
+
+@receiver(post_save, sender=Room)
+def invalidate_quotes_on_room_change(sender, instance, created, **kwargs):
+    # Base price (price_per_night) may have changed
+    if not created:
+        invalidate_quotes(instance.id)
@@ -1,5 +1,6 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.core.exceptions import ValidationError
+from decimal import Decimal
 from .models import Hotel, Room, RoomInventory
 
 
@@ -21,3 +22,411 @@ class RoomInventoryModelTests(TestCase):
 		ri = RoomInventory(room=self.room, date='2025-12-17', total_rooms=5, booked_rooms=7)
 		with self.assertRaises(ValidationError):
 			ri.full_clean()
+
+
+class StayQuoteTests(TestCase):
+	def setUp(self):
+		from django.core.cache import cache
+		cache.clear()
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='Test City', address='123 Test St', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=self.hotel, room_name='Standard Room', price_per_night=100, total_rooms=5, available_rooms=5)
+
+	def _quote(self, check_in='2026-08-07', check_out='2026-08-10'):
+		from rest_framework.test import APIClient
+		return APIClient().get(f'/api/v1/hotels/rooms/{self.room.id}/quote/', {'check_in': check_in, 'check_out': check_out})
+
+	def test_quote_uses_rates_and_falls_back_to_base_price(self):
+		from .models import RoomRate
+		RoomRate.objects.create(room=self.room, date='2026-08-08', price=150)
+		resp = self._quote()
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual(resp.data['nights'], 3)
+		self.assertEqual(resp.data['total'], Decimal('350'))
+		self.assertEqual([n['price'] for n in resp.data['nightly']], [Decimal('100'), Decimal('150'), Decimal('100')])
+
+	def test_cached_quote_is_invalidated_when_rates_change(self):
+		from .models import RoomRate
+		self.assertEqual(self._quote().data['total'], Decimal('300'))
+		# Invalidation waits for the write to commit
+		with self.captureOnCommitCallbacks(execute=True) as callbacks:
+			rate = RoomRate.objects.create(room=self.room, date='2026-08-09', price=200)
+			self.assertEqual(self._quote().data['total'], Decimal('300'))
+		self.assertEqual(len(callbacks), 1)
+		self.assertEqual(self._quote().data['total'], Decimal('400'))
+		with self.captureOnCommitCallbacks(execute=True):
+			rate.delete()
+			self.room.price_per_night = 120
+			self.room.save()
+		self.assertEqual(self._quote().data['total'], Decimal('360'))
+
+	def test_moving_a_rate_invalidates_both_rooms(self):
+		from .models import RoomRate
+		other = Room.objects.create(hotel=self.hotel, room_name='Other', price_per_night=100)
+		with self.captureOnCommitCallbacks(execute=True):
+			rate = RoomRate.objects.create(room=self.room, date='2026-08-09', price=200)
+		self.assertEqual(self._quote().data['total'], Decimal('400'))
+		with self.captureOnCommitCallbacks(execute=True):
+			rate.room = other
+			rate.save()
+		self.assertEqual(self._quote().data['total'], Decimal('300'))
+
+	def test_evicted_version_does_not_revive_old_quotes(self):
+		from django.core.cache import cache
+		from .models import RoomRate
+		from .pricing import _version_key
+		self.assertEqual(self._quote().data['total'], Decimal('300'))
+		cache.delete(_version_key(self.room.id))
+		RoomRate.objects.create(room=self.room, date='2026-08-09', price=200)
+		self.assertEqual(self._quote().data['total'], Decimal('400'))
+
+	def test_bulk_rates_upsert_and_invalidate(self):
+		from .bulk_rate_serializer import BulkRateSerializer
+		self.assertEqual(self._quote().data['total'], Decimal('300'))
+		for price in (90, 80):
+			serializer = BulkRateSerializer(data={'room': self.room.id, 'start_date': '2026-08-01', 'end_date': '2026-08-31', 'price': price})
+			self.assertTrue(serializer.is_valid(), serializer.errors)
+			with self.captureOnCommitCallbacks(execute=True):
+				self.assertEqual(serializer.set_bulk_rates()['total'], 31)
+		self.assertEqual(self._quote().data['total'], Decimal('240'))
+
+	def test_booking_total_uses_quote_engine(self):
+		from .models import RoomRate
+		from bookings.serializers import BookingSerializer
+		RoomRate.objects.create(room=self.room, date='2026-08-08', price=150)
+		serializer = BookingSerializer(data={
+			'user_name': 'Jane', 'user_email': 'jane@example.com', 'room': self.room.id,
+			'check_in': '2026-08-07', 'check_out': '2026-08-09',
+		})
+		self.assertTrue(serializer.is_valid(), serializer.errors)
+		self.assertEqual(serializer.save().total_price, Decimal('250'))
+
+
+class HotelAvailabilityTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='Test City', address='123 Test St', rating=4.5, price_min=100)
+		self.free = Room.objects.create(hotel=self.hotel, room_name='Free', price_per_night=100, total_rooms=3, available_rooms=3)
+		self.full = Room.objects.create(hotel=self.hotel, room_name='Full', price_per_night=100, total_rooms=1, available_rooms=1)
+		for day in ('2026-09-01', '2026-09-02'):
+			RoomInventory.objects.create(room=self.free, date=day, total_rooms=3, booked_rooms=1)
+		RoomInventory.objects.create(room=self.full, date='2026-09-01', total_rooms=1)
+		RoomInventory.objects.create(room=self.full, date='2026-09-02', total_rooms=1, booked_rooms=1)
+
+	def _get(self, **params):
+		from rest_framework.test import APIClient
+		return APIClient().get(f'/api/v1/hotels/{self.hotel.id}/availability/', {'check_in': '2026-09-01', 'check_out': '2026-09-03', **params})
+
+	def test_matrix_for_whole_hotel(self):
+		resp = self._get()
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual([str(n) for n in resp.data['nights']], ['2026-09-01', '2026-09-02'])
+		rooms = {r['room_id']: r for r in resp.data['rooms']}
+		self.assertTrue(rooms[self.free.id]['available'])
+		self.assertEqual(rooms[self.free.id]['free'], [2, 2])
+		self.assertFalse(rooms[self.full.id]['available'])
+		self.assertEqual(rooms[self.full.id]['free'], [1, 0])
+		self.assertEqual(rooms[self.full.id]['reason'], 'No rooms available for 2026-09-02. Please check for another date')
+
+	def test_room_ids_are_limited_to_the_hotel(self):
+		other = Hotel.objects.create(name='Other', city='Test City', address='1 Road', rating=4, price_min=100)
+		stranger = Room.objects.create(hotel=other, room_name='Other', price_per_night=100, total_rooms=1, available_rooms=1)
+		resp = self._get(room_ids=f'{self.full.id},{stranger.id}')
+		self.assertEqual([r['room_id'] for r in resp.data['rooms']], [self.full.id])
+		self.assertEqual(self._get(check_out='2026-09-01').status_code, 400)
+
+
+class RoomFlexibleDatesTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Test Hotel', city='Test City', address='123 Test St', rating=4.5, price_min=100)
+		self.room = Room.objects.create(hotel=self.hotel, room_name='Room', price_per_night=100, total_rooms=2, available_rooms=2)
+		# Night 2 sold out, night 5 has no inventory, the rest have 2, 1, 2, 2, 1 ... free
+		free = [2, 1, 0, 2, 2, None, 1, 2, 2, 2]
+		for day, value in enumerate(free):
+			if value is not None:
+				RoomInventory.objects.create(room=self.room, date=f'2026-09-{day + 1:02d}', total_rooms=2, booked_rooms=2 - value)
+
+	def _get(self, **params):
+		from rest_framework.test import APIClient
+		return APIClient().get(f'/api/v1/hotels/rooms/{self.room.id}/flexible-dates/', {'from': '2026-09-01', **params})
+
+	def test_earliest_windows(self):
+		resp = self._get(nights=2, span=10, limit=3)
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual(
+			[(str(w['check_in']), str(w['check_out']), w['min_free']) for w in resp.data['windows']],
+			[('2026-09-01', '2026-09-03', 1), ('2026-09-04', '2026-09-06', 2), ('2026-09-07', '2026-09-09', 1)],
+		)
+		resp = self._get(nights=3, span=10)
+		self.assertEqual([str(w['check_in']) for w in resp.data['windows']], ['2026-09-07', '2026-09-08'])
+
+	def test_unavailable_room_and_bad_params(self):
+		self.room.is_available = False
+		self.room.save()
+		self.assertEqual(self._get(nights=1).data['windows'], [])
+		self.assertEqual(self._get().status_code, 400)
+		self.assertEqual(self._get(nights=1, span=0).status_code, 400)
+		self.assertEqual(self._get(nights=1, **{'from': 'soon'}).status_code, 400)
+
+
+class HotelSearchAvailabilityTests(TestCase):
+	def setUp(self):
+		self.open = Hotel.objects.create(name='Open', city='Test City', address='1 Road', rating=4, price_min=100)
+		self.full = Hotel.objects.create(name='Full', city='Test City', address='2 Road', rating=4, price_min=100)
+		self.small = Hotel.objects.create(name='Small', city='Test City', address='3 Road', rating=4, price_min=100)
+		family = Room.objects.create(hotel=self.open, room_name='Family', price_per_night=100, max_guests=4)
+		sold_out = Room.objects.create(hotel=self.full, room_name='Sold out', price_per_night=100, max_guests=4)
+		single = Room.objects.create(hotel=self.small, room_name='Single', price_per_night=100, max_adults=1, max_children=0)
+		for day in ('2026-09-01', '2026-09-02'):
+			RoomInventory.objects.create(room=family, date=day, total_rooms=2, booked_rooms=1)
+			RoomInventory.objects.create(room=single, date=day, total_rooms=1)
+		RoomInventory.objects.create(room=sold_out, date='2026-09-01', total_rooms=1)
+		RoomInventory.objects.create(room=sold_out, date='2026-09-02', total_rooms=1, booked_rooms=1)
+
+	def _names(self, **params):
+		from rest_framework.test import APIClient
+		resp = APIClient().get('/api/v1/hotels/', {'ordering': 'name', **params})
+		self.assertEqual(resp.status_code, 200)
+		return [h['name'] for h in resp.data['results']]
+
+	def test_dates_and_guests(self):
+		self.assertEqual(self._names(check_in='2026-09-01', check_out='2026-09-03'), ['Open', 'Small'])
+		self.assertEqual(self._names(check_in='2026-09-01', check_out='2026-09-02'), ['Full', 'Open', 'Small'])
+		self.assertEqual(self._names(check_in='2026-09-01', check_out='2026-09-03', guests=2), ['Open'])
+		# A night without inventory is not bookable
+		self.assertEqual(self._names(check_in='2026-09-02', check_out='2026-09-04'), [])
+		self.assertEqual(self._names(guests=3), ['Full', 'Open'])
+
+	def test_invalid_parameters(self):
+		from rest_framework.test import APIClient
+		client = APIClient()
+		self.assertEqual(client.get('/api/v1/hotels/', {'check_in': '2026-09-01'}).status_code, 400)
+		self.assertEqual(client.get('/api/v1/hotels/', {'check_in': '2026-09-02', 'check_out': '2026-09-01'}).status_code, 400)
+		self.assertEqual(client.get('/api/v1/hotels/', {'guests': 'two'}).status_code, 400)
+
+
+class FullTextSearchTests(TestCase):
+	def setUp(self):
+		from django.contrib.auth.models import User
+		self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+		self.beach = Hotel.objects.create(name='Luxury Beach Resort', city='Goa', address='Calangute', rating=4.5, price_min=100)
+		self.city = Hotel.objects.create(name='City Inn', city='Mumbai', address='Near the luxury mall', rating=3.5, price_min=50)
+		Room.objects.create(hotel=self.beach, room_name='Ocean Suite', price_per_night=300, description='Sea view')
+		Room.objects.create(hotel=self.city, room_name='Standard', price_per_night=50, description='Twin beds')
+
+	def _results(self, url, search):
+		from rest_framework.test import APIClient
+		client = APIClient()
+		client.force_authenticate(self.admin)
+		resp = client.get(url, {'search': search})
+		self.assertEqual(resp.status_code, 200)
+		return resp.data['results']
+
+	def test_prefix_matching_and_ranking(self):
+		# Name matches (weight A) rank above address matches (weight C)
+		self.assertEqual([h['name'] for h in self._results('/api/v1/hotels/', 'lux')], ['Luxury Beach Resort', 'City Inn'])
+		self.assertEqual([h['name'] for h in self._results('/api/v1/hotels/', 'lux goa')], ['Luxury Beach Resort'])
+		self.assertEqual(self._results('/api/v1/hotels/', '%%'), [])
+
+	def test_rooms_match_on_their_hotel(self):
+		self.assertEqual([r['room_name'] for r in self._results('/admin-api/rooms/', 'sea')], ['Ocean Suite'])
+		self.assertEqual([r['room_name'] for r in self._results('/admin-api/rooms/', 'mumbai')], ['Standard'])
+		self.assertEqual([h['name'] for h in self._results('/admin-api/hotels/', 'calangute')], ['Luxury Beach Resort'])
+
+
+class AutocompleteTests(TestCase):
+	def setUp(self):
+		from .autocomplete import get_cache
+		get_cache().clear()
+		for name, city in (('Sea Breeze', 'New  Delhi'), ('Delight Inn', 'new delhi'), ('Grand Palace', 'Delhi Cantonment'), ('Old Fort', 'Agra')):
+			Hotel.objects.create(name=name, city=city, address='-', rating=4, price_min=100)
+
+	def _get(self, q, **params):
+		from rest_framework.test import APIClient
+		resp = APIClient().get('/api/v1/hotels/autocomplete/', {'q': q, **params})
+		self.assertEqual(resp.status_code, 200)
+		return resp.data
+
+	def test_cities_are_normalised_and_counted(self):
+		data = self._get('DEL')
+		# Whole-name prefix first, then word prefixes by hotel count
+		self.assertEqual(data['cities'], [{'name': 'Delhi Cantonment', 'hotels': 1}, {'name': 'New Delhi', 'hotels': 2}])
+		self.assertEqual([h['name'] for h in data['hotels']], ['Delight Inn'])
+
+	def test_city_counts_follow_hotel_writes(self):
+		hotel = Hotel.objects.get(name='Old Fort')
+		hotel.city = 'New Delhi'
+		hotel.save()
+		Hotel.objects.filter(name='Grand Palace').delete()
+		from .models import City
+		counts = dict(City.objects.filter(hotel_count__gt=0).values_list('normalized', 'hotel_count'))
+		self.assertEqual(counts, {'new delhi': 3})
+
+	def test_answers_are_cached(self):
+		from .autocomplete import get_cache
+		self._get('agr')
+		Hotel.objects.create(name='Agra Stay', city='Agra', address='-', rating=4, price_min=100)
+		self.assertEqual(self._get('agr')['cities'], [{'name': 'Agra', 'hotels': 1}])
+		self.assertEqual(get_cache().hits, 1)
+		self.assertEqual(self._get('')['cities'], [])
+
+
+class HotelRoomAggregatesTests(TestCase):
+	def setUp(self):
+		self.hotel = Hotel.objects.create(name='Agg', city='Test City', address='1 Road', rating=4, price_min=999)
+		self.cheap = Room.objects.create(hotel=self.hotel, room_name='Cheap', room_type='standard', price_per_night=80)
+		self.suite = Room.objects.create(hotel=self.hotel, room_name='Suite', room_type='suite', price_per_night=300)
+
+	def _hotel(self):
+		return Hotel.objects.get(pk=self.hotel.pk)
+
+	def test_aggregates_follow_room_writes(self):
+		hotel = self._hotel()
+		self.assertEqual((hotel.price_min, hotel.room_count, hotel.room_types), (Decimal('80'), 2, ['standard', 'suite']))
+
+		# Set-based writes bypass signals but not the triggers
+		Room.objects.filter(pk=self.cheap.pk).update(is_available=False)
+		hotel = self._hotel()
+		self.assertEqual((hotel.price_min, hotel.room_count, hotel.room_types), (Decimal('300'), 1, ['suite']))
+
+		Room.objects.filter(hotel=self.hotel).delete()
+		hotel = self._hotel()
+		self.assertEqual((hotel.price_min, hotel.room_count, hotel.room_types), (None, 0, []))
+
+	def test_reconcile_command_repairs_drift(self):
+		from io import StringIO
+		from django.core.management import call_command
+		Hotel.objects.filter(pk=self.hotel.pk).update(price_min=1, room_count=7)
+		out = StringIO()
+		call_command('reconcile_hotel_aggregates', stdout=out)
+		self.assertIn('1 updated', out.getvalue())
+		self.assertEqual(self._hotel().price_min, Decimal('80'))
+
+	def test_price_filter_and_sort(self):
+		from rest_framework.test import APIClient
+		other = Hotel.objects.create(name='Other', city='Test City', address='2 Road', rating=4, price_min=1)
+		Room.objects.create(hotel=other, room_name='Mid', price_per_night=150)
+		Hotel.objects.create(name='Empty', city='Test City', address='3 Road', rating=4)
+		client = APIClient()
+		# Hotels without a price sort above every price
+		resp = client.get('/api/v1/hotels/', {'ordering': '-price'})
+		self.assertEqual([h['name'] for h in resp.data['results']], ['Empty', 'Other', 'Agg'])
+		resp = client.get('/api/v1/hotels/', {'ordering': 'price'})
+		self.assertEqual([h['name'] for h in resp.data['results']], ['Agg', 'Other', 'Empty'])
+		resp = client.get('/api/v1/hotels/', {'price_max': '100'})
+		self.assertEqual([h['name'] for h in resp.data['results']], ['Agg'])
+		self.assertEqual(client.get('/api/v1/hotels/', {'price_min': 'cheap'}).status_code, 400)
+
+
+class ConcurrentRoomAggregatesTests(TransactionTestCase):
+	"""Room writes for one hotel committing concurrently leave correct aggregates."""
+
+	def test_concurrent_room_inserts_both_count(self):
+		import threading
+		import time
+		from django.db import connection, transaction
+		hotel = Hotel.objects.create(name='Race', city='Test City', address='1 Road', rating=4)
+		Room.objects.create(hotel=hotel, room_name='Base', price_per_night=100)
+		inserted = threading.Event()
+		release = threading.Event()
+
+		def add_room(name, price, hold):
+			try:
+				with transaction.atomic():
+					Room.objects.create(hotel=hotel, room_name=name, price_per_night=price)
+					if hold:
+						inserted.set()
+						release.wait(10)
+			finally:
+				connection.close()
+
+		first = threading.Thread(target=add_room, args=('First', 50, True))
+		first.start()
+		self.assertTrue(inserted.wait(10))
+		second = threading.Thread(target=add_room, args=('Second', 60, False))
+		second.start()
+		try:
+			# Let the second refresh queue up behind the first transaction's lock
+			deadline = time.monotonic() + 10
+			with connection.cursor() as cursor:
+				while time.monotonic() < deadline:
+					cursor.execute('SELECT count(*) FROM pg_locks WHERE NOT granted')
+					if cursor.fetchone()[0]:
+						break
+					time.sleep(0.01)
+		finally:
+			release.set()
+			first.join()
+			second.join()
+
+		hotel.refresh_from_db()
+		self.assertEqual((hotel.price_min, hotel.room_count), (Decimal('50'), 3))
+
+
+class AvailabilityNotifyTests(TransactionTestCase):
+	"""Committed Django writes reach the availability service's cache through NOTIFY."""
+
+	def test_inventory_write_evicts_service_cache(self):
+		import datetime as _dt
+		import time
+		from django.db import connection
+		from availability_cache import AvailabilityCache, InvalidationListener
+
+		hotel = Hotel.objects.create(name='Notify', city='Test City', address='1 Road', rating=4)
+		room = Room.objects.create(hotel=hotel, room_name='R', price_per_night=100)
+		night = _dt.date(2026, 9, 1)
+		inventory = RoomInventory.objects.create(room=room, date=night, total_rooms=1)
+
+		db = connection.settings_dict
+		dsn = f"dbname={db['NAME']} user={db['USER']} password={db['PASSWORD']} host={db['HOST']} port={db['PORT']}"
+		cache = AvailabilityCache(ttl=300)
+		listener = InvalidationListener([cache], dsn, 'availability_changes', reconnect_delay=0.1)
+		listener.start()
+		try:
+			deadline = time.monotonic() + 10
+			while not listener.connected and time.monotonic() < deadline:
+				time.sleep(0.05)
+			self.assertTrue(listener.connected)
+			stay = (room.id, night, night + _dt.timedelta(days=1))
+			cache.put(*stay, 'free', cache.get(*stay)[1])
+			self.assertEqual(cache.get(*stay)[0], 'free')
+
+			inventory.booked_rooms = 1
+			inventory.save()
+			while cache.get(*stay)[0] == 'free' and time.monotonic() < deadline:
+				time.sleep(0.05)
+			self.assertIsNot(cache.get(*stay)[0], 'free')
+		finally:
+			listener.stop()
+			listener.join(5)
+
+
+class AvailabilityServiceDateTests(TransactionTestCase):
+	"""The availability service answers inverted or empty stays without a database error."""
+
+	def setUp(self):
+		import importlib
+		import os
+		from django.db import connection
+		from fastapi.testclient import TestClient
+		self.room = Room.objects.create(
+			hotel=Hotel.objects.create(name='Svc', city='Test City', address='1 Road', rating=4),
+			room_name='R', price_per_night=100,
+		)
+		# Point the service at the test database before its modules are imported
+		self.addCleanup(os.environ.__setitem__, 'DB_NAME', os.environ.get('DB_NAME', ''))
+		os.environ['DB_NAME'] = connection.settings_dict['NAME']
+		modules = [importlib.reload(importlib.import_module(name)) for name in ('config', 'database', 'main')]
+		self.addCleanup(modules[1].engine.dispose)
+		self.service = TestClient(modules[2].app)
+
+	def test_single_check_rejects_inverted_and_equal_dates(self):
+		for check_in, check_out in (('2027-01-05', '2027-01-03'), ('2027-01-05', '2027-01-05')):
+			resp = self.service.post('/check-availability', json={'room_id': self.room.id, 'check_in': check_in, 'check_out': check_out})
+			self.assertEqual(resp.status_code, 200, resp.text)
+			self.assertEqual(resp.json(), {'available': False, 'reason': 'Check-out must be after check-in'})
+
+	def test_batch_check_rejects_inverted_and_equal_dates(self):
+		for check_in, check_out in (('2027-01-05', '2027-01-03'), ('2027-01-05', '2027-01-05')):
+			resp = self.service.post('/check-availability/batch', json={'room_ids': [self.room.id], 'check_in': check_in, 'check_out': check_out})
+			self.assertEqual(resp.status_code, 422, resp.text)
+			self.assertIn('Check-out must be after check-in', resp.text)
+
@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import HotelListCreateView, HotelDetailView, RoomListCreateView, RoomDetailView
+from .views import (
+    HotelListCreateView, HotelDetailView, RoomListCreateView, RoomDetailView, RoomQuoteView,
+    HotelAvailabilityView, RoomFlexibleDatesView, HotelAutocompleteView,
+)
 from .image_views import (
     HotelImageListView,
     HotelImageUploadView,
@@ -12,13 +15,17 @@ from .image_views import (
 urlpatterns = [
     # Public/User endpoints
     path('', HotelListCreateView.as_view(), name='hotels'),
+    path('autocomplete/', HotelAutocompleteView.as_view(), name='hotel-autocomplete'),
     path('<int:pk>/', HotelDetailView.as_view(), name='hotel-detail'),
     path('<int:pk>', HotelDetailView.as_view(), name='hotel-detail-no-slash'),
+    path('<int:pk>/availability/', HotelAvailabilityView.as_view(), name='hotel-availability'),
     # Rooms
     path('<int:hotel_id>/rooms/', RoomListCreateView.as_view(), name='hotel-rooms'),
     path('<int:hotel_id>/rooms', RoomListCreateView.as_view(), name='hotel-rooms-no-slash'),
     path('rooms/<int:pk>/', RoomDetailView.as_view(), name='room-detail'),
     path('rooms/<int:pk>', RoomDetailView.as_view(), name='room-detail-no-slash'),
+    path('rooms/<int:pk>/quote/', RoomQuoteView.as_view(), name='room-quote'),
+    path('rooms/<int:pk>/flexible-dates/', RoomFlexibleDatesView.as_view(), name='room-flexible-dates'),
     
     # Hotel Images (public list, admin upload/delete)
     path('<int:hotel_id>/images/', HotelImageListView.as_view(), name='hotel-images'),
@@ -3,13 +3,28 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework import status
 from rest_framework.settings import api_settings
-from django.db.models import Q
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection
+from django.utils.dateparse import parse_date
 
 from .models import Hotel, Room
 from .serializers import HotelSerializer, RoomSerializer
+from .autocomplete import suggest
+from .pricing import cached_quote
+from .search import filter_available, search as search_text
+from availability_engine import check_rooms, find_windows
+from core.ordering import apply_ordering
+from core.pagination import paginator_for
 
 
 class HotelListCreateView(APIView):
+    ordering_fields = {
+        "created_at": ("created_at",), "rating": ("rating",), "name": ("name",), "price": ("price_min",),
+    }
+    default_ordering = "-created_at"
+
     def get_permissions(self):
         if self.request.method == 'GET':
             return [AllowAny()]
@@ -32,22 +47,60 @@ class HotelListCreateView(APIView):
         if rating_max:
             hotels = hotels.filter(rating__lte=rating_max)
 
+        # Cheapest available room, kept on the hotel (hotels.aggregates)
+        price_min = request.GET.get("price_min")
+        price_max = request.GET.get("price_max")
+        try:
+            price_min = Decimal(price_min) if price_min else None
+            price_max = Decimal(price_max) if price_max else None
+        except InvalidOperation:
+            return Response({"error": "price_min and price_max must be numbers"}, status=400)
+
+        if price_min is not None:
+            hotels = hotels.filter(price_min__gte=price_min)
+
+        if price_max is not None:
+            hotels = hotels.filter(price_min__lte=price_max)
+
+        # ---------- AVAILABILITY ----------
+        # Examples: ?check_in=2026-03-01&check_out=2026-03-04&guests=2
+        check_in = request.GET.get("check_in")
+        check_out = request.GET.get("check_out")
+        guests = request.GET.get("guests")
+
+        if check_in or check_out:
+            check_in = parse_date(check_in or "")
+            check_out = parse_date(check_out or "")
+            if not check_in or not check_out:
+                return Response({"error": "check_in and check_out dates are both required (YYYY-MM-DD)"}, status=400)
+            if check_in >= check_out:
+                return Response({"error": "Check-out must be after check-in"}, status=400)
+
+        if guests:
+            try:
+                guests = int(guests)
+            except ValueError:
+                return Response({"error": "guests must be an integer"}, status=400)
+            if guests < 1:
+                return Response({"error": "guests must be at least 1"}, status=400)
+        else:
+            guests = None
+
+        if check_in or guests:
+            hotels = filter_available(hotels, check_in, check_out, guests)
+
         # ---------- SEARCH ----------
         search = request.GET.get("search")
         if search:
-            hotels = hotels.filter(
-                Q(name__icontains=search) |
-                Q(city__icontains=search)
-            )
+            hotels = search_text(hotels, search)
 
         # ---------- ORDERING ----------
         # Examples: ?ordering=rating or ?ordering=-created_at
-        ordering = request.GET.get("ordering")
-        if ordering:
-            hotels = hotels.order_by(ordering)
+        # Searches default to best match first.
+        hotels = apply_ordering(self, request, hotels, default=["-search_rank", "-created_at", "-id"] if search else None)
 
         # ---------- PAGINATION ----------
-        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
         paginated_hotels = paginator.paginate_queryset(hotels, request)
         serializer = HotelSerializer(paginated_hotels, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -99,6 +152,9 @@ class HotelDetailView(APIView):
 
 
 class RoomListCreateView(APIView):
+    ordering_fields = {"price_per_night": ("price_per_night",), "id": ()}
+    default_ordering = "id"
+
     def get_permissions(self):
         if self.request.method == 'GET':
             return [AllowAny()]
@@ -125,8 +181,12 @@ class RoomListCreateView(APIView):
         if max_guests:
             rooms = rooms.filter(max_guests__gte=max_guests)
 
+        # -------- Ordering --------
+        # ?ordering=price_per_night or ?ordering=-price_per_night
+        rooms = apply_ordering(self, request, rooms)
+
         # -------- Pagination --------
-        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        paginator = paginator_for(request, api_settings.DEFAULT_PAGINATION_CLASS)
         paginated_rooms = paginator.paginate_queryset(rooms, request)
         serializer = RoomSerializer(paginated_rooms, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -180,3 +240,161 @@ class RoomDetailView(APIView):
             return Response({"error": "Room not found"}, status=404)
         room.delete()
         return Response({"message": "Room deleted"})
+
+
+class RoomQuoteView(APIView):
+    """Price a stay before booking: ?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD"""
+    permission_classes = [AllowAny]
+    MAX_NIGHTS = 90
+
+    def get(self, request, pk):
+        try:
+            room = Room.objects.get(pk=pk)
+        except Room.DoesNotExist:
+            return Response({"error": "Room not found"}, status=404)
+
+        check_in = parse_date(request.GET.get("check_in") or "")
+        check_out = parse_date(request.GET.get("check_out") or "")
+        if not check_in or not check_out:
+            return Response({"error": "check_in and check_out dates are required (YYYY-MM-DD)"}, status=400)
+        if check_in >= check_out:
+            return Response({"error": "Check-out must be after check-in"}, status=400)
+        if (check_out - check_in).days > self.MAX_NIGHTS:
+            return Response({"error": f"Stay cannot exceed {self.MAX_NIGHTS} nights"}, status=400)
+
+        quote = cached_quote(room, check_in, check_out)
+        return Response({
+            "room": room.id,
+            "check_in": check_in,
+            "check_out": check_out,
+            **quote,
+        })
+
+
+class HotelAvailabilityView(APIView):
+    """
+    Availability matrix for all rooms of a hotel:
+    ?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD[&room_ids=1,2,3]
+
+    Every room and night is computed in one grouped query.
+    """
+    permission_classes = [AllowAny]
+    MAX_NIGHTS = 90
+
+    def get(self, request, pk):
+        if not Hotel.objects.filter(pk=pk).exists():
+            return Response({"error": "Hotel not found"}, status=404)
+
+        check_in = parse_date(request.GET.get("check_in") or "")
+        check_out = parse_date(request.GET.get("check_out") or "")
+        if not check_in or not check_out:
+            return Response({"error": "check_in and check_out dates are required (YYYY-MM-DD)"}, status=400)
+        if check_in >= check_out:
+            return Response({"error": "Check-out must be after check-in"}, status=400)
+        if (check_out - check_in).days > self.MAX_NIGHTS:
+            return Response({"error": f"Stay cannot exceed {self.MAX_NIGHTS} nights"}, status=400)
+
+        room_ids = request.GET.get("room_ids")
+        if room_ids is not None:
+            try:
+                room_ids = [int(x) for x in room_ids.split(",") if x.strip()]
+            except ValueError:
+                return Response({"error": "room_ids must be a comma-separated list of integers"}, status=400)
+            # Only rooms of this hotel
+            room_ids = list(Room.objects.filter(hotel_id=pk, id__in=room_ids).values_list("id", flat=True))
+
+        with connection.cursor() as cursor:
+            if room_ids is not None:
+                rooms = check_rooms(cursor, check_in, check_out, room_ids=room_ids)
+            else:
+                rooms = check_rooms(cursor, check_in, check_out, hotel_id=pk)
+
+        nights = (check_out - check_in).days
+        return Response({
+            "hotel": pk,
+            "check_in": check_in,
+            "check_out": check_out,
+            "nights": [check_in + timedelta(days=i) for i in range(nights)],
+            "rooms": [
+                {
+                    "room_id": room.room_id,
+                    "available": room.available,
+                    "reason": room.reason,
+                    "min_free": room.min_free,
+                    "free": list(room.free),
+                }
+                for room in rooms
+            ],
+        })
+
+
+class RoomFlexibleDatesView(APIView):
+    """
+    Earliest stays that fit a room:
+    ?nights=N[&from=YYYY-MM-DD][&span=DAYS][&limit=K]
+
+    Returns up to `limit` windows of `nights` nights whose check-in falls
+    within `span` days from `from` (default today), from one inventory scan.
+    """
+    permission_classes = [AllowAny]
+    MAX_NIGHTS = 90
+    MAX_SPAN = 365
+    MAX_LIMIT = 20
+
+    def get(self, request, pk):
+        if not Room.objects.filter(pk=pk).exists():
+            return Response({"error": "Room not found"}, status=404)
+
+        try:
+            nights = int(request.GET.get("nights", ""))
+            span = int(request.GET.get("span", 30))
+            limit = int(request.GET.get("limit", 5))
+        except ValueError:
+            return Response({"error": "nights, span and limit must be integers"}, status=400)
+        if not 1 <= nights <= self.MAX_NIGHTS:
+            return Response({"error": f"nights must be between 1 and {self.MAX_NIGHTS}"}, status=400)
+        if not 1 <= span <= self.MAX_SPAN:
+            return Response({"error": f"span must be between 1 and {self.MAX_SPAN}"}, status=400)
+        if not 1 <= limit <= self.MAX_LIMIT:
+            return Response({"error": f"limit must be between 1 and {self.MAX_LIMIT}"}, status=400)
+
+        first = date.today()
+        if request.GET.get("from"):
+            first = parse_date(request.GET["from"])
+            if not first:
+                return Response({"error": "from must be a date (YYYY-MM-DD)"}, status=400)
+
+        with connection.cursor() as cursor:
+            windows = find_windows(cursor, pk, nights, first, span, limit=limit)
+
+        return Response({
+            "room": pk,
+            "nights": nights,
+            "from": first,
+            "span": span,
+            "windows": [
+                {"check_in": w.check_in, "check_out": w.check_out, "min_free": w.min_free}
+                for w in windows
+            ],
+        })
+
+
+class HotelAutocompleteView(APIView):
+    """
+    Type-ahead for the search box: ?q=TEXT[&limit=N]
+
+    Returns matching cities (with hotel counts) and hotel names, best first.
+    """
+    permission_classes = [AllowAny]
+    MAX_LIMIT = 20
+
+    def get(self, request):
+        try:
+            limit = int(request.GET.get("limit", 8))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=400)
+        if not 1 <= limit <= self.MAX_LIMIT:
+            return Response({"error": f"limit must be between 1 and {self.MAX_LIMIT}"}, status=400)
+
+        query = request.GET.get("q", "")
+        return Response({"query": query, **suggest(query, limit)})
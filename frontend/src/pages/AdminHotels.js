@@ -32,7 +32,7 @@ import ImageManager from "../components/ImageManager";
 
 const AdminHotels = () => {
   const [hotels, setHotels] = useState([]);
-  const [form, setForm] = useState({ name: "", city: "", address: "", rating: "", price_min: "" });
+  const [form, setForm] = useState({ name: "", city: "", address: "", rating: "" });
   const [editingId, setEditingId] = useState(null);
   const [showForm, setShowForm] = useState(false);
   const [error, setError] = useState("");
@@ -55,7 +55,7 @@ const AdminHotels = () => {
 
   const handleEdit = (hotel) => {
     setEditingId(hotel.id);
-    setForm({ name: hotel.name, city: hotel.city, address: hotel.address || "", rating: hotel.rating || "", price_min: hotel.price_min || "" });
+    setForm({ name: hotel.name, city: hotel.city, address: hotel.address || "", rating: hotel.rating || "" });
     setShowForm(true);
     setExpandedHotel(null);
     setError("");
@@ -64,7 +64,7 @@ const AdminHotels = () => {
 
   const handleCancel = () => {
     setEditingId(null);
-    setForm({ name: "", city: "", address: "", rating: "", price_min: "" });
+    setForm({ name: "", city: "", address: "", rating: "" });
     setShowForm(false);
   };
 
@@ -76,7 +76,6 @@ const AdminHotels = () => {
       const payload = {
         ...form,
         rating: parseFloat(form.rating) || 0,
-        price_min: parseFloat(form.price_min) || 0,
       };
       if (editingId) {
         await api.put(`/admin-api/hotels/${editingId}/`, payload);
@@ -85,7 +84,7 @@ const AdminHotels = () => {
         await api.post("/admin-api/hotels/", payload);
         setSuccess("Hotel created successfully!");
       }
-      setForm({ name: "", city: "", address: "", rating: "", price_min: "" });
+      setForm({ name: "", city: "", address: "", rating: "" });
       setEditingId(null);
       setShowForm(false);
       fetchHotels();
@@ -207,25 +206,6 @@ const AdminHotels = () => {
                     helperText="Rating from 0 to 5"
                   />
                 </Grid>
-                <Grid item xs={12} sm={6}>
-                  <TextField
-                    label="Minimum Price (₹)"
-                    name="price_min"
-                    value={form.price_min}
-                    onChange={handleChange}
-                    type="number"
-                    fullWidth
-                    inputProps={{ min: 0 }}
-                    InputProps={{
-                      startAdornment: (
-                        <InputAdornment position="start">
-                          <CurrencyRupeeIcon color="action" />
-                        </InputAdornment>
-                      ),
-                    }}
-                    helperText="Minimum price per night"
-                  />
-                </Grid>
               </Grid>
               <Box sx={{ display: "flex", gap: 2, mt: 3 }}>
                 <Button type="submit" variant="contained" size="large" sx={{ px: 4 }}>
@@ -286,7 +266,7 @@ const AdminHotels = () => {
                           />
                           <Chip
                             icon={<CurrencyRupeeIcon />}
-                            label={`${hotel.price_min || 0}`}
+                            label={hotel.price_min != null ? `${hotel.price_min}` : "No rooms"}
                             size="small"
                             color="secondary"
                             variant="outlined"
@@ -0,0 +1,281 @@
+"""
+In-process cache of availability lookups, invalidated by Postgres NOTIFY.
+
+Entries are keyed by (room_id, check_in, check_out) and hold the raw
+range row (room flags, overlapping bookings and per-night counts). Triggers
+on hotels_room, hotels_roominventory and bookings_booking publish committed
+changes on NOTIFY_CHANNEL, one payload per statement
+({"ts": ..., "events": [...]}); the listener thread turns each event into
+a precise eviction:
+
+    {"t": "room", "room": 7}                                     all ranges of room 7
+    {"t": "inventory", "room": 7, "date": "2026-05-01"}          ranges containing that night
+    {"t": "booking", "room": 7, "from": "...", "to": "..."}      ranges overlapping the stay
+    {"t": "resync"}                                              everything (payload was too large)
+
+The cache only serves while the listener is connected. Events missed during
+a reconnect are covered by clearing the cache when the connection comes back,
+and a TTL bounds staleness should a notification ever be lost.
+"""
+import json
+import logging
+import select
+import threading
+import time
+from datetime import date
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+
+class AvailabilityCache:
+    def __init__(self, ttl=30.0, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = False
+        self._entries = {}  # key -> (row, stored_at); insertion order doubles as FIFO
+        self._by_room = {}  # room_id -> set of keys
+        # Bumped on eviction so a row read before an invalidation is not stored after it
+        self._epoch = 0
+        self._room_versions = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "stale_stores_skipped": 0,
+            "evictions": 0,
+            "expired": 0,
+            "events": 0,
+            "hit_age_ms_total": 0.0,
+            "hit_age_ms_max": 0.0,
+            "notify_lag_ms_total": 0.0,
+            "notify_lag_ms_max": 0.0,
+        }
+
+    # -- reads -------------------------------------------------------------
+
+    def get(self, room_id, check_in, check_out):
+        """Return (row, token). row is MISS when the caller must query the database and
+        then hand the same token to put()."""
+        key = (room_id, check_in, check_out)
+        now = time.monotonic()
+        with self._lock:
+            token = self._token(room_id)
+            if not self.enabled:
+                return MISS, token
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                self._drop(key)
+                self._counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return MISS, token
+            age_ms = (now - entry[1]) * 1000
+            self._counters["hits"] += 1
+            self._counters["hit_age_ms_total"] += age_ms
+            self._counters["hit_age_ms_max"] = max(self._counters["hit_age_ms_max"], age_ms)
+            return entry[0], token
+
+    def _token(self, room_id):
+        return self._epoch, self._room_versions.get(room_id, 0)
+
+    def put(self, room_id, check_in, check_out, row, token):
+        """Store a row read under `token`; skipped if the room was invalidated since."""
+        key = (room_id, check_in, check_out)
+        with self._lock:
+            if not self.enabled:
+                return
+            if token != self._token(room_id):
+                self._counters["stale_stores_skipped"] += 1
+                return
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._drop(next(iter(self._entries)))
+            self._entries[key] = (row, time.monotonic())
+            self._by_room.setdefault(room_id, set()).add(key)
+            self._counters["stores"] += 1
+
+    # -- invalidation ------------------------------------------------------
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        keys = self._by_room.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_room[key[0]]
+
+    def _evict(self, room_id, predicate):
+        with self._lock:
+            self._room_versions[room_id] = self._room_versions.get(room_id, 0) + 1
+            doomed = [key for key in self._by_room.get(room_id, ()) if predicate(key)]
+            for key in doomed:
+                self._drop(key)
+            self._counters["evictions"] += len(doomed)
+        return len(doomed)
+
+    def evict_room(self, room_id):
+        return self._evict(room_id, lambda key: True)
+
+    def evict_night(self, room_id, night):
+        return self._evict(room_id, lambda key: key[1] <= night < key[2])
+
+    def evict_stay(self, room_id, check_in, check_out):
+        return self._evict(room_id, lambda key: key[1] < check_out and key[2] > check_in)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._by_room.clear()
+            self._room_versions.clear()
+
+    def set_enabled(self, enabled):
+        """Turn serving on or off; the cache is emptied either way."""
+        with self._lock:
+            self.enabled = enabled
+        self.clear()
+
+    # Listener subscriber interface
+    def resync(self):
+        self.set_enabled(True)
+
+    def suspend(self):
+        self.set_enabled(False)
+
+    def handle_event(self, event):
+        """Apply one event of a NOTIFY payload (see parse_payload)."""
+        room_id = event["room"]
+        kind = event["t"]
+        if kind == "inventory":
+            self.evict_night(room_id, date.fromisoformat(event["date"]))
+        elif kind == "booking":
+            self.evict_stay(room_id, date.fromisoformat(event["from"]), date.fromisoformat(event["to"]))
+        else:
+            self.evict_room(room_id)
+
+        lag_ms = max((time.time() - float(event.get("ts") or time.time())) * 1000, 0.0)
+        with self._lock:
+            self._counters["events"] += 1
+            self._counters["notify_lag_ms_total"] += lag_ms
+            self._counters["notify_lag_ms_max"] = max(self._counters["notify_lag_ms_max"], lag_ms)
+
+    # -- reporting ---------------------------------------------------------
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+            counters["enabled"] = self.enabled
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = counters["hits"] / lookups if lookups else 0.0
+        counters["hit_age_ms_avg"] = counters["hit_age_ms_total"] / counters["hits"] if counters["hits"] else 0.0
+        counters["notify_lag_ms_avg"] = (
+            counters["notify_lag_ms_total"] / counters["events"] if counters["events"] else 0.0
+        )
+        counters["ttl_seconds"] = self.ttl
+        return counters
+
+
+def parse_payload(payload):
+    """
+    The events of one NOTIFY payload, each carrying the payload's "ts".
+    Accepts the per-statement form {"ts": ..., "events": [...]} and the
+    single-event form sent by older triggers.
+    """
+    message = json.loads(payload)
+    events = message["events"] if "events" in message else [message]
+    for event in events:
+        event.setdefault("ts", message.get("ts"))
+    return events
+
+
+class InvalidationListener(threading.Thread):
+    """
+    LISTENs on `channel` and feeds every notification to its subscribers.
+
+    A subscriber implements handle_event(event), resync() and suspend().
+    resync() is called once LISTEN is active (anything committed earlier
+    may have been missed), for "resync" events and after a payload it
+    could not apply; suspend() is called when the connection is lost.
+    """
+
+    def __init__(self, subscribers, dsn, channel, reconnect_delay=1.0):
+        super().__init__(name="availability-cache-listener", daemon=True)
+        self.subscribers = list(subscribers)
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self.reconnects = 0
+        self.last_event_at = None
+        self._stopping = threading.Event()
+
+    def stop(self):
+        self._stopping.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning("Availability cache listener disconnected: %s", e)
+            finally:
+                if self.connected:
+                    self.connected = False
+                    for subscriber in self.subscribers:
+                        subscriber.suspend()
+            if not self._stopping.wait(self.reconnect_delay):
+                self.reconnects += 1
+
+    def _listen(self):
+        conn = psycopg2.connect(self.dsn)
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            # Anything committed before LISTEN took effect may have been missed
+            self.connected = True
+            for subscriber in self.subscribers:
+                subscriber.resync()
+            logger.info("Availability listener on %s", self.channel)
+
+            while not self._stopping.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self.last_event_at = time.time()
+                    for subscriber in self.subscribers:
+                        try:
+                            self._apply(subscriber, parse_payload(notify.payload))
+                        except (ValueError, KeyError, TypeError) as e:
+                            # Unknown payload: be safe and start over
+                            logger.error("Bad invalidation payload %r: %s", notify.payload, e)
+                            subscriber.resync()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply(subscriber, events):
+        if any(event["t"] == "resync" for event in events):
+            subscriber.resync()
+            return
+        for event in events:
+            subscriber.handle_event(event)
+
+    def stats(self):
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "channel": self.channel,
+            "last_event_age_seconds": (
+                round(time.time() - self.last_event_at, 3) if self.last_event_at else None
+            ),
+        }
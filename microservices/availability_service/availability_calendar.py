@@ -0,0 +1,284 @@
+"""
+In-memory availability calendar for search across many rooms.
+
+Free room counts are held as one NumPy int32 matrix of shape
+(rooms, horizon_days) starting at `start`, with -1 where a night has no
+inventory row (treated as unavailable, like the strict check). The matrix
+is loaded in bulk from hotels_roominventory and kept current from the
+`availability_changes` notifications, whose inventory events carry the new
+free count (hotels migration 0014).
+
+Multi-night feasibility is a sliding-window minimum along the date axis:
+a stay of N nights starting on day d fits a room when
+min(free[room, d:d+N]) >= rooms_needed, evaluated for every room and every
+start day in one vectorized operation.
+
+Reloads (load, and the daily roll of the horizon) query the database
+without holding the lock, so searches and notifications carry on against
+the current matrix meanwhile. Events that arrive during a reload are
+applied right away and replayed onto the new matrix once it is swapped in;
+they carry absolute values, so applying one twice is harmless.
+
+Only inventory is consulted; the overlapping-bookings backup check of
+check_availability() is not repeated here, so a booking still goes through
+the full check.
+"""
+import logging
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import psycopg2
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+UNDEFINED = -1
+
+
+class AvailabilityCalendar:
+    def __init__(self, dsn, horizon_days=365):
+        self.dsn = dsn
+        self.horizon_days = horizon_days
+        self.start = None
+        self.ready = False
+        self._room_ids = np.empty(0, dtype=np.int64)
+        self._hotel_ids = np.empty(0, dtype=np.int64)
+        self._open = np.empty(0, dtype=bool)  # Room.is_available
+        self._index = {}  # room_id -> row
+        self._free = np.empty((0, horizon_days), dtype=np.int32)
+        self._lock = threading.RLock()
+        self._roll_lock = threading.Lock()
+        self._reloads = 0  # reloads in flight
+        self._pending = []  # events seen while a reload was in flight
+        self._counters = {"loads": 0, "events_applied": 0, "events_outside_horizon": 0, "rolls": 0}
+
+    # -- loading -----------------------------------------------------------
+
+    def load(self, today=None):
+        """(Re)build the whole matrix with two bulk queries."""
+        start = today or date.today()
+        end = start + timedelta(days=self.horizon_days)
+        self._begin_reload()
+        try:
+            self._load(start, end)
+        finally:
+            with self._lock:
+                self._end_reload()
+
+    def _load(self, start, end):
+        conn = psycopg2.connect(self.dsn)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT id, hotel_id, is_available FROM hotels_room ORDER BY id")
+                rooms = cursor.fetchall()
+                cursor.execute(
+                    """
+                    SELECT room_id, date - %s::date, total_rooms - booked_rooms
+                    FROM hotels_roominventory
+                    WHERE date >= %s AND date < %s
+                    """,
+                    [start, start, end],
+                )
+                inventory = cursor.fetchall()
+        finally:
+            conn.close()
+
+        room_ids = np.array([r[0] for r in rooms], dtype=np.int64)
+        index = {room_id: i for i, room_id in enumerate(room_ids.tolist())}
+        free = np.full((len(rooms), self.horizon_days), UNDEFINED, dtype=np.int32)
+        if inventory:
+            cells = np.array(inventory, dtype=np.int64)
+            rows = np.array([index.get(room_id, -1) for room_id in cells[:, 0].tolist()], dtype=np.int64)
+            known = rows >= 0
+            free[rows[known], cells[known, 1]] = np.maximum(cells[known, 2], 0)
+
+        with self._lock:
+            self.start = start
+            self._room_ids = room_ids
+            self._hotel_ids = np.array([r[1] for r in rooms], dtype=np.int64)
+            self._open = np.array([bool(r[2]) for r in rooms], dtype=bool)
+            self._index = index
+            self._free = free
+            self.ready = True
+            self._counters["loads"] += 1
+        logger.info("Availability calendar loaded: %s rooms x %s days", len(rooms), self.horizon_days)
+
+    def _roll(self, today):
+        """
+        Shift the horizon forward to `today` and load the newly exposed days.
+        Only one thread rolls; others keep searching the current window.
+        """
+        if not self._roll_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                start = self.start
+            days = (today - start).days if start else 0
+            if days <= 0:
+                return
+            if days >= self.horizon_days:
+                self.load(today)
+                return
+            self._begin_reload()
+            try:
+                inventory = self._fetch_days(today, start + timedelta(days=self.horizon_days), days)
+                with self._lock:
+                    if self.start != start:
+                        return  # reloaded meanwhile
+                    free = np.full_like(self._free, UNDEFINED)
+                    free[:, :self.horizon_days - days] = self._free[:, days:]
+                    for room_id, offset, value in inventory:
+                        row = self._index.get(room_id)
+                        if row is not None:
+                            free[row, offset] = max(value, 0)
+                    self._free = free
+                    self.start = today
+                    self._counters["rolls"] += 1
+            finally:
+                with self._lock:
+                    self._end_reload()
+        finally:
+            self._roll_lock.release()
+
+    def _fetch_days(self, start, first_day, days):
+        """(room_id, offset from `start`, free) for `days` days from first_day."""
+        conn = psycopg2.connect(self.dsn)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT room_id, date - %s::date, total_rooms - booked_rooms
+                    FROM hotels_roominventory
+                    WHERE date >= %s AND date < %s
+                    """,
+                    [start, first_day, first_day + timedelta(days=days)],
+                )
+                return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def _begin_reload(self):
+        with self._lock:
+            self._reloads += 1
+
+    def _end_reload(self):
+        """Call with the lock held, after the reloaded matrix (if any) is swapped in."""
+        self._reloads -= 1
+        pending = self._pending
+        if not self._reloads:
+            self._pending = []
+        for event in pending:
+            self._apply(event)
+
+    # -- incremental updates (listener subscriber interface) ---------------
+
+    def resync(self):
+        self.load()
+
+    def suspend(self):
+        with self._lock:
+            self.ready = False
+
+    def handle_event(self, event):
+        with self._lock:
+            if self._reloads:
+                self._pending.append(event)
+            if self._apply(event):
+                self._counters["events_applied"] += 1
+
+    def _apply(self, event):
+        """Apply one event to the matrix; call with the lock held. False if it was ignored."""
+        kind = event["t"]
+        room_id = event["room"]
+        if kind == "inventory":
+            row = self._index.get(room_id)
+            offset = (date.fromisoformat(event["date"]) - self.start).days if self.start else -1
+            if row is None or not 0 <= offset < self.horizon_days:
+                self._counters["events_outside_horizon"] += 1
+                return False
+            value = event.get("free")
+            self._free[row, offset] = UNDEFINED if value is None else max(int(value), 0)
+        elif kind == "room":
+            self._apply_room(room_id, event)
+        else:
+            return False  # bookings are reflected through their inventory rows
+        return True
+
+    def _apply_room(self, room_id, event):
+        row = self._index.get(room_id)
+        if event.get("deleted"):
+            if row is not None:
+                self._open[row] = False
+                self._free[row, :] = UNDEFINED
+            return
+        if row is None:
+            # New room: append a row (its inventory events follow)
+            self._index[room_id] = len(self._room_ids)
+            self._room_ids = np.append(self._room_ids, room_id)
+            self._hotel_ids = np.append(self._hotel_ids, event.get("hotel", -1))
+            self._open = np.append(self._open, bool(event.get("available", True)))
+            self._free = np.vstack([self._free, np.full((1, self.horizon_days), UNDEFINED, dtype=np.int32)])
+        else:
+            self._open[row] = bool(event.get("available", self._open[row]))
+
+    # -- queries -----------------------------------------------------------
+
+    def search(self, nights, first_check_in, last_check_in, room_ids=None, hotel_id=None,
+               rooms_needed=1, today=None):
+        """
+        Rooms that can host a `nights`-night stay starting on some day between
+        first_check_in and last_check_in (inclusive).
+
+        Returns (check_in_dates, results) where results is a list of
+        (room_id, feasible) and feasible is a boolean array aligned with
+        check_in_dates. Rooms with no feasible start are left out.
+        """
+        if nights < 1:
+            raise ValueError("nights must be at least 1")
+        today = today or date.today()
+        if self.start is not None and today > self.start:
+            # Reads the new days outside the lock
+            self._roll(today)
+        with self._lock:
+            if not self.ready:
+                raise RuntimeError("Availability calendar is not loaded")
+            first = max((first_check_in - self.start).days, 0)
+            last = min((last_check_in - self.start).days, self.horizon_days - nights)
+            if last < first:
+                return [], []
+
+            if room_ids is not None:
+                rows = np.array([self._index[r] for r in room_ids if r in self._index], dtype=np.int64)
+            elif hotel_id is not None:
+                rows = np.flatnonzero(self._hotel_ids == hotel_id)
+            else:
+                rows = np.arange(len(self._room_ids))
+            rows = rows[self._open[rows]]
+            # Nights first .. last + nights - 1 cover every candidate stay
+            block = self._free[rows, first:last + nights]
+            selected_ids = self._room_ids[rows]
+
+        feasible = self.window_minimum(block, nights) >= rooms_needed
+        hits = np.flatnonzero(feasible.any(axis=1))
+        check_ins = [self.start + timedelta(days=first + i) for i in range(last - first + 1)]
+        return check_ins, [(int(selected_ids[i]), feasible[i]) for i in hits]
+
+    @staticmethod
+    def window_minimum(matrix, width):
+        """Minimum of every `width`-long window along the last axis."""
+        if matrix.shape[-1] < width:
+            return np.empty(matrix.shape[:-1] + (0,), dtype=matrix.dtype)
+        return sliding_window_view(matrix, width, axis=-1).min(axis=-1)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update({
+                "ready": self.ready,
+                "start": self.start.isoformat() if self.start else None,
+                "horizon_days": self.horizon_days,
+                "rooms": int(len(self._room_ids)),
+                "memory_bytes": int(self._free.nbytes),
+            })
+        return counters
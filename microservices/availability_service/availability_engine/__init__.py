@@ -0,0 +1,28 @@
+"""
+Availability engine shared by the FastAPI service and the Django backend.
+
+The engine only needs a DB-API cursor using the ``%s`` paramstyle, so it can
+run on a SQLAlchemy connection (FastAPI) or on Django's own connection inside
+the booking transaction without an HTTP hop. ``availability_engine.aio`` runs
+the same checks on an asyncpg connection.
+"""
+from .checks import (
+    AvailabilityResult,
+    RoomAvailability,
+    check_availability,
+    check_rooms,
+    fetch_range,
+    range_result,
+)
+from .windows import StayWindow, find_windows
+
+__all__ = [
+    "AvailabilityResult",
+    "RoomAvailability",
+    "check_availability",
+    "check_rooms",
+    "fetch_range",
+    "range_result",
+    "StayWindow",
+    "find_windows",
+]
@@ -0,0 +1,45 @@
+"""
+asyncio variants of the availability checks for asyncpg connections.
+
+The SQL and the decision logic are shared with checks.py; only the
+placeholder style differs (asyncpg uses ``$1``, ``$2`` ... instead of
+``%(name)s``).
+"""
+import re
+
+from .checks import RANGE_SQL, batch_query, batch_results, range_params, range_result
+
+_NAMED = re.compile(r"%\((\w+)\)s")
+
+
+def to_positional(sql, params):
+    """Rewrite ``%(name)s`` placeholders as ``$n`` and return (sql, args)."""
+    order = []
+
+    def replace(match):
+        name = match.group(1)
+        if name not in order:
+            order.append(name)
+        return f"${order.index(name) + 1}"
+
+    return _NAMED.sub(replace, sql), [params[name] for name in order]
+
+
+async def check_availability_async(conn, room_id, check_in, check_out):
+    """Same as check_availability() on an asyncpg connection."""
+    return range_result(await fetch_range_async(conn, room_id, check_in, check_out), check_in, check_out)
+
+
+async def fetch_range_async(conn, room_id, check_in, check_out):
+    """Same as fetch_range() on an asyncpg connection."""
+    sql, args = to_positional(RANGE_SQL, range_params(room_id, check_in, check_out))
+    row = await conn.fetchrow(sql, *args)
+    return tuple(row) if row else None
+
+
+async def check_rooms_async(conn, check_in, check_out, room_ids=None, hotel_id=None):
+    """Same as check_rooms() on an asyncpg connection."""
+    sql, params = batch_query(check_in, check_out, room_ids, hotel_id)
+    sql, args = to_positional(sql, params)
+    rows = await conn.fetch(sql, *args)
+    return batch_results([tuple(row) for row in rows], check_in, check_out, room_ids)
@@ -0,0 +1,192 @@
+"""
+Room availability checks expressed as plain SQL.
+
+Table names match the Django apps (hotels_room, bookings_booking,
+hotels_roominventory) so both services read the same schema.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AvailabilityResult:
+    available: bool
+    reason: str
+
+
+@dataclass(frozen=True)
+class RoomAvailability:
+    """One row of the batch availability matrix."""
+    room_id: int
+    available: bool
+    reason: str
+    min_free: Optional[int]
+    free: Tuple[Optional[int], ...]  # free rooms per night, None where inventory is missing
+
+
+# Stays are matched with the same half-open ranges as Booking.stay. The lower
+# bound is clamped with LEAST so inverted dates give an empty range (and the
+# "Check-out must be after check-in" verdict) instead of a Postgres error.
+RANGE_SQL = """
+    SELECT r.is_available,
+           r.total_rooms,
+           (SELECT COUNT(*) FROM bookings_booking b
+            WHERE b.room_id = r.id
+              AND b.status = 'confirmed'
+              AND b.stay && daterange(LEAST(%(check_in)s::date, %(check_out)s::date), %(check_out)s::date, '[)')
+           ) AS overlapping,
+           nights.covered,
+           nights.min_free,
+           nights.first_missing,
+           nights.first_full
+    FROM hotels_room r
+    CROSS JOIN LATERAL (
+        SELECT COUNT(inv.id) AS covered,
+               MIN(inv.total_rooms - inv.booked_rooms) AS min_free,
+               MIN(g.night::date) FILTER (WHERE inv.id IS NULL) AS first_missing,
+               MIN(g.night::date) FILTER (WHERE inv.booked_rooms >= inv.total_rooms) AS first_full
+        FROM generate_series(%(check_in)s::date, %(check_out)s::date - 1, interval '1 day') AS g(night)
+        LEFT JOIN hotels_roominventory inv
+               ON inv.room_id = r.id AND inv.date = g.night::date
+    ) AS nights
+    WHERE r.id = %(room_id)s
+"""
+
+
+def check_availability(cursor, room_id, check_in, check_out):
+    """
+    Check whether `room_id` can be booked from check_in to check_out.
+
+    The room flags, overlapping bookings and every night's inventory come
+    back from one statement, so the cost does not grow with stay length.
+
+    Args:
+        cursor: DB-API cursor (psycopg2 or Django cursor wrapper)
+        room_id: Primary key of the room
+        check_in: First night (date)
+        check_out: Departure day (date, exclusive)
+
+    Returns:
+        AvailabilityResult with the same reasons the HTTP service returns
+    """
+    return range_result(fetch_range(cursor, room_id, check_in, check_out), check_in, check_out)
+
+
+def fetch_range(cursor, room_id, check_in, check_out):
+    """Return the raw RANGE_SQL row for a stay (None if the room does not exist)."""
+    cursor.execute(RANGE_SQL, range_params(room_id, check_in, check_out))
+    row = cursor.fetchone()
+    return tuple(row) if row else None
+
+
+def range_params(room_id, check_in, check_out):
+    return {"room_id": room_id, "check_in": check_in, "check_out": check_out}
+
+
+def range_result(row, check_in, check_out):
+    """Turn a RANGE_SQL row (or None) into an AvailabilityResult."""
+    if not row:
+        return AvailabilityResult(False, "Room not found")
+
+    is_available, total_rooms, overlapping, _covered, _min_free, first_missing, first_full = row
+
+    return _decide(is_available, total_rooms, overlapping, first_missing, first_full, check_in, check_out)
+
+
+BATCH_SQL = """
+    SELECT r.id,
+           r.is_available,
+           r.total_rooms,
+           (SELECT COUNT(*) FROM bookings_booking b
+            WHERE b.room_id = r.id
+              AND b.status = 'confirmed'
+              AND b.stay && daterange(LEAST(%(check_in)s::date, %(check_out)s::date), %(check_out)s::date, '[)')
+           ) AS overlapping,
+           MIN(inv.total_rooms - inv.booked_rooms) AS min_free,
+           MIN(g.night::date) FILTER (WHERE inv.id IS NULL) AS first_missing,
+           MIN(g.night::date) FILTER (WHERE inv.booked_rooms >= inv.total_rooms) AS first_full,
+           array_agg(inv.total_rooms - inv.booked_rooms ORDER BY g.night) AS free
+    FROM hotels_room r
+    CROSS JOIN generate_series(%(check_in)s::date, %(check_out)s::date - 1, interval '1 day') AS g(night)
+    LEFT JOIN hotels_roominventory inv
+           ON inv.room_id = r.id AND inv.date = g.night::date
+    WHERE {where}
+    GROUP BY r.id
+    ORDER BY r.id
+"""
+
+
+def check_rooms(cursor, check_in, check_out, room_ids=None, hotel_id=None):
+    """
+    Check many rooms for the same dates with one grouped query.
+
+    Pass either `room_ids` or `hotel_id`. Returns a list of RoomAvailability
+    ordered by room id; requested room ids that do not exist are reported
+    as "Room not found". Reasons are the same as check_availability().
+    Raises ValueError for a missing target or an empty date range.
+    """
+    sql, params = batch_query(check_in, check_out, room_ids, hotel_id)
+    cursor.execute(sql, params)
+    return batch_results(cursor.fetchall(), check_in, check_out, room_ids)
+
+
+def batch_query(check_in, check_out, room_ids=None, hotel_id=None):
+    """Return (sql, params) for check_rooms(), validating the arguments."""
+    if room_ids is None and hotel_id is None:
+        raise ValueError("room_ids or hotel_id is required")
+
+    if check_in >= check_out:
+        raise ValueError("Check-out must be after check-in")
+
+    params = {"check_in": check_in, "check_out": check_out}
+    if room_ids is not None:
+        where = "r.id = ANY(%(room_ids)s)"
+        params["room_ids"] = list(room_ids)
+    else:
+        where = "r.hotel_id = %(hotel_id)s"
+        params["hotel_id"] = hotel_id
+    return BATCH_SQL.format(where=where), params
+
+
+def batch_results(rows, check_in, check_out, room_ids=None):
+    """Build the RoomAvailability list from BATCH_SQL rows."""
+    results = {}
+    for room_id, is_available, total_rooms, overlapping, min_free, first_missing, first_full, free in rows:
+        decision = _decide(is_available, total_rooms, overlapping, first_missing, first_full, check_in, check_out)
+        results[room_id] = RoomAvailability(room_id, decision.available, decision.reason, min_free, tuple(free))
+
+    for room_id in room_ids or ():
+        if room_id not in results:
+            results[room_id] = RoomAvailability(room_id, False, "Room not found", None, ())
+    return [results[room_id] for room_id in sorted(results)]
+
+
+def _decide(is_available, total_rooms, overlapping, first_missing, first_full, check_in, check_out):
+    """Turn the aggregated range figures into the service's verdict and reason."""
+    if not is_available:
+        return AvailabilityResult(False, "Room is marked unavailable")
+
+    if check_in >= check_out:
+        return AvailabilityResult(False, "Check-out must be after check-in")
+
+    # 1. Check for overlapping bookings (Backup check)
+    if overlapping >= total_rooms:
+        return AvailabilityResult(
+            False,
+            f"Room is fully booked for the selected dates (Booked: {overlapping}, Total: {total_rooms})"
+        )
+
+    # 2. Strict Inventory Check: report the earliest failing night
+    if first_missing is not None and (first_full is None or first_missing < first_full):
+        return AvailabilityResult(
+            False,
+            f"Inventory not defined for {first_missing}. Please check for another date"
+        )
+
+    if first_full is not None:
+        return AvailabilityResult(
+            False,
+            f"No rooms available for {first_full}. Please check for another date"
+        )
+
+    return AvailabilityResult(True, "Room is available for the selected dates")
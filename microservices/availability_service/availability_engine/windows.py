@@ -0,0 +1,100 @@
+"""
+Flexible-date search: the earliest stays of a given length that fit a room.
+
+The room's free counts for the whole search span come back from one query
+(one inventory scan); the candidate check-ins are then found with a single
+pass over that array: a stay of N nights fits wherever the current run of
+bookable nights reaches N.
+
+Only inventory is consulted, not the overlapping-bookings backup check, so
+a suggested stay still goes through check_availability() when booked.
+"""
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List
+
+
+@dataclass
+class StayWindow:
+    check_in: date
+    check_out: date
+    min_free: int  # fewest free rooms on any night of the stay
+
+
+WINDOWS_SQL = """
+    SELECT r.is_available,
+           array_agg(inv.total_rooms - inv.booked_rooms ORDER BY g.night) AS free
+    FROM hotels_room r
+    CROSS JOIN generate_series(%(first_night)s::date, %(last_night)s::date, interval '1 day') AS g(night)
+    LEFT JOIN hotels_roominventory inv
+           ON inv.room_id = r.id AND inv.date = g.night::date
+    WHERE r.id = %(room_id)s
+    GROUP BY r.id
+"""
+
+
+def find_windows(cursor, room_id, nights, first_check_in, span_days, limit=5, rooms_needed=1):
+    """
+    Earliest `limit` stays of `nights` nights for `room_id` whose check-in
+    falls within `span_days` days from first_check_in (inclusive).
+
+    Returns a list of StayWindow in check-in order; empty when the room does
+    not exist, is marked unavailable or nothing fits. Raises ValueError for
+    a non-positive stay length or span.
+    """
+    if nights < 1:
+        raise ValueError("nights must be at least 1")
+    if span_days < 1:
+        raise ValueError("span_days must be at least 1")
+
+    cursor.execute(WINDOWS_SQL, windows_params(room_id, nights, first_check_in, span_days))
+    row = cursor.fetchone()
+    if not row or not row[0]:
+        return []
+    return [
+        StayWindow(
+            first_check_in + timedelta(days=offset),
+            first_check_in + timedelta(days=offset + nights),
+            min_free,
+        )
+        for offset, min_free in earliest_windows(row[1], nights, limit, rooms_needed)
+    ]
+
+
+def windows_params(room_id, nights, first_check_in, span_days):
+    return {
+        "room_id": room_id,
+        "first_night": first_check_in,
+        "last_night": first_check_in + timedelta(days=span_days + nights - 2),
+    }
+
+
+def earliest_windows(free, nights, limit, rooms_needed=1) -> List[tuple]:
+    """
+    (offset, min_free) of the first `limit` runs of `nights` consecutive
+    entries of `free` that are all >= rooms_needed. None marks a night with
+    no inventory row and never fits.
+
+    The window minimum is kept in a monotonic deque, so the pass is linear
+    in len(free) whatever the stay length.
+    """
+    found = []
+    run = 0
+    minima = deque()  # indices of the current window, values increasing
+    for night, value in enumerate(free):
+        if value is None or value < rooms_needed:
+            run = 0
+            minima.clear()
+            continue
+        run += 1
+        while minima and free[minima[-1]] >= value:
+            minima.pop()
+        minima.append(night)
+        if minima[0] <= night - nights:
+            minima.popleft()
+        if run >= nights:
+            found.append((night - nights + 1, free[minima[0]]))
+            if len(found) >= limit:
+                break
+    return found
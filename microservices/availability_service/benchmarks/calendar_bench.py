@@ -0,0 +1,189 @@
+"""
+Benchmark the NumPy availability calendar against the SQL path.
+
+Question answered: "which of these N rooms have `nights` consecutive free
+nights starting on some day in the next `span` days?"
+
+  sql-batch   one grouped check_rooms() query per candidate check-in date
+  sql-naive   one check_availability() query per room and date (--naive)
+  calendar    bulk load once, then a vectorized sliding-window minimum
+
+The script seeds a throwaway hotel with N rooms and random inventory, runs
+each path, checks that they agree, prints timings and writes them as JSON.
+The seeded rows are deleted afterwards.
+
+Usage (from microservices/availability_service):
+    python benchmarks/calendar_bench.py --rooms 500 --nights 3 --span 60
+"""
+import argparse
+import datetime as _dt
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from availability_calendar import AvailabilityCalendar  # noqa: E402
+from availability_engine import check_availability, check_rooms  # noqa: E402
+from config import DATABASE_URL  # noqa: E402
+
+
+def seed(conn, rooms, start, days, rng, capacity):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO hotels_hotel (name, city, address, rating, price_min, description, created_at)
+            VALUES ('Calendar Bench', 'Bench', '-', 4, 100, '', now()) RETURNING id
+            """
+        )
+        hotel_id = cursor.fetchone()[0]
+        room_ids = []
+        for i in range(rooms):
+            cursor.execute(
+                """
+                INSERT INTO hotels_room (hotel_id, room_name, description, is_available, created_at,
+                    amenities, available_rooms, bed_type, free_cancellation, is_refundable,
+                    size_in_sqft, total_rooms, max_adults, max_children, price_per_night, max_guests)
+                VALUES (%s, %s, '', true, now(), '[]', %s, 'queen', false, false, 0, %s, 2, 0, 100, 2)
+                RETURNING id
+                """,
+                [hotel_id, f"Bench {i}", capacity, capacity],
+            )
+            room_ids.append(cursor.fetchone()[0])
+        rows = []
+        for room_id in room_ids:
+            for d in range(days):
+                # Mostly free, with some sold-out nights and a few undefined ones
+                roll = rng.random()
+                if roll < 0.03:
+                    continue
+                booked = capacity if roll < 0.25 else rng.randint(0, capacity - 1)
+                rows.append((room_id, start + _dt.timedelta(days=d), capacity, booked))
+        psycopg2.extras.execute_values(
+            cursor,
+            "INSERT INTO hotels_roominventory (room_id, date, total_rooms, booked_rooms) VALUES %s",
+            rows, page_size=5000,
+        )
+    conn.commit()
+    return hotel_id, room_ids
+
+
+def cleanup(conn, hotel_id):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM hotels_roominventory WHERE room_id IN (SELECT id FROM hotels_room WHERE hotel_id = %s)",
+            [hotel_id],
+        )
+        cursor.execute("DELETE FROM hotels_room WHERE hotel_id = %s", [hotel_id])
+        cursor.execute("DELETE FROM hotels_hotel WHERE id = %s", [hotel_id])
+    conn.commit()
+
+
+def sql_batch(conn, room_ids, starts, nights):
+    found = {}
+    queries = 0
+    with conn.cursor() as cursor:
+        for check_in in starts:
+            check_out = check_in + _dt.timedelta(days=nights)
+            for room in check_rooms(cursor, check_in, check_out, room_ids=room_ids):
+                if room.available:
+                    found.setdefault(room.room_id, []).append(check_in)
+            queries += 1
+    return found, queries
+
+
+def sql_naive(conn, room_ids, starts, nights):
+    found = {}
+    queries = 0
+    with conn.cursor() as cursor:
+        for room_id in room_ids:
+            for check_in in starts:
+                result = check_availability(cursor, room_id, check_in, check_in + _dt.timedelta(days=nights))
+                queries += 1
+                if result.available:
+                    found.setdefault(room_id, []).append(check_in)
+    return found, queries
+
+
+def calendar_search(calendar, room_ids, starts, nights):
+    check_ins, matches = calendar.search(nights, starts[0], starts[-1], room_ids=room_ids)
+    return {room_id: [check_ins[i] for i in np.flatnonzero(feasible)] for room_id, feasible in matches}
+
+
+def timed(fn, repeat=1):
+    best = None
+    result = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - began) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, round(best, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--span", type=int, default=60, help="Candidate check-in days")
+    parser.add_argument("--capacity", type=int, default=5, help="total_rooms per room type")
+    parser.add_argument("--horizon", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--naive", action="store_true", help="Also time one query per room and date")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=str(SERVICE_DIR / "benchmarks" / "results"))
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    today = _dt.date.today()
+    start = today + _dt.timedelta(days=1)
+    starts = [start + _dt.timedelta(days=i) for i in range(args.span)]
+
+    conn = psycopg2.connect(DATABASE_URL)
+    hotel_id, room_ids = seed(conn, args.rooms, start, args.span + args.nights, rng, args.capacity)
+    try:
+        calendar = AvailabilityCalendar(DATABASE_URL, horizon_days=args.horizon)
+        _, load_ms = timed(calendar.load)
+        expected, calendar_ms = timed(lambda: calendar_search(calendar, room_ids, starts, args.nights), args.repeat)
+        (batch, batch_queries), batch_ms = timed(lambda: sql_batch(conn, room_ids, starts, args.nights))
+
+        result = {
+            "timestamp": _dt.datetime.now(_dt.timezone.utc).isoformat(),
+            "config": {k: getattr(args, k) for k in ("rooms", "nights", "span", "capacity", "horizon", "seed")},
+            "rooms_matched": len(expected),
+            "calendar": {"load_ms": load_ms, "search_ms": calendar_ms,
+                         "memory_bytes": calendar.stats()["memory_bytes"]},
+            "sql_batch": {"ms": batch_ms, "queries": batch_queries,
+                          "agrees": batch == expected},
+        }
+        if args.naive:
+            (naive, naive_queries), naive_ms = timed(lambda: sql_naive(conn, room_ids, starts, args.nights))
+            result["sql_naive"] = {"ms": naive_ms, "queries": naive_queries, "agrees": naive == expected}
+    finally:
+        cleanup(conn, hotel_id)
+        conn.close()
+
+    print(f"{args.rooms} rooms, {args.nights} nights, {args.span} candidate check-ins "
+          f"-> {result['rooms_matched']} rooms match")
+    print(f"  calendar   load {load_ms} ms, search {calendar_ms} ms")
+    print(f"  sql-batch  {batch_ms} ms ({batch_queries} queries) agrees={result['sql_batch']['agrees']}")
+    if "sql_naive" in result:
+        naive = result["sql_naive"]
+        print(f"  sql-naive  {naive['ms']} ms ({naive['queries']} queries) agrees={naive['agrees']}")
+
+    directory = Path(args.output)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"calendar-{_dt.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(result, indent=2))
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
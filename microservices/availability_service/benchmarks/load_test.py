@@ -0,0 +1,160 @@
+"""
+Sync vs async load benchmark for the availability service.
+
+Starts the service with one uvicorn worker in each DB_MODE and drives
+POST /check-availability with 50, 200 and 1000 concurrent clients, then
+prints and stores requests/second, latency percentiles and error counts.
+
+The database must already contain the room being checked (run the Django
+migrations and create a room with inventory first). Run the load generator
+on other cores than the service (e.g. taskset) or the client becomes the
+bottleneck. Results are written after every level.
+
+Usage (from microservices/availability_service):
+    python benchmarks/load_test.py --room-id 1 --check-in 2027-01-01 --check-out 2027-01-08
+    python benchmarks/load_test.py --modes async --concurrency 200 --duration 20
+"""
+import argparse
+import asyncio
+import datetime as _dt
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def start_service(mode, port, pool_size, max_overflow):
+    env = dict(os.environ, DB_MODE=mode, DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW=str(max_overflow))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", "1", "--log-level", "warning", "--no-access-log"],
+        cwd=SERVICE_DIR, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Service in {mode} mode did not start on port {port}")
+
+
+async def run_level(url, payload, concurrency, duration, timeout):
+    latencies = []
+    errors = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                began = time.perf_counter()
+                try:
+                    response = await client.post(url, json=payload)
+                    key = None if response.status_code == 200 else str(response.status_code)
+                except httpx.HTTPError as e:
+                    key = type(e).__name__
+                if key is None:
+                    latencies.append((time.perf_counter() - began) * 1000)
+                else:
+                    errors[key] = errors.get(key, 0) + 1
+
+        began = time.perf_counter()
+        tasks = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        # Requests still stuck after duration + timeout are abandoned and counted
+        _, pending = await asyncio.wait(tasks, timeout=duration + timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            errors["abandoned"] = len(pending)
+        wall = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of warm-up per mode")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Client request timeout")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--pool-size", type=int, default=int(os.getenv("DB_POOL_SIZE", "5")))
+    parser.add_argument("--max-overflow", type=int, default=int(os.getenv("DB_MAX_OVERFLOW", "10")))
+    parser.add_argument("--room-id", type=int, default=1)
+    parser.add_argument("--check-in", default="2027-01-01")
+    parser.add_argument("--check-out", default="2027-01-08")
+    parser.add_argument("--output", default=str(SERVICE_DIR / "benchmarks" / "results"))
+    args = parser.parse_args()
+
+    payload = {"room_id": args.room_id, "check_in": args.check_in, "check_out": args.check_out}
+    url = f"http://127.0.0.1:{args.port}/check-availability"
+    result = {
+        "timestamp": _dt.datetime.now(_dt.timezone.utc).isoformat(),
+        "config": {
+            "duration": args.duration,
+            "pool_size": args.pool_size,
+            "max_overflow": args.max_overflow,
+            "payload": payload,
+        },
+        "modes": {},
+    }
+
+    directory = Path(args.output)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"load-{_dt.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+
+    for mode in args.modes:
+        process = start_service(mode, args.port, args.pool_size, args.max_overflow)
+        try:
+            asyncio.run(run_level(url, payload, 10, args.warmup, args.timeout))
+            levels = []
+            result["modes"][mode] = levels
+            for concurrency in args.concurrency:
+                level = asyncio.run(run_level(url, payload, concurrency, args.duration, args.timeout))
+                levels.append(level)
+                print(
+                    f"{mode:5} c={concurrency:<5} {level['throughput_rps']:>9} req/s  "
+                    f"p50={level['latency_ms']['p50']}ms p99={level['latency_ms']['p99']}ms  "
+                    f"errors={level['errors'] or 0}"
+                )
+                path.write_text(json.dumps(result, indent=2))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
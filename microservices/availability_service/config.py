@@ -114,3 +114,55 @@ encoded_password = quote_plus(DB_PASSWORD)
 DATABASE_URL = (
     f"postgresql://{encoded_user}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+
+# asyncpg URL for the async engine (DB_MODE=async)
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{encoded_user}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# "sync": def endpoints on the threadpool with a sync engine
+# "async": async def endpoints on the event loop with an asyncpg engine
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+if DB_MODE not in ("sync", "async"):
+    raise ValueError(f"DB_MODE must be 'sync' or 'async', got {DB_MODE!r}")
+
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool (per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds to wait for a free connection before failing the request
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# Replace connections older than this many seconds (-1 disables)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Test connections on checkout so a Postgres restart does not fail requests
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# Connections opened at startup (defaults to the full pool size)
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", str(DB_POOL_SIZE)))
+
+# Sync mode: threadpool size for def endpoints. Defaults to the most
+# connections the pool can hand out, so threads never queue on the pool.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+# Whether the writers' database triggers publish changes (Django's
+# AVAILABILITY_NOTIFY, which must match). Without them the cache and the
+# calendar could not tell when they go stale, so both are turned off.
+AVAILABILITY_NOTIFY = _env_bool("AVAILABILITY_NOTIFY", True)
+
+# In-process availability cache, invalidated by NOTIFY from database triggers
+AVAILABILITY_CACHE_ENABLED = _env_bool("AVAILABILITY_CACHE_ENABLED", True) and AVAILABILITY_NOTIFY
+AVAILABILITY_CACHE_TTL = float(os.getenv("AVAILABILITY_CACHE_TTL", "30"))
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "10000"))
+# Must match the channel used by the Django migrations' triggers
+AVAILABILITY_NOTIFY_CHANNEL = os.getenv("AVAILABILITY_NOTIFY_CHANNEL", "availability_changes")
+
+# NumPy calendar of free rooms for multi-room date search (kept current by the same listener)
+AVAILABILITY_CALENDAR_ENABLED = _env_bool("AVAILABILITY_CALENDAR_ENABLED", True) and AVAILABILITY_NOTIFY
+AVAILABILITY_CALENDAR_HORIZON_DAYS = int(os.getenv("AVAILABILITY_CALENDAR_HORIZON_DAYS", "365"))
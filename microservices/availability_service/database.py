@@ -1,11 +1,45 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from config import DATABASE_URL
+from config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_MODE,
+    DB_POOL_PRE_PING,
+    DB_POOL_PREWARM,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+from pool_stats import PoolStats
+
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Only built in async mode so the sync service does not need asyncpg installed
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# Stats for the engine that serves requests in this mode
+pool_stats = PoolStats().attach(async_engine.sync_engine if async_engine is not None else engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -14,3 +48,59 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def db_cursor(db):
+    """Yield a raw DB-API cursor on the session's connection (for availability_engine)."""
+    try:
+        with pool_stats.timing():
+            connection = db.connection()
+    except PoolTimeoutError:
+        pool_stats.record_timeout()
+        raise
+    cursor = connection.connection.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+@asynccontextmanager
+async def driver_connection(db):
+    """Yield the raw asyncpg connection behind an AsyncSession (for availability_engine.aio)."""
+    try:
+        with pool_stats.timing():
+            connection = await db.connection()
+    except PoolTimeoutError:
+        pool_stats.record_timeout()
+        raise
+    raw = await connection.get_raw_connection()
+    yield raw.driver_connection
+
+
+def prewarm(count=DB_POOL_PREWARM):
+    """Open `count` pooled connections up front so the first requests don't pay for connect."""
+    count = min(count, DB_POOL_SIZE)
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def prewarm_async(count=DB_POOL_PREWARM):
+    """Async counterpart of prewarm() for the asyncpg engine."""
+    count = min(count, DB_POOL_SIZE)
+    connections = await asyncio.gather(*(async_engine.connect() for _ in range(count)))
+    for connection in connections:
+        await connection.close()
+    return len(connections)
@@ -1,16 +1,85 @@
-from fastapi import FastAPI, Depends
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import anyio.to_thread
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session
-from datetime import date, timedelta
-from sqlalchemy import and_
 
-from database import get_db, Base, engine
-from models import Room, Booking, RoomInventory
-from schemas import AvailabilityRequest, AvailabilityResponse
+import availability_engine
+from availability_engine import aio
+from availability_cache import MISS, AvailabilityCache, InvalidationListener
+from availability_calendar import AvailabilityCalendar
+from config import (
+    AVAILABILITY_CACHE_ENABLED,
+    AVAILABILITY_CALENDAR_ENABLED,
+    AVAILABILITY_CALENDAR_HORIZON_DAYS,
+    AVAILABILITY_CACHE_MAX_ENTRIES,
+    AVAILABILITY_CACHE_TTL,
+    AVAILABILITY_NOTIFY_CHANNEL,
+    DATABASE_URL,
+    DB_MODE,
+    THREADPOOL_SIZE,
+)
+from database import (
+    get_db,
+    get_async_db,
+    db_cursor,
+    driver_connection,
+    pool_stats,
+    prewarm,
+    prewarm_async,
+    Base,
+    engine,
+)
+from schemas import (
+    AvailabilityRequest,
+    AvailabilityResponse,
+    BatchAvailabilityRequest,
+    BatchAvailabilityResponse,
+    CalendarSearchRequest,
+    CalendarSearchResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+cache = AvailabilityCache(ttl=AVAILABILITY_CACHE_TTL, max_entries=AVAILABILITY_CACHE_MAX_ENTRIES)
+calendar = AvailabilityCalendar(DATABASE_URL, horizon_days=AVAILABILITY_CALENDAR_HORIZON_DAYS)
+listener = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global listener
+    if DB_MODE == "sync":
+        # Never run more request threads than the pool can serve connections
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    try:
+        warmed = await prewarm_async() if DB_MODE == "async" else prewarm()
+        logger.info("Prewarmed %s database connections", warmed)
+    except Exception as e:
+        # Start anyway; pre-ping/reconnect will handle the database coming up later
+        logger.warning("Could not prewarm database connections: %s", e)
+    subscribers = []
+    if AVAILABILITY_CACHE_ENABLED:
+        subscribers.append(cache)
+    if AVAILABILITY_CALENDAR_ENABLED:
+        subscribers.append(calendar)
+    if subscribers:
+        listener = InvalidationListener(subscribers, DATABASE_URL, AVAILABILITY_NOTIFY_CHANNEL)
+        listener.start()
+    yield
+    if listener is not None:
+        listener.stop()
+
 
 app = FastAPI(
     title="Availability Service",
     description="FastAPI microservice to check room availability",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Not creating tables here, just ensure metadata is bound
@@ -19,68 +88,139 @@ Base.metadata.bind = engine
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "db_mode": DB_MODE}
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "db_mode": DB_MODE,
+        "pool": pool_stats.snapshot(),
+        "cache": cache.stats(),
+        "calendar": calendar.stats(),
+        "listener": listener.stats() if listener is not None else None,
+    }
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # Fail fast with a retryable status instead of a 500 when the pool is exhausted
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database connection pool exhausted, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _batch_response(payload, rooms):
+    nights = (payload.check_out - payload.check_in).days
+    return BatchAvailabilityResponse(
+        check_in=payload.check_in,
+        check_out=payload.check_out,
+        nights=[payload.check_in + timedelta(days=i) for i in range(nights)],
+        rooms=[
+            {
+                "room_id": room.room_id,
+                "available": room.available,
+                "reason": room.reason,
+                "min_free": room.min_free,
+                "free": list(room.free),
+            }
+            for room in rooms
+        ],
+    )
+
+
+@app.post("/search/availability", response_model=CalendarSearchResponse)
+def search_availability(payload: CalendarSearchRequest):
+    """
+    Rooms that have `nights` consecutive free nights starting on some day in
+    [first_check_in, last_check_in], answered from the in-memory calendar.
+    """
+    if not calendar.ready:
+        raise HTTPException(status_code=503, detail="Availability calendar is not loaded yet")
+    check_ins, matches = calendar.search(
+        payload.nights, payload.first_check_in, payload.last_check_in,
+        room_ids=payload.room_ids, hotel_id=payload.hotel_id, rooms_needed=payload.rooms_needed,
+    )
+    rooms = []
+    for room_id, feasible in matches:
+        starts = [check_ins[i] for i in feasible.nonzero()[0]]
+        rooms.append({
+            "room_id": room_id,
+            "first_check_in": starts[0],
+            "feasible_check_ins": len(starts),
+            "check_ins": starts if payload.include_dates else None,
+        })
+    return CalendarSearchResponse(
+        nights=payload.nights,
+        first_check_in=payload.first_check_in,
+        last_check_in=payload.last_check_in,
+        rooms=rooms,
+    )
+
 
+# ---------------------------------------------------------------------------
+# Sync mode: endpoints run on the threadpool, one thread and one pooled
+# connection per in-flight request.
+# ---------------------------------------------------------------------------
 
-@app.post("/check-availability", response_model=AvailabilityResponse)
 def check_availability(payload: AvailabilityRequest, db: Session = Depends(get_db)):
-    room = db.query(Room).filter(Room.id == payload.room_id).first()
+    row, token = cache.get(payload.room_id, payload.check_in, payload.check_out)
+    if row is MISS:
+        with db_cursor(db) as cursor:
+            row = availability_engine.fetch_range(
+                cursor, payload.room_id, payload.check_in, payload.check_out
+            )
+        cache.put(payload.room_id, payload.check_in, payload.check_out, row, token)
 
-    if not room:
-        return AvailabilityResponse(
-            available=False,
-            reason="Room not found"
-        )
+    result = availability_engine.range_result(row, payload.check_in, payload.check_out)
+    return AvailabilityResponse(available=result.available, reason=result.reason)
 
-    if not room.is_available:
-        return AvailabilityResponse(
-            available=False,
-            reason="Room is marked unavailable"
-        )
 
-    if payload.check_in >= payload.check_out:
-        return AvailabilityResponse(
-            available=False,
-            reason="Check-out must be after check-in"
+def check_availability_batch(payload: BatchAvailabilityRequest, db: Session = Depends(get_db)):
+    """Availability and free-room counts for many rooms (or a whole hotel) in one query."""
+    with db_cursor(db) as cursor:
+        rooms = availability_engine.check_rooms(
+            cursor, payload.check_in, payload.check_out,
+            room_ids=payload.room_ids, hotel_id=payload.hotel_id,
         )
 
-    # 1. Check for overlapping bookings (Backup check)
-    overlapping = db.query(Booking).filter(
-        Booking.room_id == payload.room_id,
-        Booking.status == "confirmed",
-        Booking.check_in < payload.check_out,
-        Booking.check_out > payload.check_in,
-    ).count()
-
-    if overlapping >= room.total_rooms:
-        return AvailabilityResponse(
-            available=False,
-            reason=f"Room is fully booked for the selected dates (Booked: {overlapping}, Total: {room.total_rooms})"
-        )
+    return _batch_response(payload, rooms)
 
-    # 2. Strict Inventory Check
-    current_date = payload.check_in
-    while current_date < payload.check_out:
-        inventory = db.query(RoomInventory).filter(
-            RoomInventory.room_id == payload.room_id,
-            RoomInventory.date == current_date
-        ).first()
-
-        if not inventory:
-            return AvailabilityResponse(
-                available=False,
-                reason=f"Inventory not defined for {current_date}. Please check for another date"
-            )
 
-        if inventory.booked_rooms >= inventory.total_rooms:
-            return AvailabilityResponse(
-                available=False,
-                reason=f"No rooms available for {current_date}. Please check for another date"
+# ---------------------------------------------------------------------------
+# Async mode: endpoints run on the event loop; a request only holds a
+# connection while its query is in flight.
+# ---------------------------------------------------------------------------
+
+async def check_availability_async(payload: AvailabilityRequest, db=Depends(get_async_db)):
+    row, token = cache.get(payload.room_id, payload.check_in, payload.check_out)
+    if row is MISS:
+        async with driver_connection(db) as conn:
+            row = await aio.fetch_range_async(
+                conn, payload.room_id, payload.check_in, payload.check_out
             )
-        
-        current_date += timedelta(days=1)
+        cache.put(payload.room_id, payload.check_in, payload.check_out, row, token)
 
-    return AvailabilityResponse(
-        available=True,
-        reason="Room is available for the selected dates"
-    )
+    result = availability_engine.range_result(row, payload.check_in, payload.check_out)
+    return AvailabilityResponse(available=result.available, reason=result.reason)
+
+
+async def check_availability_batch_async(payload: BatchAvailabilityRequest, db=Depends(get_async_db)):
+    """Availability and free-room counts for many rooms (or a whole hotel) in one query."""
+    async with driver_connection(db) as conn:
+        rooms = await aio.check_rooms_async(
+            conn, payload.check_in, payload.check_out,
+            room_ids=payload.room_ids, hotel_id=payload.hotel_id,
+        )
+
+    return _batch_response(payload, rooms)
+
+
+if DB_MODE == "async":
+    app.post("/check-availability", response_model=AvailabilityResponse)(check_availability_async)
+    app.post("/check-availability/batch", response_model=BatchAvailabilityResponse)(check_availability_batch_async)
+else:
+    app.post("/check-availability", response_model=AvailabilityResponse)(check_availability)
+    app.post("/check-availability/batch", response_model=BatchAvailabilityResponse)(check_availability_batch)
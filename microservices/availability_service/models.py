@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DECIMAL, ForeignKey
+from sqlalchemy import Column, Computed, Integer, String, Boolean, Date, DECIMAL, ForeignKey
+from sqlalchemy.dialects.postgresql import DATERANGE
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -18,6 +19,8 @@ class Booking(Base):
     room_id = Column(Integer, ForeignKey("hotels_room.id"))
     check_in = Column(Date)
     check_out = Column(Date)
+    # Generated by Postgres (bookings migration 0010); indexed for overlap queries
+    stay = Column(DATERANGE, Computed("daterange(check_in, check_out, '[)')", persisted=True))
     status = Column(String(20))
 
 
@@ -0,0 +1,74 @@
+"""
+Connection pool instrumentation.
+
+Counts checkouts, checkout wait time, pool timeouts and invalidated
+connections for an engine, and reports them together with the live pool
+figures (size, checked out, overflow) for the /stats endpoint.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "connects": 0,
+            "checkouts": 0,
+            "timed_checkouts": 0,
+            "checkout_wait_ms_total": 0.0,
+            "checkout_wait_ms_max": 0.0,
+            "timeouts": 0,
+            "invalidated": 0,
+        }
+        self._pool = None
+
+    def attach(self, engine):
+        """Listen to `engine`'s pool (a sync Engine or AsyncEngine.sync_engine)."""
+        self._pool = engine.pool
+        event.listen(engine, "connect", lambda *args: self._count("connects"))
+        event.listen(engine, "checkout", lambda *args: self._count("checkouts"))
+        event.listen(engine, "invalidate", lambda *args: self._count("invalidated"))
+        return self
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def record_wait(self, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._counters["timed_checkouts"] += 1
+            self._counters["checkout_wait_ms_total"] += elapsed_ms
+            self._counters["checkout_wait_ms_max"] = max(self._counters["checkout_wait_ms_max"], elapsed_ms)
+
+    def record_timeout(self):
+        self._count("timeouts")
+
+    @contextmanager
+    def timing(self):
+        """Time a connection checkout (including pre-ping) made inside the block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_wait(started)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters["checkout_wait_ms_avg"] = (
+            counters["checkout_wait_ms_total"] / counters["timed_checkouts"] if counters["timed_checkouts"] else 0.0
+        )
+        pool = self._pool
+        if pool is not None:
+            counters.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),  # connections beyond pool_size
+            })
+        return counters
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import date
+from typing import List, Optional
 
 class AvailabilityRequest(BaseModel):
     room_id: int = Field(..., example=1)
@@ -10,3 +11,65 @@ class AvailabilityRequest(BaseModel):
 class AvailabilityResponse(BaseModel):
     available: bool
     reason: str
+
+
+class BatchAvailabilityRequest(BaseModel):
+    room_ids: Optional[List[int]] = Field(None, max_length=200, example=[1, 2, 3])
+    hotel_id: Optional[int] = Field(None, example=1)
+    check_in: date = Field(..., example="2025-03-01")
+    check_out: date = Field(..., example="2025-03-05")
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.room_ids is None) == (self.hotel_id is None):
+            raise ValueError("Provide exactly one of room_ids or hotel_id")
+        if self.check_in >= self.check_out:
+            raise ValueError("Check-out must be after check-in")
+        if (self.check_out - self.check_in).days > 90:
+            raise ValueError("Date range cannot exceed 90 nights")
+        return self
+
+
+class RoomAvailabilityResponse(BaseModel):
+    room_id: int
+    available: bool
+    reason: str
+    min_free: Optional[int]
+    free: List[Optional[int]]
+
+
+class BatchAvailabilityResponse(BaseModel):
+    check_in: date
+    check_out: date
+    nights: List[date]
+    rooms: List[RoomAvailabilityResponse]
+
+
+class CalendarSearchRequest(BaseModel):
+    nights: int = Field(..., ge=1, le=30, example=3)
+    first_check_in: date = Field(..., example="2025-03-01")
+    last_check_in: date = Field(..., example="2025-04-30")
+    room_ids: Optional[List[int]] = Field(None, max_length=5000)
+    hotel_id: Optional[int] = None
+    rooms_needed: int = Field(1, ge=1)
+    include_dates: bool = False
+
+    @model_validator(mode="after")
+    def check_span(self):
+        if self.last_check_in < self.first_check_in:
+            raise ValueError("last_check_in must not be before first_check_in")
+        return self
+
+
+class CalendarRoomResult(BaseModel):
+    room_id: int
+    first_check_in: date
+    feasible_check_ins: int
+    check_ins: Optional[List[date]] = None
+
+
+class CalendarSearchResponse(BaseModel):
+    nights: int
+    first_check_in: date
+    last_check_in: date
+    rooms: List[CalendarRoomResult]